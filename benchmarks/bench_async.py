@@ -0,0 +1,49 @@
+"""
+Fetch the matches of 20 competitions serially with FootballData and as one
+asyncio.gather fan-out with AsyncFootballData, against a local server that
+answers after a fixed delay.
+
+    python benchmarks/bench_async.py [delay_seconds]
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from football_data import AsyncFootballData, FootballData  # noqa: E402
+from server import StubServer  # noqa: E402
+
+CODES = ['PL', 'ELC', 'EL1', 'EL2', 'BL1', 'BL2', 'SA', 'SB', 'PD', 'SD',
+         'FL1', 'FL2', 'DED', 'PPL', 'BSA', 'CL', 'EC', 'WC', 'CLI', 'BJL']
+PAYLOAD = {'matches': [{'id': 1, 'status': 'FINISHED'}]}
+
+
+async def fan_out(url):
+    async with AsyncFootballData('bench', log_level='ERROR') as football:
+        football.API_URL = url
+        return await asyncio.gather(
+            *(football.competition_matches(code) for code in CODES))
+
+
+def main(delay=0.1):
+    with StubServer(PAYLOAD, delay=delay) as server:
+        with FootballData('bench', log_level='ERROR') as football:
+            football.API_URL = server.url
+            start = time.perf_counter()
+            for code in CODES:
+                football.competition_matches(code)
+            serial = time.perf_counter() - start
+
+        start = time.perf_counter()
+        asyncio.run(fan_out(server.url))
+        concurrent = time.perf_counter() - start
+
+    print(f'competitions:     {len(CODES)} x {delay * 1000:.0f} ms')
+    print(f'serial (sync):    {serial * 1000:.1f} ms')
+    print(f'gather (async):   {concurrent * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    main(*(float(arg) for arg in sys.argv[1:2]))
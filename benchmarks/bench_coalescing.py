@@ -0,0 +1,51 @@
+"""
+Many threads calling competition_matches('PL') at the same moment, with
+and without request coalescing: requests reaching the server, coalesced
+calls and wall time.
+
+    python benchmarks/bench_coalescing.py [threads]
+"""
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import payloads  # noqa: E402
+from server import StubHandler, StubServer  # noqa: E402
+from football_data import FootballData  # noqa: E402
+
+
+class CountingHandler(StubHandler):
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests += 1
+        super().do_GET()
+
+
+def main(threads=50, latency=0.2):
+    with StubServer(json.loads(payloads.load()), delay=latency) as srv:
+        srv.httpd.RequestHandlerClass = CountingHandler
+        srv.httpd.lock = threading.Lock()
+        FootballData.API_URL = srv.url
+        for coalesce in (False, True):
+            srv.httpd.requests = 0
+            with FootballData('bench', pool_maxsize=threads, retry=False,
+                              coalesce=coalesce) as football:
+                start = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=threads) as pool:
+                    for _ in range(threads):
+                        pool.submit(football.competition_matches, 'PL')
+                elapsed = time.perf_counter() - start
+                coalesced = sum(football.stats['coalesced'].values())
+            print(f'coalesce={coalesce!s:5}  {threads} calls  '
+                  f'{srv.httpd.requests:3} requests  {coalesced:3} coalesced  '
+                  f'{elapsed * 1000:7.1f} ms')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,71 @@
+"""
+Per-call latency of a new connection per request (keep_alive=False, as the
+old `requests.get` path did) against the pooled keep-alive connections of
+FootballData, on a local stub server:
+
+- plain HTTP, where a connection costs next to nothing
+- HTTPS with a self-signed certificate, paying a real TLS handshake
+  (with openssl available to make the certificate)
+- HTTP with `connect_delay` seconds added to the first request of each
+  connection, standing for the handshake round trips to the API (~3 round
+  trips for TCP and TLS 1.2)
+
+    python benchmarks/bench_connection_pool.py [calls] [connect_delay_ms]
+"""
+import os
+import shutil
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from football_data import FootballData  # noqa: E402
+from server import StubServer  # noqa: E402
+
+PAYLOAD = {'count': 1, 'competitions': [{'id': 2019, 'code': 'SA'}]}
+
+
+def per_call(server, keep_alive, calls):
+    """
+    Milliseconds per call, and connections the server accepted for them.
+    """
+    with FootballData('bench', log_level='ERROR',
+                      keep_alive=keep_alive) as football:
+        football.API_URL = server.url
+        if server.cert:
+            football.session.verify = server.cert
+            # Or REQUESTS_CA_BUNDLE would take precedence over verify
+            football.session.trust_env = False
+        football.competitions()
+        connections = server.httpd.connections
+        start = time.perf_counter()
+        for _ in range(calls):
+            football.competitions()
+        elapsed = time.perf_counter() - start
+        return elapsed / calls * 1000, server.httpd.connections - connections
+
+
+def main(calls=200, connect_delay_ms=20):
+    modes = {'http': {}}
+    if shutil.which('openssl'):
+        modes['https (TLS handshake)'] = {'tls': True}
+    else:
+        print('openssl not found, skipping https')
+    modes[f'http + {connect_delay_ms} ms connect delay'] = {
+        'connect_delay': connect_delay_ms / 1000}
+
+    print(f'{calls} calls per mode')
+    for name, options in modes.items():
+        with StubServer(PAYLOAD, **options) as server:
+            unpooled, unpooled_connections = per_call(server, False, calls)
+            pooled, pooled_connections = per_call(server, True, calls)
+        print(f'{name}\n'
+              f'    new connection / call: {unpooled:8.3f} ms '
+              f'({unpooled_connections} connections)\n'
+              f'    pooled / call:         {pooled:8.3f} ms '
+              f'({pooled_connections} connections)\n'
+              f'    saved per call:        {unpooled - pooled:8.3f} ms')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,63 @@
+"""
+Decode time of a full season competition_matches response with json2obj
+(SimpleNamespace object_hook) and json2lazy (LazyNamespace proxies, orjson
+when installed), reading the fields a typical consumer reads, and with
+json2columns (NumPy arrays, when installed) computing on the same fields.
+
+    python benchmarks/bench_decode.py [recorded_response.json]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import payloads  # noqa: E402
+from football_data import columnar, utils  # noqa: E402
+
+
+def read_all(res):
+    return [(m.id, m.utcDate, m.status, m.homeTeam.id, m.awayTeam.id,
+             m.score.fullTime.home, m.score.fullTime.away)
+            for m in res.matches]
+
+
+def read_few(res):
+    return [(m.id, m.status) for m in res.matches]
+
+
+def main(path=None, repeat=20):
+    body = payloads.load(path)
+    backend = 'orjson' if utils.load_orjson() else 'json'
+    print(f'response: {len(body) / 1024:.0f} KiB, lazy backend: {backend}')
+
+    for name, decode in (('json2obj', utils.json2obj),
+                         ('json2lazy', utils.json2lazy)):
+        timings = [
+            min(timeit.repeat(lambda: consume(decode(body)),
+                              number=1, repeat=repeat)) * 1000
+            for consume in (lambda res: res, read_few, read_all)
+        ]
+        print(f'{name:10} decode only {timings[0]:6.2f} ms'
+              f' | + read 2 fields {timings[1]:6.2f} ms'
+              f' | + read 7 fields {timings[2]:6.2f} ms')
+
+    if columnar.np is None:
+        return
+    finished = columnar.STATUS_CODES['FINISHED']
+
+    def home_wins(res):
+        m = res.matches
+        done = m['status'] == finished
+        return (m['fullTimeHome'][done] > m['fullTimeAway'][done]).sum()
+
+    decode_only, vectorized = (
+        min(timeit.repeat(lambda: consume(columnar.json2columns(body)),
+                          number=1, repeat=repeat)) * 1000
+        for consume in (lambda res: res, home_wins))
+    print(f'{"columnar":10} decode only {decode_only:6.2f} ms'
+          f' | + count home wins {vectorized:6.2f} ms')
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
@@ -0,0 +1,103 @@
+"""
+Import time of the package in fresh processes: the median time of each
+statement, its slowest modules according to `python -X importtime`, and the
+heavy dependencies it loaded. Exits with status 1 when a statement loads a
+dependency it shouldn't, or takes longer than --max-ms, to catch regressions
+in CI.
+
+    python benchmarks/bench_import.py [--runs 7] [--max-ms 50]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+HEAVY = ('requests', 'aiohttp', 'numpy', 'sqlite3', 'orjson',
+         'football_data.constants')
+
+# Statement -> heavy modules it must not import
+STATEMENTS = {
+    'import football_data': HEAVY + ('football_data.football_data',),
+    'from football_data import FootballData': HEAVY,
+    "from football_data import FootballData; FootballData('key')": HEAVY,
+    'from football_data import AsyncFootballData': (
+        'requests', 'numpy', 'sqlite3', 'orjson', 'football_data.constants'),
+    'from football_data import TEAM_ID': ('requests', 'aiohttp', 'numpy'),
+}
+
+# Times the statement, then reports the modules imported
+SCRIPT = '''
+import sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps([elapsed, list(sys.modules)]))
+'''
+
+
+def run(statement):
+    """
+    Run statement in a fresh interpreter: its time in seconds, the modules
+    it loaded, and the -X importtime report as (module, self us) pairs.
+    None when the statement fails.
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    # Bytecode is written by the first run, so compiling isn't timed
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    script = 'import json\n' + SCRIPT.format(statement=statement)
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', script],
+                          env=env, capture_output=True, text=True)
+    if proc.returncode:
+        return None
+    elapsed, modules = json.loads(proc.stdout)
+    report = []
+    for line in proc.stderr.splitlines():
+        if line.startswith('import time:') and 'self [us]' not in line:
+            self_us, _, module = line[len('import time:'):].split('|')
+            report.append((module.strip(), int(self_us)))
+    return elapsed, set(modules), report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--runs', type=int, default=7)
+    parser.add_argument('--max-ms', type=float, default=None,
+                        help='fail when a statement takes longer')
+    args = parser.parse_args()
+
+    run('import football_data.football_data, football_data.async_football_data')
+    _, startup, _ = run('pass')
+
+    failed = False
+    for statement, forbidden in STATEMENTS.items():
+        runs = [run(statement) for _ in range(args.runs)]
+        if None in runs:
+            failed = True
+            print(f'{statement}\n    FAIL: raised an exception')
+            continue
+        ms = statistics.median(elapsed for elapsed, _, _ in runs) * 1000
+        _, loaded, report = runs[-1]
+        loaded -= startup
+        report = [entry for entry in report if entry[0] in loaded]
+        slowest = sorted(report, key=lambda entry: entry[1], reverse=True)[:3]
+
+        print(f'{statement}\n    {ms:7.1f} ms   {len(loaded):3} '
+              'modules   slowest: ' + ', '.join(
+                  f'{module} {self_us / 1000:.1f}'
+                  for module, self_us in slowest))
+        heavy = [module for module in forbidden if module in loaded]
+        if heavy:
+            failed = True
+            print(f'    FAIL: imports {", ".join(heavy)}')
+        if args.max_ms is not None and ms > args.max_ms:
+            failed = True
+            print(f'    FAIL: slower than {args.max_ms} ms')
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
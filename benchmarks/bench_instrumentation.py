@@ -0,0 +1,70 @@
+"""
+Overhead of the instrumentation hooks: one match fetched many times from an
+InProcessTransport (so the client's own work is all there is to measure)
+without hooks, with a hook doing nothing, with RequestMetrics and with a
+SpanHook, then RequestMetrics' summary of a short run against the replay
+server, where the time goes to the network instead.
+
+    python benchmarks/bench_instrumentation.py [calls]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import payloads  # noqa: E402
+from football_data import FootballData  # noqa: E402
+from football_data.metrics import RequestMetrics, SpanHook  # noqa: E402
+from football_data.transport import ReplayTransport  # noqa: E402
+from server import ReplayServer  # noqa: E402
+
+
+def per_call(hooks, transport, calls):
+    football = FootballData('bench', log_level='CRITICAL', coalesce=False,
+                            transport=transport, hooks=hooks)
+    football.match(400000)
+    best = float('inf')
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(calls):
+            football.match(400000)
+        best = min(best, (time.perf_counter() - start) / calls)
+    return best
+
+
+def main(calls=5000):
+    transport = ReplayTransport(payloads.recordings(), fallback=True)
+    configs = {
+        'no hooks': None,
+        'no-op hook': [lambda event: None],
+        'RequestMetrics': [RequestMetrics()],
+        'SpanHook': [SpanHook(lambda span: None)],
+    }
+    baseline = None
+    for name, hooks in configs.items():
+        seconds = per_call(hooks, transport, calls)
+        baseline = baseline or seconds
+        print(f'{name:15} {seconds * 1e6:8.1f} us/call '
+              f'{(seconds - baseline) * 1e6:+7.1f} us')
+
+    metrics = RequestMetrics()
+    with ReplayServer(delay=0.002) as server:
+        football = FootballData('bench', log_level='CRITICAL',
+                                hooks=[metrics])
+        football.API_URL = server.url
+        for _ in range(50):
+            football.match(400000)
+            football.competition_matches('PL', season=2022)
+        football.close()
+    print('\nagainst the replay server (2 ms latency):')
+    for endpoint, stats in metrics.summary().items():
+        phases = ', '.join(f'{phase} {seconds * 1000:.1f}'
+                           for phase, seconds in stats['phases'].items())
+        print(f'{endpoint:20} {stats["calls"]} calls, p50 '
+              f'{stats["p50"] * 1000:.2f} ms, p99 {stats["p99"] * 1000:.2f} ms'
+              f'\n    ms per phase: {phases}')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
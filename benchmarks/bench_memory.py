@@ -0,0 +1,55 @@
+"""
+Memory held by several seasons of competition_matches responses, decoded
+into SimpleNamespace objects (json2obj), lazy proxies (json2lazy) and
+__slots__ records (RecordDecoder), measured with tracemalloc.
+
+    python benchmarks/bench_memory.py [seasons]
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import payloads  # noqa: E402
+from football_data.records import RecordDecoder  # noqa: E402
+from football_data.utils import json2lazy, json2obj  # noqa: E402
+
+
+def read_all(res):
+    # Touch what a consumer reads, so lazy proxies build their objects too
+    for m in res.matches:
+        m.homeTeam.id, m.awayTeam.id, m.score.fullTime.home
+
+
+def measure(decode, bodies):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    kept = []
+    for body in bodies:
+        res = decode(body)
+        read_all(res)
+        kept.append(res)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, peak, elapsed
+
+
+def main(seasons=5):
+    bodies = [payloads.load(seed=seed) for seed in range(seasons)]
+    print(f'{seasons} seasons, {seasons * 380} matches')
+    for name, decode in (('json2obj', json2obj),
+                         ('json2lazy', json2lazy),
+                         ('records', RecordDecoder())):
+        current, peak, elapsed = measure(decode, bodies)
+        print(f'{name:10} retained {current / 2 ** 20:6.1f} MiB'
+              f'   peak {peak / 2 ** 20:6.1f} MiB'
+              f'   decode {elapsed * 1000:7.1f} ms')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
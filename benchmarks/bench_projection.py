@@ -0,0 +1,62 @@
+"""
+Decode time and memory held by a large competition_matches response,
+decoded whole and projected on the fields a live-score consumer reads
+(fields=), for each decoder.
+
+    python benchmarks/bench_projection.py [seasons]
+
+Set NO_ORJSON=1 to time the json module fallback.
+"""
+import gc
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import payloads  # noqa: E402
+from football_data import utils  # noqa: E402
+from football_data.projection import Projection  # noqa: E402
+from football_data.records import RecordDecoder  # noqa: E402
+from football_data.utils import json2lazy, json2obj  # noqa: E402
+
+FIELDS = ['id', 'status', 'score', 'homeTeam.id', 'awayTeam.id']
+
+
+def read(res):
+    for m in res.matches:
+        m.id, m.status, m.homeTeam.id, m.awayTeam.id, m.score.fullTime.home
+
+
+def held(decode, body):
+    gc.collect()
+    tracemalloc.start()
+    res = decode(body)
+    read(res)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current
+
+
+def main(seasons=5, repeat=20):
+    if os.environ.get('NO_ORJSON'):
+        utils.orjson = False
+    season = json.loads(payloads.load())
+    body = json.dumps(dict(season, matches=season['matches'] * seasons)).encode()
+    print(f'response: {len(body) / 1e6:.1f} MB, {380 * seasons} matches, '
+          f'fields={FIELDS}')
+
+    for name, decode in (('namespace', json2obj), ('lazy', json2lazy),
+                         ('records', RecordDecoder())):
+        for label, dec in (('whole', decode),
+                           ('projected', Projection(FIELDS, decode))):
+            seconds = min(timeit.repeat(lambda: read(dec(body)), number=1,
+                                        repeat=repeat))
+            print(f'{name:10} {label:10} decode+read {seconds * 1000:7.1f} ms'
+                  f'  held {held(dec, body) / 1e6:6.1f} MB')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
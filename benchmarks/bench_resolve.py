@@ -0,0 +1,79 @@
+"""
+Team name resolution throughput on messy names (case, accents, punctuation,
+typos) made from the TEAM_ID aliases: a linear difflib scan over every alias
+against TeamResolver, with unique names and with the repeats of a real feed.
+
+    python benchmarks/bench_resolve.py [names]
+"""
+import difflib
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from football_data.constants import TEAM_ID  # noqa: E402
+from football_data.teams import TeamResolver  # noqa: E402
+
+
+def messy(name, rng):
+    if rng.random() < 0.5:
+        name = name.title()
+    if rng.random() < 0.3:
+        name = name.replace('o', 'ö').replace('e', 'é')
+    if rng.random() < 0.3:
+        name += ' F.C.'
+    if rng.random() < 0.4 and len(name) > 5:
+        i = rng.randrange(1, len(name) - 1)
+        name = name[:i] + name[i + 1:]
+    return name
+
+
+def linear_scan(name, aliases):
+    # The usual fallback: best difflib ratio against every alias
+    name = name.lower()
+    best = max(aliases, key=lambda alias: difflib.SequenceMatcher(
+        None, name, alias).ratio())
+    return TEAM_ID[best]
+
+
+def rate(func, names):
+    start = time.perf_counter()
+    func(names)
+    return len(names) / (time.perf_counter() - start)
+
+
+def main(count=50000, seed=1):
+    rng = random.Random(seed)
+    aliases = [alias for alias in TEAM_ID if len(alias) > 4]
+    unique = list({messy(rng.choice(aliases), rng) for _ in range(count)})
+    feed = [rng.choice(unique[:2000]) for _ in range(count)]
+
+    print(f'{len(unique)} distinct messy names, feed of {len(feed)} with repeats')
+
+    sample = unique[:300]
+    scan = rate(lambda names: [linear_scan(n, list(TEAM_ID)) for n in names],
+                sample)
+    print(f'linear difflib scan         {scan:10,.0f} names/s')
+
+    start = time.perf_counter()
+    resolver = TeamResolver()
+    print(f'TeamResolver index built in {(time.perf_counter() - start) * 1000:.0f} ms')
+
+    print(f'resolve_many, unique names  {rate(resolver.resolve_many, unique):10,.0f} names/s')
+    resolver = TeamResolver()
+    print(f'resolve_many, feed          {rate(resolver.resolve_many, feed):10,.0f} names/s')
+    resolver = TeamResolver()
+    print(f'resolve per name, feed      '
+          f'{rate(lambda names: [resolver.resolve(n) for n in names], feed):10,.0f} names/s'
+          f'  (cache hits: {resolver.cache_info().hits})')
+
+    resolver = TeamResolver()
+    resolved = sum(1 for team_id in resolver.resolve_many(unique)
+                   if team_id is not None)
+    print(f'resolved {resolved / len(unique):.1%} of the distinct names')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
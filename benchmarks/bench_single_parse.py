@@ -0,0 +1,59 @@
+"""
+CPU time per call spent turning a large competition_matches body into the
+decoded response: the former pipeline (res_raw.json() to look for an error,
+then the decoder) against the current one (HTTP status, then the decoder
+alone), for each decoder.
+
+    python benchmarks/bench_single_parse.py [seasons]
+"""
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import payloads  # noqa: E402
+from football_data.football_data import DECODERS, FootballData  # noqa: E402
+from football_data.columnar import np  # noqa: E402
+
+
+def cpu_per_call(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.process_time()
+        func()
+        best = min(best, time.process_time() - start)
+    return best
+
+
+def main(seasons=5, repeat=10):
+    season = json.loads(payloads.load())
+    body = json.dumps(dict(season, matches=season['matches'] * seasons)).encode()
+    print(f'response: {len(body) / 1e6:.1f} MB, {380 * seasons} matches')
+
+    for name in DECODERS:
+        if name == 'columnar' and np is None:
+            continue
+        decode = FootballData('key', decoder=name).decode
+
+        def double_parse():
+            # What requests' res_raw.json() did before the decoder ran
+            res = json.loads(body)
+            if 'errorCode' in res or 'error' in res:
+                return None
+            return decode(body)
+
+        def single_parse():
+            # A 2xx body is now only parsed by the decoder
+            return decode(body)
+
+        before = cpu_per_call(double_parse, repeat) * 1000
+        after = cpu_per_call(single_parse, repeat) * 1000
+        print(f'{name:10} before {before:7.1f} ms  after {after:7.1f} ms  '
+              f'saved {before - after:6.1f} ms/call '
+              f'({(before - after) / before:4.0%})')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,87 @@
+"""
+competition_matches() against stream_competition_matches() on a large
+response sent in slow chunks by a local server: time to the first match,
+total time, and peak memory (tracemalloc) while consuming the matches.
+
+    python benchmarks/bench_streaming.py [seasons]
+"""
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import payloads  # noqa: E402
+from server import StubHandler, StubServer  # noqa: E402
+from football_data import FootballData  # noqa: E402
+
+CHUNK = 64 * 1024
+CHUNK_DELAY = 0.005
+
+
+class TricklingHandler(StubHandler):
+    """
+    Sends the payload in CHUNK-sized pieces, CHUNK_DELAY seconds apart, like
+    a large body arriving over a real network.
+    """
+
+    def do_GET(self):
+        body = self.server.payload
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        for i in range(0, len(body), CHUNK):
+            self.wfile.write(body[i:i + CHUNK])
+            self.wfile.flush()
+            time.sleep(CHUNK_DELAY)
+
+
+def consume(football, method):
+    # The buffered call returns after the whole download, so time it too
+    start = time.perf_counter()
+    first = None
+    count = 0
+    for match in getattr(football, method)('PL'):
+        if first is None:
+            first = time.perf_counter() - start
+        match.homeTeam.id, match.score.fullTime.home
+        count += 1
+    return first, time.perf_counter() - start, count
+
+
+def measure(football, method):
+    first, total, count = consume(football, method)
+    # Memory in a second run, tracemalloc slows everything down
+    gc.collect()
+    tracemalloc.start()
+    consume(football, method)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first, total, peak, count
+
+
+def main(seasons=10):
+    # Several seasons in one response, as a long dateFrom/dateTo query would
+    season = json.loads(payloads.load())
+    payload = dict(season, matches=season['matches'] * seasons)
+    size = len(json.dumps(payload))
+    print(f'{len(payload["matches"])} matches, {size / 1e6:.1f} MB, '
+          f'{CHUNK // 1024} KB every {CHUNK_DELAY * 1000:.0f} ms')
+
+    with StubServer(payload) as srv:
+        srv.httpd.RequestHandlerClass = TricklingHandler
+        FootballData.API_URL = srv.url
+        with FootballData('bench', retry=False) as football:
+            for method in ('competition_matches', 'stream_competition_matches'):
+                first, total, peak, count = measure(football, method)
+                print(f'{method:28} first match {first * 1000:7.1f} ms  '
+                      f'total {total * 1000:7.1f} ms  '
+                      f'peak {peak / 1e6:6.1f} MB  ({count} matches)')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,294 @@
+"""
+Offline benchmark suite of the FootballData methods, against the local
+replay server (server.ReplayServer) serving recorded responses, generated
+ones by default (see payloads.recordings):
+
+- latency: percentiles of each method, sequential calls
+- decode: time to decode the response body(s) of each method
+- memory: peak memory allocated during a call of each method (tracemalloc)
+- throughput: calls per second at several concurrency levels, threads
+  sharing one client
+- faults: throughput and latency with 429s (and their Retry-After) and
+  slow responses mixed in, retried by the client
+
+Results can be saved with --save and compared with an earlier run with
+--compare, to track performance changes from commit to commit:
+
+    python benchmarks/bench_suite.py --save before.json
+    python benchmarks/bench_suite.py --compare before.json
+    python benchmarks/bench_suite.py --recordings recordings.jsonl  # record.py
+"""
+import argparse
+import gc
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from football_data import FootballData, RetryPolicy  # noqa: E402
+from server import ReplayServer, load_recordings  # noqa: E402
+
+# Method -> call, with arguments the generated recordings answer for
+CALLS = {
+    'competitions': lambda f: f.competitions(),
+    'competition': lambda f: f.competition('PL'),
+    'competition_teams': lambda f: f.competition_teams('PL'),
+    'competition_matches': lambda f: f.competition_matches('PL', season=2022),
+    'matches': lambda f: f.matches(dateFrom='2022-08-05', dateTo='2022-08-15'),
+    'match': lambda f: f.match(400000),
+    'team': lambda f: f.team(1),
+    'team_matches': lambda f: f.team_matches(1),
+    'matches_range': lambda f: f.matches_range('2022-08-01', '2022-08-30'),
+    'teams_bulk': lambda f: f.teams_bulk(range(1, 11)),
+    'stream_competition_matches': lambda f: list(
+        f.stream_competition_matches('PL', season=2022)),
+}
+
+# Methods of the throughput and faults sections: a small and a large body
+LOAD_CALLS = ('match', 'competition_matches')
+
+
+def client(server, **kwargs):
+    kwargs.setdefault('retry', False)
+    football = FootballData('bench', log_level='CRITICAL', coalesce=False,
+                            **kwargs)
+    football.API_URL = server.url
+    return football
+
+
+def call(football, name):
+    res = CALLS[name](football)
+    if football.error['msg']:
+        raise RuntimeError(f'{name}: {football.error["msg"]}')
+    return res
+
+
+def percentiles(seconds):
+    cuts = statistics.quantiles(seconds, n=100, method='inclusive')
+    return {'p50': cuts[49] * 1000, 'p90': cuts[89] * 1000,
+            'p99': cuts[98] * 1000, 'max': max(seconds) * 1000}
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def latency(server, decoder, calls):
+    results = {}
+    with client(server, decoder=decoder) as football:
+        for name in CALLS:
+            call(football, name)
+            results[name] = percentiles(
+                [timed(call, football, name) for _ in range(calls)])
+    return results
+
+
+def decode_times(server, decoder, repeat):
+    """
+    Milliseconds to decode the bodies a call of each method receives (the
+    best of `repeat`), streamed responses excluded.
+    """
+    results = {}
+    with client(server, decoder=decoder) as football:
+        bodies = []
+        send = football.transport.send
+
+        def keep_body(url, headers, timeout=None, stream=False):
+            response = send(url, headers, timeout, stream)
+            if not stream:
+                bodies.append(response.content)
+            return response
+
+        football.transport.send = keep_body
+        for name in CALLS:
+            bodies.clear()
+            call(football, name)
+            if bodies:
+                results[name] = min(
+                    timed(lambda: [football.decode(b) for b in bodies])
+                    for _ in range(repeat)) * 1000
+    return results
+
+
+def peak_memory(server, decoder):
+    """
+    KiB allocated at the peak of one call of each method, the response
+    included (its decoded objects are still referenced at the peak).
+    """
+    results = {}
+    with client(server, decoder=decoder) as football:
+        for name in CALLS:
+            call(football, name)
+            gc.collect()
+            tracemalloc.start()
+            res = call(football, name)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del res
+            results[name] = peak / 1024
+    return results
+
+
+def load(server, name, concurrency, calls, **kwargs):
+    """
+    Calls per second and latency percentiles of `calls` calls made by
+    `concurrency` threads sharing one client, and the failed calls.
+    """
+    with client(server, pool_maxsize=concurrency, **kwargs) as football:
+        call(football, name)
+
+        def one(_):
+            start = time.perf_counter()
+            CALLS[name](football)
+            return time.perf_counter() - start, bool(football.error['msg'])
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(one, range(calls)))
+        elapsed = time.perf_counter() - start
+        retries = sum(football.stats['retries'].values())
+
+    result = percentiles([seconds for seconds, _ in results])
+    result.update(calls_per_s=calls / elapsed, retries=retries,
+                  failed=sum(failed for _, failed in results))
+    return result
+
+
+def throughput(recordings, delay, levels, calls):
+    results = {}
+    with ReplayServer(recordings, delay=delay) as server:
+        for name in LOAD_CALLS:
+            for concurrency in levels:
+                results[f'{name} x{concurrency}'] = load(
+                    server, name, concurrency, calls)
+    return results
+
+
+def faults(recordings, delay, calls):
+    """
+    Every 10th request throttled (Retry-After: 0.05s) and 5% of the
+    responses 200 ms late, with the client retrying.
+    """
+    results = {}
+    for name in LOAD_CALLS:
+        with ReplayServer(recordings, delay=delay, throttle_every=10,
+                          retry_after=0.05, slow_ratio=0.05,
+                          slow_delay=0.2) as server:
+            results[f'{name} x8'] = load(
+                server, name, 8, calls,
+                retry=RetryPolicy(max_attempts=5, backoff_base=0.05))
+            results[f'{name} x8'].update(
+                throttled=server.stats['throttled'], slow=server.stats['slow'])
+    return results
+
+
+def print_table(title, rows, columns, unit=''):
+    print(f'\n{title}')
+    width = max(len(row) for row in rows)
+    print(' ' * width + ''.join(f'{column:>11}' for column in columns))
+    for row, values in rows.items():
+        print(f'{row:{width}}' + ''.join(
+            f'{values[column]:>11,.1f}' if isinstance(values[column], float)
+            else f'{values[column]:>11}' for column in columns) + unit)
+
+
+def flatten(results, prefix=''):
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f'{prefix}{key} / '))
+        elif isinstance(value, (int, float)):
+            flat[f'{prefix}{key}'] = value
+    return flat
+
+
+def compare(results, path, threshold):
+    """
+    Print the metrics that changed by more than `threshold` (a share) since
+    the results saved at path.
+    """
+    with open(path) as f:
+        before = json.load(f)
+    print(f'\nchanges over {threshold:.0%} since {path} '
+          f'({before.get("commit") or "unknown commit"}):')
+    old, new = flatten(before['results']), flatten(results)
+    changed = False
+    for key in sorted(old.keys() & new.keys()):
+        if not old[key] or key.endswith(('retries', 'failed', 'throttled',
+                                         'slow')):
+            continue
+        delta = new[key] / old[key] - 1
+        if abs(delta) >= threshold:
+            changed = True
+            print(f'  {key:55} {old[key]:10,.1f} -> {new[key]:10,.1f} '
+                  f'({delta:+.0%})')
+    if not changed:
+        print('  none')
+
+
+def commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                              capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))
+                              ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--recordings', help='JSON lines file from record.py')
+    parser.add_argument('--decoder', default='namespace')
+    parser.add_argument('--calls', type=int, default=100,
+                        help='calls per measurement')
+    parser.add_argument('--delay', type=float, default=0.005,
+                        help='server latency of the load sections, seconds')
+    parser.add_argument('--concurrency', default='1,4,16,64')
+    parser.add_argument('--save', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='JSON results of an earlier run')
+    parser.add_argument('--threshold', type=float, default=0.1)
+    args = parser.parse_args()
+
+    recordings = load_recordings(args.recordings) if args.recordings else None
+    levels = [int(level) for level in args.concurrency.split(',')]
+
+    results = {}
+    with ReplayServer(recordings) as server:
+        results['latency_ms'] = latency(server, args.decoder, args.calls)
+        print_table('latency (ms, no server delay)', results['latency_ms'],
+                    ('p50', 'p90', 'p99', 'max'))
+        results['decode_ms'] = decode_times(server, args.decoder, 5)
+        results['peak_kib'] = peak_memory(server, args.decoder)
+        print_table('decode (ms) and peak memory (KiB)', {
+            name: {'decode': results['decode_ms'].get(name, '-'),
+                   'peak': results['peak_kib'][name]}
+            for name in CALLS}, ('decode', 'peak'))
+
+    results['throughput'] = throughput(recordings, args.delay, levels,
+                                       args.calls)
+    print_table(f'throughput ({args.delay * 1000:.0f} ms server delay)',
+                results['throughput'], ('calls_per_s', 'p50', 'p99', 'failed'))
+
+    results['faults'] = faults(recordings, args.delay, args.calls)
+    print_table('with 429s and slow responses', results['faults'],
+                ('calls_per_s', 'p50', 'p99', 'retries', 'failed'))
+
+    if args.compare:
+        compare(results, args.compare, args.threshold)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'commit': commit(), 'decoder': args.decoder,
+                       'results': results}, f, indent=1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+The transports side by side, fetching one match many times from threads
+sharing one client: RequestsTransport and HTTPXTransport (when httpx is
+installed, over HTTP/1.1 as the local server has no TLS for HTTP/2) against
+the replay server, and ReplayTransport in-process, which leaves only the
+client's own overhead. Also shows the uniform accounting of the transports:
+timings of a first (new connection) and a second (pooled) request, and
+the bytes each one sent and received.
+
+    python benchmarks/bench_transports.py [calls] [concurrency]
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import payloads  # noqa: E402
+from football_data import FootballData  # noqa: E402
+from football_data.transport import (HTTPXTransport, ReplayTransport,  # noqa: E402
+                                     RequestsTransport)
+from server import ReplayServer  # noqa: E402
+
+
+def transports(concurrency):
+    yield 'requests', RequestsTransport(pool_maxsize=concurrency)
+    try:
+        yield 'httpx', HTTPXTransport(http2=False, max_connections=concurrency)
+    except ImportError:
+        print('httpx not installed, skipping HTTPXTransport')
+    yield 'replay (in-process)', ReplayTransport(payloads.recordings(),
+                                                 fallback=True)
+
+
+def main(calls=2000, concurrency=8):
+    with ReplayServer() as server:
+        url = f'{server.url}matches/400000'
+        for name, transport in transports(concurrency):
+            with transport:
+                first = transport.send(url, {})
+                second = transport.send(url, {})
+                print(f'{name}\n    first  {first.timings}\n    second '
+                      f'{second.timings}\n    sent {second.bytes_sent} B, '
+                      f'received {second.bytes_received} B')
+
+                football = FootballData('bench', log_level='CRITICAL',
+                                        coalesce=False, transport=transport)
+                football.API_URL = server.url
+                start = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                    list(pool.map(lambda _: football.match(400000),
+                                  range(calls)))
+                elapsed = time.perf_counter() - start
+                stats = transport.stats
+                print(f'    {calls / elapsed:8,.0f} calls/s with {concurrency} '
+                      f'threads, {stats["bytes_received"] / stats["requests"]:,.0f}'
+                      f' B received and {stats["seconds"] / stats["requests"] * 1000:.2f}'
+                      ' ms in the transport per request')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,148 @@
+"""
+Season-sized API responses for the benchmarks.
+
+Pass the path of a response recorded from the API (e.g. saved with
+`curl -H "X-Auth-Token: ..." .../v4/competitions/PL/matches > pl.json`) to
+benchmark on real data; otherwise a response with the same shape as the v4
+`competitions/{id}/matches` one is generated.
+"""
+import json
+import random
+from datetime import datetime, timedelta
+
+AREA = {'id': 2072, 'name': 'England', 'code': 'ENG',
+        'flag': 'https://crests.football-data.org/770.svg'}
+COMPETITION = {'id': 2021, 'name': 'Premier League', 'code': 'PL',
+               'type': 'LEAGUE',
+               'emblem': 'https://crests.football-data.org/PL.png'}
+SEASON = {'id': 1490, 'startDate': '2022-08-05', 'endDate': '2023-05-28',
+          'currentMatchday': 38, 'winner': None}
+
+
+def team(team_id):
+    return {'id': team_id, 'name': f'Team {team_id} FC',
+            'shortName': f'Team {team_id}', 'tla': f'T{team_id:02d}',
+            'crest': f'https://crests.football-data.org/{team_id}.png'}
+
+
+def match(match_id, matchday, kickoff, home, away, status):
+    finished = status == 'FINISHED'
+
+    def goals():
+        return random.randint(0, 4) if finished else None
+
+    full_home, full_away = goals(), goals()
+    return {
+        'area': AREA,
+        'competition': COMPETITION,
+        'season': SEASON,
+        'id': match_id,
+        'utcDate': kickoff.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'status': status,
+        'matchday': matchday,
+        'stage': 'REGULAR_SEASON',
+        'group': None,
+        'lastUpdated': '2023-06-01T00:00:00Z',
+        'homeTeam': team(home),
+        'awayTeam': team(away),
+        'score': {
+            'winner': None if not finished else (
+                'HOME_TEAM' if full_home > full_away else
+                'AWAY_TEAM' if full_away > full_home else 'DRAW'),
+            'duration': 'REGULAR',
+            'fullTime': {'home': full_home, 'away': full_away},
+            'halfTime': {'home': full_home and full_home // 2,
+                         'away': full_away and full_away // 2},
+        },
+        'odds': {'msg': 'Activate Odds-Package in User-Panel to retrieve odds.'},
+        'referees': [{'id': 11000 + match_id % 40, 'name': 'Some Referee',
+                      'type': 'REFEREE', 'nationality': 'England'}],
+    }
+
+
+def season_matches(teams=20, finished_ratio=1.0, seed=0):
+    """
+    A double round robin season: teams * (teams - 1) matches.
+    """
+    random.seed(seed)
+    ids = list(range(1, teams + 1))
+    fixtures = [(home, away) for home in ids for away in ids if home != away]
+    random.shuffle(fixtures)
+
+    per_matchday = teams // 2
+    start = datetime(2022, 8, 5, 19)
+    matches = []
+    for n, (home, away) in enumerate(fixtures):
+        matchday = n // per_matchday + 1
+        status = 'FINISHED' if n < len(fixtures) * finished_ratio else 'TIMED'
+        kickoff = start + timedelta(days=7 * (matchday - 1), hours=n % 5)
+        matches.append(match(400000 + n, matchday, kickoff, home, away, status))
+
+    return {
+        'filters': {'season': '2022'},
+        'resultSet': {'count': len(matches), 'first': '2022-08-05',
+                      'last': '2023-05-28', 'played': len(matches)},
+        'competition': COMPETITION,
+        'matches': matches,
+    }
+
+
+def load(path=None, **kwargs):
+    """
+    Body of a season response: the recorded one at path, or a generated one.
+    """
+    if path:
+        with open(path, 'rb') as f:
+            return f.read()
+    return json.dumps(season_matches(**kwargs)).encode()
+
+
+def competition_teams(teams=20):
+    return {
+        'count': teams,
+        'filters': {'season': '2022'},
+        'competition': COMPETITION,
+        'season': SEASON,
+        'teams': [dict(team(team_id), area=AREA, address='Some Road, London',
+                       website='https://example.com', founded=1880,
+                       clubColors='Red / White', venue='Some Stadium',
+                       runningCompetitions=[COMPETITION],
+                       coach={'id': 10000 + team_id, 'name': 'Some Coach'},
+                       squad=[], staff=[],
+                       lastUpdated='2023-06-01T00:00:00Z')
+                  for team_id in range(1, teams + 1)],
+    }
+
+
+def recordings(seed=0):
+    """
+    Generated responses for the replay server, one per endpoint, as
+    recordings (see transport.load_recordings): the same shapes as the v4 API,
+    around one season of matches.
+    """
+    season = season_matches(seed=seed)
+    matches = season['matches']
+    teams = competition_teams()
+    competition = dict(COMPETITION, area=AREA, currentSeason=SEASON,
+                       seasons=[SEASON], lastUpdated='2023-06-01T00:00:00Z')
+    team_matches = [m for m in matches if 1 in (m['homeTeam']['id'],
+                                                m['awayTeam']['id'])]
+    day = dict(season, matches=matches[:10],
+               filters={'dateFrom': '2022-08-05', 'dateTo': '2022-08-15'},
+               resultSet={'count': 10})
+    bodies = {
+        '/v4/competitions': {'count': 12, 'filters': {},
+                             'competitions': [competition] * 12},
+        '/v4/competitions/PL': competition,
+        '/v4/competitions/PL/teams': teams,
+        '/v4/competitions/PL/matches': season,
+        '/v4/matches': day,
+        '/v4/matches/400000': matches[0],
+        '/v4/teams/1': teams['teams'][0],
+        '/v4/teams/1/matches': dict(season, matches=team_matches,
+                                    resultSet={'count': len(team_matches)}),
+    }
+    return [{'url': url, 'status': 200,
+             'headers': {'Content-Type': 'application/json'},
+             'body': json.dumps(body)}
+            for url, body in bodies.items()]
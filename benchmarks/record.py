@@ -0,0 +1,35 @@
+"""
+Record API responses for the replay server (server.ReplayServer), by
+calling each FootballData method once against the real API. Needs an API
+key in FOOTBALL_DATA_API_KEY; the free plan allows 10 calls per minute, so
+calls are paced accordingly.
+
+    python benchmarks/record.py recordings.jsonl [competition] [team_id]
+    python benchmarks/bench_suite.py --recordings recordings.jsonl
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from football_data import FootballData  # noqa: E402
+from football_data.transport import RecordingTransport  # noqa: E402
+
+
+def main(path, competition='PL', team_id='57'):
+    transport = RecordingTransport(path)
+    with FootballData(rate_limit=10, transport=transport) as football:
+        football.competitions()
+        football.competition(competition)
+        football.competition_teams(competition)
+        matches = football.competition_matches(competition)
+        football.matches()
+        if matches:
+            football.match(matches[0].id)
+        football.team(team_id)
+        football.team_matches(team_id)
+    print(f'{transport.stats["requests"]} responses recorded in {path}')
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
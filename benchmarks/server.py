@@ -0,0 +1,269 @@
+"""
+Local HTTP servers used by the benchmarks, so they run without network
+access or an API key: StubServer answers every request with one payload,
+ReplayServer replays recorded API responses.
+"""
+import json
+import os
+import random
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from football_data.transport import load_recordings  # noqa: E402,F401
+from football_data.utils import endpoint_template  # noqa: E402
+
+# Not replayed: the server sends the body whole and uncompressed
+HOP_HEADERS = frozenset(('content-length', 'transfer-encoding', 'connection',
+                         'content-encoding', 'keep-alive', 'date', 'server'))
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Answers every GET with the server's canned JSON payload.
+    """
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        body = self.server.payload
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+    connect_delay = 0
+    connections = 0
+
+    def process_request(self, request, client_address):
+        self.connections += 1
+        super().process_request(request, client_address)
+
+    def process_request_thread(self, request, client_address):
+        # Runs once per connection, before its first request is read
+        if self.connect_delay:
+            time.sleep(self.connect_delay)
+        super().process_request_thread(request, client_address)
+
+
+def self_signed_cert(directory):
+    """
+    Write a certificate for 127.0.0.1 and its key to directory (with the
+    openssl command line tool) and return their paths.
+    """
+    cert = os.path.join(directory, 'cert.pem')
+    key = os.path.join(directory, 'key.pem')
+    subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048',
+                    '-nodes', '-days', '1', '-subj', '/CN=127.0.0.1',
+                    '-addext', 'subjectAltName=IP:127.0.0.1',
+                    '-keyout', key, '-out', cert],
+                   check=True, capture_output=True)
+    return cert, key
+
+
+class StubServer(object):
+    """
+    Serve `payload` (a dict) on 127.0.0.1 from a background thread,
+    waiting `delay` seconds before each response to mimic the API latency.
+
+    - connect_delay: seconds added to the first request of each connection,
+      to mimic the round trips of the TCP and TLS handshakes to the API
+    - tls: serve HTTPS with a self-signed certificate (needs openssl),
+      which clients verify with `cert`
+
+    httpd.connections counts the connections accepted.
+    """
+
+    def __init__(self, payload=None, delay=0, connect_delay=0, tls=False):
+        self.httpd = StubHTTPServer(('127.0.0.1', 0), StubHandler)
+        self.httpd.payload = json.dumps(payload or {}).encode()
+        self.httpd.delay = delay
+        self.httpd.connect_delay = connect_delay
+        self.thread = threading.Thread(target=self.httpd.serve_forever,
+                                       daemon=True)
+        self.cert = None
+        if tls:
+            self._tmp = tempfile.TemporaryDirectory()
+            self.cert, key = self_signed_cert(self._tmp.name)
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(self.cert, key)
+            # Handshakes happen in the connection threads, not the accept loop
+            self.httpd.socket = context.wrap_socket(
+                self.httpd.socket, server_side=True,
+                do_handshake_on_connect=False)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address
+        scheme = 'https' if self.cert else 'http'
+        return f'{scheme}://{host}:{port}/v4/'
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.cert:
+            self._tmp.cleanup()
+
+
+class ReplayHandler(StubHandler):
+    """
+    Answers each GET with the recording the server picks for its path.
+    """
+
+    def do_GET(self):
+        status, headers, body, delay = self.server.replay(self.path)
+        if delay:
+            time.sleep(delay)
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class ReplayHTTPServer(StubHTTPServer):
+
+    def __init__(self, recordings, delay, slow_ratio, slow_delay,
+                 throttle_every, retry_after, quota, quota_window, seed):
+        super().__init__(('127.0.0.1', 0), ReplayHandler)
+        self.responses = {}
+        self.templates = {}
+        for recording in recordings:
+            split = urllib.parse.urlsplit(recording['url'])
+            path = split.path + (f'?{split.query}' if split.query else '')
+            body = recording['body']
+            if not isinstance(body, str):
+                body = json.dumps(body)
+            headers = [(name, value)
+                       for name, value in recording.get('headers', {}).items()
+                       if name.lower() not in HOP_HEADERS
+                       and not name.lower().startswith('x-request')]
+            response = (recording.get('status', 200), headers, body.encode())
+            self.responses[path] = response
+            self.templates.setdefault(endpoint_template(path), response)
+        self.delay = delay
+        self.slow_ratio = slow_ratio
+        self.slow_delay = slow_delay
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.quota = quota
+        self.quota_window = quota_window
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'throttled': 0, 'slow': 0, 'missing': 0}
+        self.window_start = time.monotonic()
+        self.window_requests = 0
+
+    def replay(self, path):
+        """
+        (status, headers, body, delay) of the response to path: the
+        recording of that exact path or else of its endpoint, unless the
+        request is throttled.
+        """
+        with self.lock:
+            self.stats['requests'] += 1
+            now = time.monotonic()
+            if now - self.window_start >= self.quota_window:
+                self.window_start = now
+                self.window_requests = 0
+            self.window_requests += 1
+            reset = max(1, round(self.quota_window - (now - self.window_start)))
+            available = None
+            if self.quota is not None:
+                available = max(0, self.quota - self.window_requests)
+            over_quota = (self.quota is not None
+                          and self.window_requests > self.quota)
+            throttled = over_quota or (
+                self.throttle_every
+                and self.stats['requests'] % self.throttle_every == 0)
+            slow = self.slow_ratio and self.random.random() < self.slow_ratio
+            self.stats['throttled'] += bool(throttled)
+            self.stats['slow'] += bool(slow)
+
+            quota_headers = [('X-RequestCounter-Reset', str(reset))]
+            if available is not None:
+                quota_headers.append(('X-Requests-Available-Minute',
+                                      str(available)))
+            if throttled:
+                retry_after = reset if over_quota else self.retry_after
+                body = json.dumps({
+                    'message': 'You reached your request limit. Wait '
+                               f'{retry_after} seconds.',
+                    'errorCode': 429}).encode()
+                return (429, [('Content-Type', 'application/json'),
+                              ('Retry-After', str(retry_after))]
+                        + quota_headers, body, self.delay)
+
+            response = self.responses.get(path)
+            if response is None:
+                response = self.templates.get(endpoint_template(path))
+            if response is None:
+                self.stats['missing'] += 1
+                body = json.dumps({'message': 'The resource you are looking '
+                                   'for does not exist.',
+                                   'errorCode': 404}).encode()
+                return (404, [('Content-Type', 'application/json')], body,
+                        self.delay)
+            status, headers, body = response
+            delay = self.delay + (self.slow_delay if slow else 0)
+            return status, headers + quota_headers, body, delay
+
+
+class ReplayServer(StubServer):
+    """
+    Replay `recordings` (see transport.load_recordings, payloads.recordings()
+    by default) on 127.0.0.1 from a background thread. Requests get the
+    recording of the same path and query, or else the first one of the same
+    endpoint, with the quota headers of the API:
+
+    - delay: seconds before each response, to mimic the API latency
+    - slow_ratio / slow_delay: share of the responses delayed by slow_delay
+      more seconds
+    - throttle_every / retry_after: answer every nth request with a 429,
+      asking to retry after retry_after seconds
+    - quota / quota_window: requests allowed per window of seconds, the
+      others get a 429 with Retry-After until the window ends (60 seconds
+      by default, shorten it to keep benchmarks short)
+
+    stats counts the requests, and how many were throttled, slow or had no
+    recording.
+    """
+
+    def __init__(self, recordings=None, delay=0, slow_ratio=0, slow_delay=0.2,
+                 throttle_every=0, retry_after=1, quota=None, quota_window=60,
+                 seed=0):
+        if recordings is None:
+            import payloads
+            recordings = payloads.recordings()
+        self.httpd = ReplayHTTPServer(recordings, delay, slow_ratio,
+                                      slow_delay, throttle_every, retry_after,
+                                      quota, quota_window, seed)
+        self.cert = None
+        self.thread = threading.Thread(target=self.httpd.serve_forever,
+                                       daemon=True)
+
+    @property
+    def stats(self):
+        return self.httpd.stats
@@ -1 +1,47 @@
-from .football_data import FootballData
+import importlib
+
+# Public name -> module defining it. Modules are imported on first access to
+# one of their names, so `import football_data` stays cheap for short-lived
+# processes (see benchmarks/bench_import.py).
+_EXPORTS = {
+    'FootballData': 'football_data',
+    'BulkResult': 'football_data',
+    'AsyncFootballData': 'async_football_data',
+    'MemoryCache': 'cache',
+    'SQLiteCache': 'cache',
+    'RateLimiter': 'ratelimit',
+    'RetryPolicy': 'retry',
+    'MatchStore': 'store',
+    'LivePoller': 'live',
+    'MatchChange': 'live',
+    'RequestsTransport': 'transport',
+    'HTTPXTransport': 'transport',
+    'InProcessTransport': 'transport',
+    'RecordingTransport': 'transport',
+    'ReplayTransport': 'transport',
+    'RequestMetrics': 'metrics',
+    'SpanHook': 'metrics',
+    'TeamResolver': 'teams',
+    'resolve_team': 'teams',
+    'resolve_teams': 'teams',
+    'LEAGUE_CODE': 'constants',
+    'LEAGUE_ID': 'constants',
+    'TEAM_ID': 'constants',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    # Found directly the next time
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
+
@@ -0,0 +1,391 @@
+"""
+Contains the AsyncFootballData class, an asyncio flavour of FootballData.
+"""
+import asyncio
+from collections import deque
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+from .football_data import BaseFootballData
+
+
+class AsyncFootballData(BaseFootballData):
+    """
+    The AsyncFootballData class.
+
+    Same endpoints and return values as FootballData, as coroutines:
+
+        async with AsyncFootballData('your_api_key') as football:
+            results = await asyncio.gather(
+                *(football.competition_matches(code) for code in codes))
+    """
+
+    def __init__(self, api_key=None, log_level='INFO', pool_maxsize=100,
+                 pool_maxsize_per_host=10, max_concurrency=10,
+                 keep_alive=True, connect_timeout=3.05, read_timeout=27,
+                 cache=None, rate_limit=None, retry=None,
+                 decoder='namespace'):
+        """
+        Initialise a new instance of the AsyncFootballData class.
+
+        - pool_maxsize: max connections open at once
+        - pool_maxsize_per_host: max connections open to the API host
+        - max_concurrency: max requests in flight at once, the others wait
+        - keep_alive: set to False to close the connection after each call
+        - connect_timeout / read_timeout: seconds, None to wait forever
+        - cache: True for an in-memory MemoryCache, or a cache instance
+        - rate_limit: requests per minute allowed by the API plan, or a
+          RateLimiter shared across clients; calls over budget wait their
+          turn instead of failing
+        - retry: RetryPolicy for throttled, server and network errors,
+          False to never retry
+        - decoder: 'namespace' to decode responses into SimpleNamespace
+          objects, 'lazy' for the faster json2lazy (same attribute access),
+          'records' for compact __slots__ records (see records.py),
+          'columnar' for match lists as NumPy arrays (see columnar.py)
+
+        The underlying aiohttp session is created on the first request, use
+        `async with` (or await close()) to release it.
+        """
+        if aiohttp is None:
+            raise ImportError(
+                'AsyncFootballData requires aiohttp: pip install football_data[async]')
+
+        super().__init__(api_key, log_level, keep_alive, cache, rate_limit,
+                         retry, decoder)
+
+        self.pool_maxsize = pool_maxsize
+        self.pool_maxsize_per_host = pool_maxsize_per_host
+        self.keep_alive = keep_alive
+        self.timeout = aiohttp.ClientTimeout(
+            sock_connect=connect_timeout, sock_read=read_timeout)
+        self.max_concurrency = max_concurrency
+        self.session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """
+        Close the HTTP session and all of its pooled connections, and forget
+        the last error of the calling task.
+        """
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+        self._clear_error()
+
+    async def competitions(self):
+        """
+        List all available competitions.
+        """
+        self._clear_error()
+
+        url = self._competitions_url()
+        res = await self._api_request(url)
+        if res:
+            return res.competitions
+        return []
+
+    async def competition(self, competition):
+        """
+        List one particular competition.
+        """
+        self._clear_error()
+
+        url = self._competition_url(competition)
+        res = await self._api_request(url)
+        if res:
+            return res
+        return None
+
+    async def competition_teams(self, competition, season=None, stage=None, fields=None):
+        """
+        List all teams for a particular competition, keeping only `fields`
+        of each team when given.
+        """
+        self._clear_error()
+
+        url = self._competition_teams_url(competition, season, stage)
+        res = await self._api_request(url, fields)
+        if res:
+            return res.teams
+        self.logger.error(f'teams: no data found')
+        return None
+
+    async def competition_matches(self, competition, dateFrom=None, dateTo=None, stage=None, status=None, matchday=None, group=None, season=None, fields=None):
+        """
+        List all matches for a particular competition, keeping only `fields`
+        of each match when given.
+        """
+        self._clear_error()
+
+        url = self._competition_matches_url(
+            competition, dateFrom, dateTo, stage, status, matchday, group, season)
+        if not url:
+            return []
+
+        res = await self._api_request(url, fields)
+        if res:
+            return res.matches
+        return []
+
+    async def matches(self, competitions=None, dateFrom=None, dateTo=None, status=None, fields=None):
+        """
+        List matches across (a set of) competitions, keeping only `fields`
+        of each match when given.
+        """
+        self._clear_error()
+
+        url = self._matches_url(competitions, dateFrom, dateTo, status)
+        if not url:
+            return []
+
+        res = await self._api_request(url, fields)
+        if res:
+            return res.matches
+        return []
+
+    async def match(self, match_id):
+        """
+        Show one particular match.
+        """
+        self._clear_error()
+
+        url = self._match_url(match_id)
+        res = await self._api_request(url)
+        if res:
+            # Wrapped in `match` by the v2 API, at the top level since v4
+            return getattr(res, 'match', res)
+        return []
+
+    async def team_matches(self, team_id, dateFrom=None, dateTo=None, status=None, venue=None, limit=None, fields=None):
+        """
+        Show all matches for a particular team, keeping only `fields` of each
+        match when given.
+        """
+        self._clear_error()
+
+        url = self._team_matches_url(
+            team_id, dateFrom, dateTo, status, venue, limit)
+        if not url:
+            return []
+
+        res = await self._api_request(url, fields)
+        if res:
+            return res.matches
+        return []
+
+    async def team(self, team_id):
+        """
+        Show one particular team.
+        """
+        self._clear_error()
+
+        url = self._team_url(team_id)
+        res = await self._api_request(url)
+        if res:
+            return res
+        return None
+
+    async def matches_range(self, dateFrom, dateTo, competitions=None, status=None):
+        """
+        List matches across (a set of) competitions between two dates, however
+        far apart.
+
+        The range is split into windows the API accepts, fetched concurrently,
+        and the matches are merged, deduplicated and sorted by utcDate.
+        """
+        self._clear_error()
+
+        windows = self._date_windows(dateFrom, dateTo)
+        if not windows:
+            return []
+        urls = [self._matches_url(competitions, start, end, status)
+                for start, end in windows]
+        return await self._fetch_matches(urls)
+
+    async def team_matches_range(self, team_id, dateFrom, dateTo, status=None, venue=None):
+        """
+        Show the matches of a particular team between two dates, however far
+        apart, fetched like matches_range().
+        """
+        self._clear_error()
+
+        windows = self._date_windows(dateFrom, dateTo)
+        if not windows:
+            return []
+        urls = [self._team_matches_url(team_id, start, end, status, venue)
+                for start, end in windows]
+        if not all(urls):
+            return []
+        return await self._fetch_matches(urls)
+
+    def iter_competition_matches(self, competitions=None, seasons=None, prefetch=1, **filters):
+        """
+        Asynchronously yield the matches of several competitions (all of
+        LEAGUE_CODE by default) and seasons (the current one by default), one
+        at a time:
+
+            async for match in football.iter_competition_matches(seasons=[2021, 2022]):
+                ...
+
+        The following `prefetch` responses are fetched in the background while
+        the current one is consumed, and only those are held in memory.
+        Competitions that fail are logged and skipped. Takes the same filters
+        as competition_matches().
+        """
+        if not competitions:
+            from .constants import LEAGUE_CODE
+            competitions = list(LEAGUE_CODE)
+        urls = (self._competition_matches_url(competition, season=season, **filters)
+                for competition in competitions
+                for season in (seasons or [None]))
+        return self._iter_matches(urls, prefetch)
+
+    def iter_matches(self, dateFrom, dateTo, competitions=None, status=None, prefetch=1):
+        """
+        Asynchronously yield the matches across (a set of) competitions between
+        two dates, however far apart, one API-sized date window after the
+        other, fetched ahead like iter_competition_matches().
+        """
+        windows = self._date_windows(dateFrom, dateTo) or []
+        urls = (self._matches_url(competitions, start, end, status)
+                for start, end in windows)
+        return self._iter_matches(urls, prefetch)
+
+    async def _iter_matches(self, urls, prefetch):
+        self._clear_error()
+        pending = deque()
+        try:
+            for url in urls:
+                if url:
+                    task = asyncio.ensure_future(self._api_call(url))
+                    pending.append((url, task))
+                if len(pending) > prefetch:
+                    for match in await self._pending_matches(pending.popleft()):
+                        yield match
+            while pending:
+                for match in await self._pending_matches(pending.popleft()):
+                    yield match
+        finally:
+            # The consumer may stop early: drop what was fetched ahead
+            for _, task in pending:
+                task.cancel()
+
+    async def _pending_matches(self, pending):
+        url, task = pending
+        res, error = await task
+        if res is False:
+            # Seen by the consumer of the iterator as its last error
+            self._record_error(error)
+            self.logger.error(f'matches: skipping {url}')
+            return []
+        return res.matches
+
+    async def _fetch_matches(self, urls):
+        """
+        Fetch urls concurrently and merge their matches. Returns [] if any of
+        them fails, rather than a silently incomplete list.
+        """
+        results = await asyncio.gather(*(self._api_call(url) for url in urls))
+        errors = [error for res, error in results if res is False]
+        if errors:
+            self._record_error(errors[0])
+            self.logger.error('matches: some date windows failed')
+            return []
+        return self._merge_matches([res for res, _ in results])
+
+    def _create_session(self):
+        """
+        Create the pooled session, bound to the running event loop.
+        """
+        connector = aiohttp.TCPConnector(
+            limit=self.pool_maxsize,
+            limit_per_host=self.pool_maxsize_per_host,
+            force_close=not self.keep_alive)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return aiohttp.ClientSession(
+            connector=connector, headers=self.headers, timeout=self.timeout)
+
+    async def _send(self, url, headers):
+        """
+        Send the GET request, paced by the rate limiter when there is one,
+        and retried according to the retry policy. Waiting for a retry only
+        suspends this request, the others carry on.
+        """
+        attempt = 1
+        while True:
+            if self.rate_limiter is not None:
+                await asyncio.sleep(self.rate_limiter.reserve())
+            try:
+                res_raw, content = await self._get(url, headers)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                delay = self._retry_delay(url, attempt)
+                if delay is None:
+                    raise
+            else:
+                throttled = (self.rate_limiter is not None
+                             and self._update_quota(res_raw.headers,
+                                                    res_raw.status))
+                delay = self._retry_delay(url, attempt, res_raw.status,
+                                          res_raw.headers, throttled)
+                if delay is None:
+                    return res_raw, content
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _get(self, url, headers):
+        async with self._semaphore:
+            async with self.session.get(url, headers=headers) as res_raw:
+                return res_raw, await res_raw.read()
+
+    async def _api_call(self, url, fields=None):
+        """
+        _api_request for the calls run as separate tasks: also returns the
+        error it recorded, which the awaiting task can't see otherwise.
+        """
+        self._clear_error()
+        res = await self._api_request(url, fields)
+        return res, self._last_error()
+
+    async def _api_request(self, url, fields=None):
+        """
+        Fetch url, through the cache when there is one, and return the
+        decoded response (projected on `fields`) or False on error.
+        """
+        decode = self._decoder(fields)
+        entry = None
+        headers = None
+        if self.cache is not None:
+            entry = self.cache.get(url)
+            if entry is not None:
+                return self._decode_entry(entry, decode)
+            entry = self.cache.stale(url)
+            if entry is not None:
+                headers = self._conditional_headers(entry)
+        if self.session is None:
+            self.session = self._create_session()
+        try:
+            res_raw, content = await self._send(url, headers)
+            if res_raw.status == 304 and entry is not None:
+                return self._revalidated(url, entry, res_raw.headers, decode)
+            if self._check_status(res_raw.status, content):
+                return False
+            if self.cache is not None:
+                entry = self.cache.set(url, content,
+                                       res_raw.headers.get('ETag'),
+                                       res_raw.headers.get('Last-Modified'))
+                return self._decode_entry(entry, decode)
+            return decode(content)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            msg = f'aiohttp get error: {e!r}'
+            self._set_error(None, msg)
+            return False
@@ -0,0 +1,339 @@
+"""
+Response caches for FootballData, keyed on the URL built by _build_url.
+"""
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from .utils import FINAL_STATUSES, LIVE_STATUSES, endpoint_template
+
+# Seconds a response stays fresh, per endpoint
+DEFAULT_TTLS = {
+    'competitions': 24 * 3600,
+    'competitions/{id}': 3600,
+    'competitions/{id}/teams': 24 * 3600,
+    'competitions/{id}/matches': 300,
+    'matches': 60,
+    'matches/{id}': 60,
+    'teams/{id}': 24 * 3600,
+    'teams/{id}/matches': 300,
+}
+
+# The statuses as found in response bodies
+FINAL_STATUS_BYTES = frozenset(status.encode() for status in FINAL_STATUSES)
+LIVE_STATUS_BYTES = frozenset(status.encode() for status in LIVE_STATUSES)
+
+logger = logging.getLogger(__name__)
+
+STATUS_RE = re.compile(rb'"status"\s*:\s*"([A-Z_]+)"')
+
+
+class CacheEntry(object):
+    """
+    A cached response body and the metadata needed to decide its freshness
+    and revalidate it. A ttl of None never expires.
+
+    `decoded` keeps the body as decoded, a (decoder, value, decode_time)
+    tuple, so callers served from the same entry share it and must treat it
+    as read-only.
+    """
+    __slots__ = ('content', 'fetched_at', 'ttl', 'etag', 'last_modified',
+                 'decoded')
+
+    def __init__(self, content, fetched_at, ttl, etag=None, last_modified=None):
+        self.content = content
+        self.fetched_at = fetched_at
+        self.ttl = ttl
+        self.etag = etag
+        self.last_modified = last_modified
+        self.decoded = None
+
+    def has_validator(self):
+        return bool(self.etag or self.last_modified)
+
+    def is_fresh(self, now=None):
+        if self.ttl is None:
+            return True
+        return (now or time.time()) - self.fetched_at < self.ttl
+
+
+class BaseCache(object):
+    """
+    Freshness policy and counters shared by the cache backends.
+
+    The freshness of a response depends on its endpoint (`ttls`, falling
+    back to `default_ttl`) and on the status of the matches it contains:
+    responses with live matches expire after `live_ttl`, scheduled or
+    postponed ones after `upcoming_ttl`, and responses whose matches are all
+    finished are kept for `finished_ttl` (None: until evicted).
+
+    `stats` counts hits, misses and evictions.
+    """
+
+    def __init__(self, ttls=None, default_ttl=60, live_ttl=15,
+                 upcoming_ttl=60, finished_ttl=24 * 3600):
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl
+        self.live_ttl = live_ttl
+        self.upcoming_ttl = upcoming_ttl
+        self.finished_ttl = finished_ttl
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0
+        }
+
+    def ttl_for(self, url, content):
+        """
+        Seconds the response body fetched from url stays fresh.
+        """
+        ttl = self.ttls.get(endpoint_template(url), self.default_ttl)
+
+        statuses = set(STATUS_RE.findall(content))
+        if not statuses:
+            return ttl
+        if statuses & LIVE_STATUS_BYTES:
+            return _shortest(ttl, self.live_ttl)
+        if statuses <= FINAL_STATUS_BYTES:
+            return self.finished_ttl
+        return _shortest(ttl, self.upcoming_ttl)
+
+
+class MemoryCache(BaseCache):
+    """
+    In-memory LRU cache holding at most `maxsize` responses.
+    """
+
+    def __init__(self, maxsize=256, **policy):
+        super().__init__(**policy)
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, url):
+        """
+        Return the fresh entry cached for url, or None.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None or not entry.is_fresh():
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(url)
+            self.stats['hits'] += 1
+            return entry
+
+    def set(self, url, content, etag=None, last_modified=None):
+        """
+        Cache the response body fetched from url.
+        """
+        entry = CacheEntry(content, time.time(), self.ttl_for(url, content),
+                           etag, last_modified)
+        with self._lock:
+            self._entries[url] = entry
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+        return entry
+
+    def stale(self, url):
+        """
+        Return the expired entry cached for url if it can be revalidated.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry is not None and entry.has_validator():
+            return entry
+        return None
+
+    def refresh(self, url, entry, etag=None, last_modified=None):
+        """
+        Mark entry fresh again after the API confirmed it's unchanged.
+        """
+        entry.fetched_at = time.time()
+        entry.etag = etag or entry.etag
+        entry.last_modified = last_modified or entry.last_modified
+        with self._lock:
+            self._entries[url] = entry
+            self._entries.move_to_end(url)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCache(BaseCache):
+    """
+    On-disk cache in a SQLite file, shared by every process (and thread)
+    opening the same `path`, capped at `max_bytes` of response bodies by
+    evicting the least recently used ones.
+
+    The database runs in WAL mode so readers never block on a writer, and
+    writers wait up to `timeout` seconds for each other. A read or write
+    that fails (locked past the timeout, damaged file...) is logged and
+    counted in stats['errors'], and the response fetched from the API.
+    """
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, path, max_bytes=64 * 1024 * 1024, timeout=30,
+                 **policy):
+        super().__init__(**policy)
+        self.path = os.fspath(path)
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.stats['errors'] = 0
+        self._stats_lock = threading.Lock()
+        # Imports sqlite3, only needed by this cache
+        from .sqlite import SQLiteDatabase
+
+        self._db = SQLiteDatabase(self.path, timeout, self.SCHEMA_VERSION,
+                                  self._create_schema)
+
+    def __len__(self):
+        return self._db.connection().execute(
+            'SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    def get(self, url):
+        """
+        Return the fresh entry cached for url, or None.
+        """
+        try:
+            db = self._db.connection()
+            row = db.execute(
+                'SELECT content, fetched_at, ttl, etag, last_modified,'
+                ' accessed_at FROM responses WHERE url = ?', (url,)).fetchone()
+        except self._db.Error as e:
+            self._failed('get', url, e)
+            row = None
+        now = time.time()
+        entry = CacheEntry(*row[:5]) if row else None
+        if entry is None or not entry.is_fresh(now):
+            self._count('misses')
+            return None
+
+        # Recency only drives eviction, no need to write on every hit
+        if now - row[5] > 1:
+            try:
+                db.execute('UPDATE responses SET accessed_at = ? WHERE url = ?',
+                           (now, url))
+            except self._db.Error as e:
+                self._failed('get', url, e)
+        self._count('hits')
+        return entry
+
+    def set(self, url, content, etag=None, last_modified=None):
+        """
+        Cache the response body fetched from url, then evict the least
+        recently used responses past max_bytes.
+        """
+        now = time.time()
+        entry = CacheEntry(content, now, self.ttl_for(url, content),
+                           etag, last_modified)
+        try:
+            with self._db.transaction() as db:
+                db.execute(
+                    'INSERT OR REPLACE INTO responses (url, content, size,'
+                    ' fetched_at, ttl, etag, last_modified, accessed_at)'
+                    ' VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (url, content, len(content), now, entry.ttl, etag,
+                     last_modified, now))
+                self._evict(db)
+        except self._db.Error as e:
+            self._failed('set', url, e)
+        return entry
+
+    def stale(self, url):
+        """
+        Return the expired entry cached for url if it can be revalidated.
+        """
+        try:
+            row = self._db.connection().execute(
+                'SELECT content, fetched_at, ttl, etag, last_modified'
+                ' FROM responses WHERE url = ?', (url,)).fetchone()
+        except self._db.Error as e:
+            self._failed('stale', url, e)
+            return None
+        entry = CacheEntry(*row) if row else None
+        if entry is not None and entry.has_validator():
+            return entry
+        return None
+
+    def refresh(self, url, entry, etag=None, last_modified=None):
+        """
+        Mark entry fresh again after the API confirmed it's unchanged.
+        """
+        now = time.time()
+        entry.fetched_at = now
+        entry.etag = etag or entry.etag
+        entry.last_modified = last_modified or entry.last_modified
+        try:
+            self._db.connection().execute(
+                'UPDATE responses SET fetched_at = ?, etag = ?,'
+                ' last_modified = ?, accessed_at = ? WHERE url = ?',
+                (now, entry.etag, entry.last_modified, now, url))
+        except self._db.Error as e:
+            self._failed('refresh', url, e)
+
+    def clear(self):
+        self._db.connection().execute('DELETE FROM responses')
+
+    def close(self):
+        """
+        Close the connection of the calling thread.
+        """
+        self._db.close()
+
+    def _evict(self, db):
+        total = db.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = []
+        rows = db.execute(
+            'SELECT url, size FROM responses ORDER BY accessed_at')
+        for url, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((url,))
+            total -= size
+        db.executemany('DELETE FROM responses WHERE url = ?', evicted)
+        self._count('evictions', len(evicted))
+
+    def _count(self, stat, n=1):
+        with self._stats_lock:
+            self.stats[stat] += n
+
+    def _failed(self, action, url, error):
+        logger.warning(f'cache: {action} {url} failed: {error!r}')
+        self._count('errors')
+
+    def _create_schema(self, db):
+        # Stale layout from another version: it's a cache, start over
+        db.execute('DROP TABLE IF EXISTS responses')
+        db.execute(
+            'CREATE TABLE responses ('
+            ' url TEXT PRIMARY KEY,'
+            ' content BLOB NOT NULL,'
+            ' size INTEGER NOT NULL,'
+            ' fetched_at REAL NOT NULL,'
+            ' ttl REAL,'
+            ' etag TEXT,'
+            ' last_modified TEXT,'
+            ' accessed_at REAL NOT NULL)')
+        db.execute(
+            'CREATE INDEX responses_accessed ON responses (accessed_at)')
+
+
+def _shortest(ttl, other):
+    if ttl is None:
+        return other
+    return min(ttl, other)
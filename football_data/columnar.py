@@ -0,0 +1,129 @@
+"""
+Columnar decoding of match lists into NumPy structured arrays, for
+vectorized computations over many matches.
+
+Requires numpy (pip install football_data[columnar]), and pandas for
+to_dataframe().
+"""
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from .utils import MATCH_STATUSES, dict2obj, json_loads
+
+# Match statuses, stored as their index (-1 when unknown)
+STATUSES = MATCH_STATUSES
+STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+# Stored instead of null ids, matchdays and scores
+MISSING = -1
+
+MATCH_DTYPE = [
+    ('id', 'i8'),
+    ('utcDate', 'datetime64[s]'),
+    ('status', 'i1'),
+    ('matchday', 'i2'),
+    ('competition', 'i4'),
+    ('season', 'i4'),
+    ('homeTeam', 'i4'),
+    ('awayTeam', 'i4'),
+    ('fullTimeHome', 'i2'),
+    ('fullTimeAway', 'i2'),
+    ('halfTimeHome', 'i2'),
+    ('halfTimeAway', 'i2'),
+]
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError(
+            'columnar decoding requires numpy: pip install football_data[columnar]')
+
+
+def _id(obj):
+    if obj is None or obj.get('id') is None:
+        return MISSING
+    return obj['id']
+
+
+def _goals(score, period, side):
+    goals = (score.get(period) or {}).get(side)
+    return MISSING if goals is None else goals
+
+
+def _row(match):
+    score = match.get('score') or {}
+    matchday = match.get('matchday')
+    return (
+        match['id'],
+        # numpy parses ISO 8601 dates, but not the UTC 'Z' suffix
+        match['utcDate'].rstrip('Z'),
+        STATUS_CODES.get(match.get('status'), MISSING),
+        MISSING if matchday is None else matchday,
+        _id(match.get('competition')),
+        _id(match.get('season')),
+        _id(match.get('homeTeam')),
+        _id(match.get('awayTeam')),
+        _goals(score, 'fullTime', 'home'),
+        _goals(score, 'fullTime', 'away'),
+        _goals(score, 'halfTime', 'home'),
+        _goals(score, 'halfTime', 'away'),
+    )
+
+
+def matches_to_array(matches):
+    """
+    Convert parsed matches (dicts, as in the API response) into a structured
+    array with MATCH_DTYPE, one row per match.
+    """
+    _require_numpy()
+    return np.array([_row(match) for match in matches], dtype=MATCH_DTYPE)
+
+
+def merge_arrays(arrays):
+    """
+    Concatenate match arrays, keeping one row per match id, sorted by utcDate.
+    """
+    _require_numpy()
+    matches = np.concatenate(arrays)
+    _, first = np.unique(matches['id'], return_index=True)
+    matches = matches[first]
+    return matches[np.argsort(matches['utcDate'], kind='stable')]
+
+
+def to_columns(matches):
+    """
+    A dict of column name -> 1-D array (views, no copy) of a match array.
+    """
+    return {name: matches[name] for name in matches.dtype.names}
+
+
+def to_dataframe(matches):
+    """
+    A pandas DataFrame of a match array, with statuses as categories and
+    utcDate as UTC timestamps.
+    """
+    import pandas as pd
+
+    df = pd.DataFrame(to_columns(matches))
+    df['utcDate'] = df['utcDate'].dt.tz_localize('UTC')
+    df['status'] = pd.Categorical.from_codes(
+        df['status'], categories=list(STATUSES))
+    return df
+
+
+def json2columns(data):
+    """
+    Decode a response body, turning its `matches` list (if any) into a
+    structured array and everything else into SimpleNamespace objects.
+    `data` may also be JSON already parsed into dicts and lists.
+    """
+    res = data if type(data) in (dict, list) else json_loads(data)
+    if type(res) is not dict or type(res.get('matches')) is not list:
+        return dict2obj(res)
+
+    matches = matches_to_array(res.pop('matches'))
+    res = dict2obj(res)
+    res.matches = matches
+    return res
@@ -1,16 +1,35 @@
 """
 Contains the FootballData class used to interact with the API.
 """
+import contextvars
+import importlib
+import itertools
+import logging
 import os
 import re
-import requests
+import threading
+import time
 import urllib.parse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
-from .constants import LEAGUE_CODE, TEAM_ID
-from .utils import json2obj, validate_date
+from .cache import MemoryCache
+from .metrics import RequestEvent
+from .projection import Projection
+from .ratelimit import RateLimiter
+from .records import RecordDecoder
+from .retry import RetryPolicy, parse_retry_after
+from .singleflight import SingleFlight
+from .streaming import ArrayStreamParser
+from .transport import NetworkError, RequestsTransport, TransportError
+from .utils import (date_windows, endpoint_template, json2lazy, json2obj,
+                    json_loads, validate_date)
 
-import logging
-logging.basicConfig(format="%(asctime)s: %(levelname)s: %(name)s: %(message)s")
+# Last error of each client, for each thread or asyncio task (see the error
+# property): a {client key: error} dict, copied rather than updated in place,
+# since the tasks started from a context share its dict
+_errors = contextvars.ContextVar('football_data_errors', default={})
+_client_keys = itertools.count()
 
 logging_levels = {
     'DEBUG': logging.DEBUG,
@@ -18,18 +37,34 @@ logging_levels = {
     'ERROR': logging.ERROR
 }
 
-class FootballData(object):
+# How responses are turned into objects, see the decoder argument.
+# Classes are instantiated once per client, and module paths (numpy being
+# slow to import) imported by the first client using them.
+DECODERS = {
+    'namespace': json2obj,
+    'lazy': json2lazy,
+    'records': RecordDecoder,
+    'columnar': 'columnar.json2columns'
+}
+
+
+class BaseFootballData(object):
     """
-    The FootballData class.
+    State and URL building shared by the sync and async clients.
+
+    Every `_<endpoint>_url` method validates the filters of the public method
+    with the same name and returns the URL to fetch, or None (after logging
+    the reason) when the filters are invalid.
     """
 
     API_URL = 'https://api.football-data.org/v4/'
 
-    def __init__(self, api_key=None, log_level='INFO'):
-        """
-        Initialise a new instance of the FootballData class.
-        """
-        self.logger = logging.getLogger()
+    # Widest dateFrom/dateTo range (in days) the API accepts
+    MAX_DATE_RANGE = 10
+
+    def __init__(self, api_key=None, log_level='INFO', keep_alive=True,
+                 cache=None, rate_limit=None, retry=None, decoder='namespace'):
+        self.logger = logging.getLogger('football_data')
         self.logger.setLevel(log_level)
 
         if not api_key:
@@ -41,48 +76,48 @@ class FootballData(object):
 
         self.api_key = api_key
         self.headers = {'X-Auth-Token': api_key}
-        self.error = {
-            'code': None,
-            'msg': ''
+        if not keep_alive:
+            self.headers['Connection'] = 'close'
+        # Key of the client's error in _errors
+        self._error_key = next(_client_keys)
+        # cache=True for a default MemoryCache, or any cache instance
+        self.cache = MemoryCache() if cache is True else cache
+        # rate_limit=<requests per minute>, or a RateLimiter shared with
+        # other clients using the same API key
+        if isinstance(rate_limit, int):
+            rate_limit = RateLimiter(rate_limit)
+        self.rate_limiter = rate_limit
+        # retry=None for the default RetryPolicy, False to never retry
+        if retry is None:
+            retry = RetryPolicy()
+        elif retry is False:
+            retry = RetryPolicy(max_attempts=1)
+        self.retry = retry
+        if decoder not in DECODERS:
+            raise ValueError(f'Unknown decoder {decoder!r}, use one of: '
+                             f'{", ".join(DECODERS)}.')
+        decode = DECODERS[decoder]
+        if isinstance(decode, str):
+            module, name = decode.rsplit('.', 1)
+            decode = getattr(importlib.import_module(f'.{module}', __package__),
+                             name)
+        self.decode = decode() if isinstance(decode, type) else decode
+        self._columnar = decoder == 'columnar'
+        self._projections = {}
+        self.stats = {
+            'revalidation': {},
+            'retries': {},
+            'coalesced': {}
         }
+        self._stats_lock = threading.Lock()
 
-    def competitions(self):
-        """
-        List all available competitions.
-        """
-        self._clear_error()
-
-        url = self._build_url('competitions')
-        res = self._api_request(url)
-        if res:
-            json_tmp = json2obj(res)
-            return json_tmp.competitions
-        else:
-            competitions = []
-        return competitions
-
-    def competition(self, competition):
-        """
-        List one particular competition.
-        """
-        self._clear_error()
-
-        url = self._build_url(f'competitions/{competition}')
-        res = self._api_request(url)
-
-        if res:
-            json_tmp = json2obj(res)
-            competition = json_tmp
-        else:
-            competition = None
-        return competition
+    def _competitions_url(self):
+        return self._build_url('competitions')
 
-    def competition_teams(self, competition, season=None, stage=None):
-        """
-        List all teams for a particular competition.
-        """
-        self._clear_error()
+    def _competition_url(self, competition):
+        return self._build_url(f'competitions/{competition}')
 
+    def _competition_teams_url(self, competition, season=None, stage=None):
         # competition could be an id or a code like 'WC'
         query_params = {}
 
@@ -91,35 +126,23 @@ class FootballData(object):
         if stage:
             query_params['stage'] = stage
 
-        url = self._build_url(
+        return self._build_url(
             f'competitions/{competition}/teams', query_params)
-        res = self._api_request(url)
-        if res:
-            json_tmp = json2obj(res)
-            return json_tmp.teams
-        else:
-            self.logger.error(f'teams: no data found')
-            return None
-
-    def competition_matches(self, competition, dateFrom=None, dateTo=None, stage=None, status=None, matchday=None, group=None, season=None):
-        """
-        List all matches for a particular competition.
-        """
-        self._clear_error()
 
+    def _competition_matches_url(self, competition, dateFrom=None, dateTo=None, stage=None, status=None, matchday=None, group=None, season=None):
         query_params = {}
 
         # Error checking for query parameter dateFrom
         if dateFrom and dateTo:
             if not validate_date(dateFrom) or not validate_date(dateTo):
                 self.logger.error(f'competition_matches: invalid dateFrom/dateTo')
-                return []
+                return None
             query_params['dateFrom'] = dateFrom
             query_params['dateTo'] = dateTo
         elif dateFrom or dateTo:
             self.logger.error(
                 'competition_matches: pecify both dateFrom and dateTo or none')
-            return []
+            return None
         if stage:
             query_params['stage'] = stage
         if status:
@@ -131,33 +154,21 @@ class FootballData(object):
         if season:
             query_params['season'] = season
 
-        url = self._build_url(
+        return self._build_url(
             f'competitions/{competition}/matches', query_params)
 
-        res = self._api_request(url)
-        if res:
-            json_tmp = json2obj(res)
-            return json_tmp.matches
-        else:
-            return []
-
-    def matches(self, competitions=None, dateFrom=None, dateTo=None, status=None):
-        """
-        List matches across (a set of) competitions.
-        """
-        self._clear_error()
-
+    def _matches_url(self, competitions=None, dateFrom=None, dateTo=None, status=None):
         query_params = {}
         # Error checking for query parameter dateFrom
         if dateFrom and dateTo:
             if not validate_date(dateFrom) or not validate_date(dateTo):
                 self.logger.error(f'matches: invalid dateFrom/dateTo')
-                return []
+                return None
             query_params['dateFrom'] = dateFrom
             query_params['dateTo'] = dateTo
         elif dateFrom or dateTo:
             self.logger.error('matches specify both dateFrom and dateTo or none')
-            return []
+            return None
 
         # COMMA-separated list of competitions, e.g. 2000,2001 or WC,CL
         if competitions:
@@ -166,86 +177,108 @@ class FootballData(object):
         if status:
             query_params['status'] = status
 
-        url = self._build_url('matches', query_params)
-        res = self._api_request(url)
-        if res:
-            json_tmp = json2obj(res)
-            return json_tmp.matches
-        else:
-            return []
+        return self._build_url('matches', query_params)
 
-    def match(self, match_id):
-        """
-        Show one particular match.
-        """
-        self._clear_error()
-
-        url = self._build_url(f'matches/{match_id}')
-        res = self._api_request(url)
-        if res:
-            json_tmp = json2obj(res)
-            return json_tmp.match
-        else:
-            return []
-
-    def team_matches(self, team_id, dateFrom=None, dateTo=None, status=None, venue=None, limit=None):
-        """
-        Show all matches for a particular team.
-        """
-        self._clear_error()
+    def _match_url(self, match_id):
+        return self._build_url(f'matches/{match_id}')
 
+    def _team_matches_url(self, team_id, dateFrom=None, dateTo=None, status=None, venue=None, limit=None):
         query_params = {}
 
         # Error checking for query parameter dateFrom
         if dateFrom and dateTo:
             if not validate_date(dateFrom) or not validate_date(dateTo):
                 self.logger.error(f'team_matches: invalid dateFrom/dateTo')
-                return []
+                return None
             query_params['dateFrom'] = dateFrom
             query_params['dateTo'] = dateTo
         elif dateFrom or dateTo:
             self.logger.error(
                 'team_matches specify both dateFrom and dateTo or none')
-            return []
+            return None
 
         # Error checking for query parameter venue
         if venue:
             if venue not in ('HOME', 'AWAY'):
                 self.logger.error('venue is invalid.')
-                return []
+                return None
             query_params['venue'] = venue
         if limit:
             if isinstance(limit, int):
                 query_params['limit'] = limit
             else:
                 self.logger.error('limit is invalid.')
-                return []
+                return None
 
-        url = self._build_url(f'teams/{team_id}/matches', query_params)
-        res = self._api_request(url)
-        if res:
-            json_tmp = json2obj(res)
-            return json_tmp.matches
-        else:
-            return []
+        return self._build_url(f'teams/{team_id}/matches', query_params)
 
-    def team(self, team_id):
+    def _team_url(self, team_id):
+        return self._build_url(f'teams/{team_id}')
+
+    def _date_windows(self, dateFrom, dateTo):
         """
-        Show one particular team.
+        Split dateFrom..dateTo into ranges the API accepts, or None (after
+        logging the reason) when the dates are invalid.
         """
-        self._clear_error()
+        if not validate_date(dateFrom) or not validate_date(dateTo):
+            self.logger.error('invalid dateFrom/dateTo')
+            return None
+        try:
+            windows = date_windows(dateFrom, dateTo, self.MAX_DATE_RANGE)
+        except ValueError:
+            self.logger.error('invalid dateFrom/dateTo')
+            return None
+        if not windows:
+            self.logger.error('dateFrom is after dateTo')
+            return None
+        return windows
 
-        url = self._build_url(f'teams/{team_id}')
-        res = self._api_request(url)
-        if res:
-            json_tmp = json2obj(res)
-            return json_tmp
+    def _merge_matches(self, responses):
+        """
+        Merge the matches of several responses into one list (or array, with
+        the columnar decoder), deduplicated by id and sorted by utcDate.
+        """
+        match_lists = [res.matches for res in responses]
+        if match_lists and hasattr(match_lists[0], 'dtype'):
+            from .columnar import merge_arrays
+            return merge_arrays(match_lists)
+
+        unique = {}
+        for matches in match_lists:
+            for match in matches:
+                unique[match.id] = match
+        return sorted(unique.values(), key=lambda match: match.utcDate)
+
+    @property
+    def error(self):
+        """
+        The error of the last call made by the calling thread (or asyncio
+        task), as {'code', 'msg'}. Calls running side by side on one shared
+        client each see their own error.
+        """
+        return self._last_error() or {'code': None, 'msg': ''}
+
+    def _last_error(self):
+        return _errors.get().get(self._error_key)
+
+    def _record_error(self, error):
+        """
+        Make error (None to clear it) the last one of the calling thread or
+        task.
+        """
+        errors = _errors.get()
+        if error is None:
+            if self._error_key not in errors:
+                return
+            errors = dict(errors)
+            del errors[self._error_key]
         else:
-            return None
+            errors = dict(errors)
+            errors[self._error_key] = error
+        _errors.set(errors)
 
     def _clear_error(self):
-        self.error['code'] = None
-        self.error['msg'] = ''
+        self._record_error(None)
 
     def _build_url(self, action, query_params=None):
         """
@@ -263,20 +296,745 @@ class FootballData(object):
 
         return url
 
-    def _api_request(self, url, json_format=False):
+    def _update_quota(self, res_raw_headers, status):
+        """
+        Feed the quota reported by the API to the rate limiter. Returns True
+        when the quota is used up and the limiter now holds the requests
+        until it resets.
+        """
+        available = res_raw_headers.get('X-Requests-Available-Minute')
+        reset = res_raw_headers.get('X-RequestCounter-Reset')
+        if status == 429:
+            available = 0
+            reset = reset or res_raw_headers.get('Retry-After')
+        if available is None:
+            return False
+        # Seconds (fractional too) or an HTTP date, like Retry-After
+        seconds = parse_retry_after(reset) if reset else 60
         try:
-            res_raw = requests.get(url, headers=self.headers)
-            res = res_raw.json()
-            if 'errorCode' in res or 'error' in res:
-                err = res.get('error') or res.get('errorCode')
-                msg = res['message']
-                self.error['code'] = err
-                self.error['msg'] = msg
-                self.logger.error(msg)
-                return False
+            available = int(available)
+        except ValueError:
+            seconds = None
+        if seconds is None:
+            self.logger.debug(f'invalid quota headers: {available}, {reset}')
+            return False
+        self.rate_limiter.update(available, seconds)
+        return available <= 0
+
+    def _retry_delay(self, url, attempt, status=None, res_raw_headers=None,
+                     throttled=False):
+        """
+        Seconds to wait before retrying url after `attempt` failed with
+        `status` (None for a network error), or None to give up. throttled:
+        the rate limiter holds the requests until the quota resets.
+        """
+        if not self.retry.should_retry(attempt, status):
+            return None
+        if status == 429 and throttled:
+            # The limiter already holds requests until the quota resets
+            delay = 0
+        else:
+            retry_after = res_raw_headers and res_raw_headers.get('Retry-After')
+            delay = self.retry.delay(attempt, retry_after)
+
+        endpoint = endpoint_template(url)
+        with self._stats_lock:
+            retries = self.stats['retries']
+            retries[endpoint] = retries.get(endpoint, 0) + 1
+        self.logger.debug(
+            f'retrying {url} in {delay:.2f}s (attempt {attempt}, status {status})')
+        return delay
+
+    def _conditional_headers(self, entry):
+        """
+        Validators to revalidate a stale cache entry with.
+        """
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def _decoder(self, fields=None):
+        """
+        The decoder for a request, projecting the response lists on `fields`
+        when given (except with the columnar decoder, whose arrays already
+        hold a fixed set of columns).
+        """
+        if not fields or self._columnar:
+            return self.decode
+        if isinstance(fields, str):
+            fields = fields.split(',')
+        fields = tuple(fields)
+        decode = self._projections.get(fields)
+        if decode is None:
+            # Kept, so cache entries can memoize the projected response too
+            decode = self._projections[fields] = Projection(fields, self.decode)
+        return decode
+
+    def _revalidated(self, url, entry, headers, decode, event=None):
+        """
+        The API answered 304 Not Modified for a stale cache entry: mark it
+        fresh again and serve it, counting the download and decode it saved.
+        """
+        decoded = entry.decoded
+        decode_time = decoded[2] if decoded and decoded[0] is decode else 0
+        self.cache.refresh(url, entry, headers.get('ETag'),
+                           headers.get('Last-Modified'))
+
+        with self._stats_lock:
+            counters = self.stats['revalidation'].setdefault(
+                endpoint_template(url),
+                {'not_modified': 0, 'bytes_saved': 0, 'decode_time_saved': 0})
+            counters['not_modified'] += 1
+            counters['bytes_saved'] += len(entry.content)
+            counters['decode_time_saved'] += decode_time
+        return self._decode_entry(entry, decode, event, 'revalidated')
+
+    def _decode_entry(self, entry, decode, event=None, outcome=None):
+        """
+        Decode a cached response body once, later calls share the result.
+        The cache `outcome` and decode time go to the event, if any.
+        """
+        decoded = entry.decoded
+        if decoded is not None and decoded[0] is decode:
+            value = decoded[1]
+            decode_time = 0.0
+        else:
+            start = time.perf_counter()
+            value = decode(entry.content)
+            decode_time = time.perf_counter() - start
+            # Replaced in one go: callers decoding the same entry with other
+            # projections never see a value paired with the wrong decoder
+            entry.decoded = (decode, value, decode_time)
+        if event is not None:
+            event.cache = outcome
+            event.decode_time = decode_time
+        return value
+
+    def _check_status(self, status, content):
+        """
+        Record the error of a response the API failed (HTTP status 400 and
+        above), parsing its body only then. Returns True when it's an error.
+        """
+        if status < 400:
+            return False
+        try:
+            res = json_loads(content)
+        except ValueError:
+            res = None
+        if type(res) is not dict or not self._check_error(res):
+            self._set_error(status, f'HTTP error {status}')
+        return True
+
+    def _check_error(self, res):
+        """
+        Record the error carried by a parsed API error body, if any.
+        Returns True when the response is an error.
+        """
+        if 'errorCode' in res or 'error' in res:
+            err = res.get('error') or res.get('errorCode')
+            msg = res.get('message', '')
+            self._set_error(err, msg)
+            return True
+        return False
+
+    def _set_error(self, code, msg):
+        """
+        Record an error as the last one of the calling thread or task.
+        """
+        self._record_error({'code': code, 'msg': msg})
+        self.logger.error(msg)
+
+
+class BulkResult(dict):
+    """
+    Results of a bulk call keyed by id, the ids that failed are in `errors`
+    instead, each with its own {'code', 'msg'} error.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.errors = {}
+
+
+class FootballData(BaseFootballData):
+    """
+    The FootballData class.
+    """
+
+    # Bytes read from the socket at a time by the stream_* methods
+    STREAM_CHUNK_SIZE = 16 * 1024
+
+    def __init__(self, api_key=None, log_level='INFO', pool_connections=10,
+                 pool_maxsize=10, pool_block=False, keep_alive=True,
+                 connect_timeout=3.05, read_timeout=27, cache=None,
+                 rate_limit=None, retry=None, decoder='namespace',
+                 coalesce=True, transport=None, hooks=None):
+        """
+        Initialise a new instance of the FootballData class.
+
+        Every instance owns a persistent HTTP session, created by the first
+        request, so connections to the API are pooled and reused across calls
+        (unless another `transport` is given):
+
+        - pool_connections: number of per-host connection pools to keep
+        - pool_maxsize: max connections kept alive per host
+        - pool_block: block when the pool is exhausted instead of opening
+          throw-away connections
+        - keep_alive: set to False to send `Connection: close` on each call
+        - connect_timeout / read_timeout: seconds, None to wait forever
+        - cache: True for an in-memory MemoryCache, or a cache instance
+        - rate_limit: requests per minute allowed by the API plan, or a
+          RateLimiter shared across clients; calls over budget wait their
+          turn instead of failing
+        - retry: RetryPolicy for throttled, server and network errors,
+          False to never retry
+        - decoder: 'namespace' to decode responses into SimpleNamespace
+          objects, 'lazy' for the faster json2lazy (same attribute access),
+          'records' for compact __slots__ records (see records.py),
+          'columnar' for match lists as NumPy arrays (see columnar.py)
+        - coalesce: threads making the same call at the same time share a
+          single request and its result (counted in stats['coalesced']),
+          False to always send one request per call
+        - transport: what sends the requests (see transport.py), by default
+          a RequestsTransport with the pool_* arguments
+        - hooks: functions called with a RequestEvent after each API call
+          (status, bytes, timings, decode time, retries, cache outcome and
+          quota), e.g. a RequestMetrics or a SpanHook (see metrics.py)
+
+        Use it as a context manager (or call close()) to release the pool.
+        """
+        super().__init__(api_key, log_level, keep_alive, cache, rate_limit,
+                         retry, decoder)
+        self.flights = SingleFlight() if coalesce else None
+
+        self.timeout = (connect_timeout, read_timeout)
+        if transport is None:
+            transport = RequestsTransport(pool_connections, pool_maxsize,
+                                          pool_block)
+        self.transport = transport
+        self.hooks = list(hooks or ())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def session(self):
+        """
+        The requests Session of the default RequestsTransport, created (and
+        requests imported) on first use.
+        """
+        return self.transport.session
+
+    @session.setter
+    def session(self, session):
+        self.transport.session = session
+
+    def close(self):
+        """
+        Close the transport and all of its pooled connections, and forget
+        the last error of the calling thread.
+        """
+        self.transport.close()
+        self._clear_error()
+
+    def competitions(self):
+        """
+        List all available competitions.
+        """
+        self._clear_error()
+
+        url = self._competitions_url()
+        res = self._api_request(url)
+        if res:
+            return res.competitions
+        else:
+            competitions = []
+        return competitions
+
+    def competition(self, competition):
+        """
+        List one particular competition.
+        """
+        self._clear_error()
+
+        url = self._competition_url(competition)
+        res = self._api_request(url)
+
+        if res:
+            competition = res
+        else:
+            competition = None
+        return competition
+
+    def competition_teams(self, competition, season=None, stage=None, fields=None):
+        """
+        List all teams for a particular competition.
+
+        fields: dotted paths of the team fields to keep, e.g.
+        ['id', 'name', 'area.code'], to skip building the others.
+        """
+        self._clear_error()
+
+        url = self._competition_teams_url(competition, season, stage)
+        res = self._api_request(url, fields)
+        if res:
+            return res.teams
+        else:
+            self.logger.error(f'teams: no data found')
+            return None
+
+    def competition_matches(self, competition, dateFrom=None, dateTo=None, stage=None, status=None, matchday=None, group=None, season=None, fields=None):
+        """
+        List all matches for a particular competition.
+
+        fields: dotted paths of the match fields to keep, e.g.
+        ['id', 'status', 'score', 'homeTeam.id', 'awayTeam.id'], to skip
+        building the others (referees, odds, area...).
+        """
+        self._clear_error()
+
+        url = self._competition_matches_url(
+            competition, dateFrom, dateTo, stage, status, matchday, group, season)
+        if not url:
+            return []
+
+        res = self._api_request(url, fields)
+        if res:
+            return res.matches
+        else:
+            return []
+
+    def matches(self, competitions=None, dateFrom=None, dateTo=None, status=None, fields=None):
+        """
+        List matches across (a set of) competitions, keeping only `fields`
+        of each match when given (see competition_matches()).
+        """
+        self._clear_error()
+
+        url = self._matches_url(competitions, dateFrom, dateTo, status)
+        if not url:
+            return []
+
+        res = self._api_request(url, fields)
+        if res:
+            return res.matches
+        else:
+            return []
+
+    def match(self, match_id):
+        """
+        Show one particular match.
+        """
+        self._clear_error()
+
+        url = self._match_url(match_id)
+        res = self._api_request(url)
+        if res:
+            # Wrapped in `match` by the v2 API, at the top level since v4
+            return getattr(res, 'match', res)
+        else:
+            return []
+
+    def team_matches(self, team_id, dateFrom=None, dateTo=None, status=None, venue=None, limit=None, fields=None):
+        """
+        Show all matches for a particular team, keeping only `fields` of each
+        match when given (see competition_matches()).
+        """
+        self._clear_error()
+
+        url = self._team_matches_url(
+            team_id, dateFrom, dateTo, status, venue, limit)
+        if not url:
+            return []
+
+        res = self._api_request(url, fields)
+        if res:
+            return res.matches
+        else:
+            return []
+
+    def team(self, team_id):
+        """
+        Show one particular team.
+        """
+        self._clear_error()
+
+        url = self._team_url(team_id)
+        res = self._api_request(url)
+        if res:
+            return res
+        else:
+            return None
+
+    def matches_range(self, dateFrom, dateTo, competitions=None, status=None, max_workers=4):
+        """
+        List matches across (a set of) competitions between two dates, however
+        far apart.
+
+        The range is split into windows the API accepts, fetched by up to
+        `max_workers` threads (paced by the rate limiter when there is one),
+        and the matches are merged, deduplicated and sorted by utcDate.
+        """
+        self._clear_error()
+
+        windows = self._date_windows(dateFrom, dateTo)
+        if not windows:
+            return []
+        urls = [self._matches_url(competitions, start, end, status)
+                for start, end in windows]
+        return self._fetch_matches(urls, max_workers)
+
+    def team_matches_range(self, team_id, dateFrom, dateTo, status=None, venue=None, max_workers=4):
+        """
+        Show the matches of a particular team between two dates, however far
+        apart, fetched like matches_range().
+        """
+        self._clear_error()
+
+        windows = self._date_windows(dateFrom, dateTo)
+        if not windows:
+            return []
+        urls = [self._team_matches_url(team_id, start, end, status, venue)
+                for start, end in windows]
+        if not all(urls):
+            return []
+        return self._fetch_matches(urls, max_workers)
+
+    def teams_bulk(self, team_ids, max_workers=8):
+        """
+        Show several teams, fetched by up to `max_workers` threads (paced by
+        the rate limiter when there is one). Returns a BulkResult.
+        """
+        return self._bulk(team_ids, self._team_url, None, max_workers)
+
+    def team_matches_bulk(self, team_ids, dateFrom=None, dateTo=None, status=None, venue=None, limit=None, max_workers=8):
+        """
+        Show the matches of several teams, fetched like teams_bulk(), with the
+        same filters as team_matches().
+        """
+        def url_for(team_id):
+            return self._team_matches_url(
+                team_id, dateFrom, dateTo, status, venue, limit)
+
+        return self._bulk(team_ids, url_for, 'matches', max_workers)
+
+    def matches_bulk(self, match_ids, max_workers=8):
+        """
+        Show several matches, fetched like teams_bulk().
+        """
+        return self._bulk(match_ids, self._match_url, None, max_workers)
+
+    def _bulk(self, ids, url_for, key, max_workers):
+        """
+        Fetch url_for(id) for every id concurrently, keeping the `key`
+        attribute of each response (the whole response when None).
+        """
+        self._clear_error()
+
+        def fetch(id_):
+            url = url_for(id_)
+            if not url:
+                return id_, None, {'code': None, 'msg': 'invalid filters'}
+            res, error = self._api_call(url)
+            if res is False:
+                error = error or {'code': None, 'msg': 'request failed'}
+                return id_, None, error
+            return id_, getattr(res, key) if key else res, None
+
+        ids = list(dict.fromkeys(ids))
+        results = BulkResult()
+        if not ids:
+            return results
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(ids))) as pool:
+            for id_, value, error in pool.map(fetch, ids):
+                if error:
+                    results.errors[id_] = error
+                else:
+                    results[id_] = value
+        return results
+
+    def iter_competition_matches(self, competitions=None, seasons=None, prefetch=1, **filters):
+        """
+        Yield the matches of several competitions (all of LEAGUE_CODE by
+        default) and seasons (the current one by default), one at a time.
+
+        The following `prefetch` responses are fetched in the background while
+        the current one is consumed, and only those are held in memory.
+        Competitions that fail are logged and skipped. Takes the same filters
+        as competition_matches().
+        """
+        if not competitions:
+            from .constants import LEAGUE_CODE
+            competitions = list(LEAGUE_CODE)
+        urls = (self._competition_matches_url(competition, season=season, **filters)
+                for competition in competitions
+                for season in (seasons or [None]))
+        return self._iter_matches(urls, prefetch)
+
+    def iter_matches(self, dateFrom, dateTo, competitions=None, status=None, prefetch=1):
+        """
+        Yield the matches across (a set of) competitions between two dates,
+        however far apart, one API-sized date window after the other, fetched
+        ahead like iter_competition_matches().
+        """
+        windows = self._date_windows(dateFrom, dateTo) or []
+        urls = (self._matches_url(competitions, start, end, status)
+                for start, end in windows)
+        return self._iter_matches(urls, prefetch)
+
+    def stream_competition_matches(self, competition, dateFrom=None, dateTo=None, stage=None, status=None, matchday=None, group=None, season=None):
+        """
+        Yield the matches of a particular competition one by one, each as
+        soon as it has been downloaded, instead of waiting for (and holding)
+        the whole response. Takes the same filters as competition_matches().
+
+        Streamed responses skip the cache. On error the stream ends early,
+        with the reason in self.error.
+        """
+        url = self._competition_matches_url(
+            competition, dateFrom, dateTo, stage, status, matchday, group, season)
+        return self._api_stream(url, 'matches')
+
+    def stream_matches(self, competitions=None, dateFrom=None, dateTo=None, status=None):
+        """
+        Yield matches across (a set of) competitions one by one, streamed like
+        stream_competition_matches().
+        """
+        url = self._matches_url(competitions, dateFrom, dateTo, status)
+        return self._api_stream(url, 'matches')
+
+    def stream_team_matches(self, team_id, dateFrom=None, dateTo=None, status=None, venue=None, limit=None):
+        """
+        Yield the matches of a particular team one by one, streamed like
+        stream_competition_matches().
+        """
+        url = self._team_matches_url(
+            team_id, dateFrom, dateTo, status, venue, limit)
+        return self._api_stream(url, 'matches')
+
+    def stream_competition_teams(self, competition, season=None, stage=None):
+        """
+        Yield the teams of a particular competition one by one, streamed like
+        stream_competition_matches().
+        """
+        url = self._competition_teams_url(competition, season, stage)
+        return self._api_stream(url, 'teams')
+
+    def _iter_matches(self, urls, prefetch):
+        self._clear_error()
+        pool = ThreadPoolExecutor(max_workers=max(1, prefetch))
+        pending = deque()
+        try:
+            for url in urls:
+                if url:
+                    pending.append((url, pool.submit(self._api_call, url)))
+                if len(pending) > prefetch:
+                    yield from self._pending_matches(pending.popleft())
+            while pending:
+                yield from self._pending_matches(pending.popleft())
+        finally:
+            # The consumer may stop early: drop what was fetched ahead
+            for _, future in pending:
+                future.cancel()
+            pool.shutdown(wait=False)
+
+    def _pending_matches(self, pending):
+        url, future = pending
+        res, error = future.result()
+        if res is False:
+            # Seen by the consumer of the iterator as its last error
+            self._record_error(error)
+            self.logger.error(f'matches: skipping {url}')
+            return []
+        return res.matches
+
+    def _fetch_matches(self, urls, max_workers):
+        """
+        Fetch urls concurrently and merge their matches. Returns [] if any of
+        them fails, rather than a silently incomplete list.
+        """
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as pool:
+            results = list(pool.map(self._api_call, urls))
+
+        errors = [error for res, error in results if res is False]
+        if errors:
+            self._record_error(errors[0])
+            self.logger.error('matches: some date windows failed')
+            return []
+        return self._merge_matches([res for res, _ in results])
+
+    def _send(self, url, headers, stream=False, event=None):
+        """
+        Send the GET request, paced by the rate limiter when there is one,
+        and retried according to the retry policy. With stream=True the body
+        is left unread, to be consumed with iter_content().
+
+        The attempts and waits are accounted for in the event, if any.
+        """
+        # The transport sends the client headers along with the request ones
+        headers = {**self.headers, **headers} if headers else self.headers
+        attempt = 1
+        while True:
+            if self.rate_limiter is not None:
+                wait = self.rate_limiter.reserve()
+                if wait:
+                    time.sleep(wait)
+                    if event is not None:
+                        event.throttle_time += wait
+            res_raw = None
+            try:
+                res_raw = self.transport.send(url, headers, self.timeout,
+                                              stream=stream)
+            except NetworkError:
+                delay = self._retry_delay(url, attempt)
+                if delay is None:
+                    raise
             else:
-                return res if json_format else res_raw.content
-        except:
-            msg = 'requests.get error'
-            self.logger.error(msg)
+                throttled = (self.rate_limiter is not None
+                             and self._update_quota(res_raw.headers,
+                                                    res_raw.status_code))
+                delay = self._retry_delay(url, attempt, res_raw.status_code,
+                                          res_raw.headers, throttled)
+                if delay is None:
+                    if event is not None:
+                        event.status = res_raw.status_code
+                        event._response = res_raw
+                    return res_raw
+                # Give the connection back to the pool before retrying
+                res_raw.close()
+            if event is not None:
+                event._retried(res_raw, delay)
+            time.sleep(delay)
+            attempt += 1
+
+    def _api_request(self, url, fields=None, decode=None):
+        """
+        Fetch url, through the cache when there is one, and return the
+        decoded response (projected on `fields`, or decoded by `decode`
+        instead of the client's decoder) or False on error.
+
+        Concurrent calls for the same url (and decoding) share one request,
+        its result and its error.
+        """
+        decode = decode or self._decoder(fields)
+        # Only built when someone listens
+        event = RequestEvent(url) if self.hooks else None
+        if self.flights is None:
+            res = self._request(url, decode, event)
+        else:
+            (res, error, leader), shared = self.flights.do(
+                (url, decode), self._request_error, url, decode, event)
+            if shared:
+                endpoint = endpoint_template(url)
+                with self._stats_lock:
+                    coalesced = self.stats['coalesced']
+                    coalesced[endpoint] = coalesced.get(endpoint, 0) + 1
+                if res is False:
+                    # The error was recorded by the thread that sent the request
+                    self._record_error(error)
+                if event is not None:
+                    event.coalesced = True
+                    event.status = leader and leader.status
+        if event is not None:
+            self._emit(event, self._last_error() if res is False else None)
+        return res
+
+    def _api_call(self, url, fields=None):
+        """
+        _api_request for the calls made on other threads: also returns the
+        error it recorded, which the calling thread can't see otherwise.
+        """
+        self._clear_error()
+        res = self._api_request(url, fields)
+        return res, self._last_error()
+
+    def _request_error(self, url, decode, event=None):
+        self._clear_error()
+        res = self._request(url, decode, event)
+        return res, self._last_error(), event
+
+    def _request(self, url, decode, event=None):
+        entry = None
+        headers = None
+        if self.cache is not None:
+            entry = self.cache.get(url)
+            if entry is not None:
+                return self._decode_entry(entry, decode, event, 'hit')
+            entry = self.cache.stale(url)
+            if entry is not None:
+                headers = self._conditional_headers(entry)
+        try:
+            res_raw = self._send(url, headers, event=event)
+            if res_raw.status_code == 304 and entry is not None:
+                return self._revalidated(url, entry, res_raw.headers, decode,
+                                         event)
+            # Only error bodies are parsed here, the others just once by the
+            # decoder
+            if self._check_status(res_raw.status_code, res_raw.content):
+                return False
+            if self.cache is not None:
+                entry = self.cache.set(url, res_raw.content,
+                                       res_raw.headers.get('ETag'),
+                                       res_raw.headers.get('Last-Modified'))
+                return self._decode_entry(entry, decode, event, 'miss')
+            if event is None:
+                return decode(res_raw.content)
+            content = res_raw.content
+            start = time.perf_counter()
+            res = decode(content)
+            event.decode_time = time.perf_counter() - start
+            return res
+        except (TransportError, ValueError) as e:
+            msg = f'request error: {e}'
+            self._set_error(None, msg)
             return False
+
+    def _emit(self, event, error=None):
+        """
+        Complete the event of a call that failed with `error` (or not) and
+        pass it to the hooks. A failing hook is logged, never raised.
+        """
+        event._finish(error)
+        for hook in self.hooks:
+            try:
+                hook(event)
+            except Exception as e:
+                self.logger.error(f'hook {hook!r} failed: {e!r}')
+
+    def _api_stream(self, url, key):
+        """
+        Fetch url and yield the decoded elements of its `key` list as they
+        are parsed from the socket, buffering one element at a time.
+        """
+        self._clear_error()
+        if not url:
+            return
+        event = RequestEvent(url) if self.hooks else None
+        try:
+            res_raw = self._send(url, None, stream=True, event=event)
+            with res_raw:
+                # Error bodies are small, read them whole
+                if (res_raw.status_code >= 400
+                        and self._check_status(res_raw.status_code,
+                                               res_raw.content)):
+                    return
+                parser = ArrayStreamParser(key)
+                for chunk in res_raw.iter_content(self.STREAM_CHUNK_SIZE):
+                    for element in parser.feed(chunk):
+                        yield self.decode(element)
+                    if parser.done:
+                        return
+                self._set_error(None, f'{key}: incomplete response')
+        except (TransportError, ValueError) as e:
+            msg = f'request error: {e}'
+            self._set_error(None, msg)
+        finally:
+            if event is not None:
+                # Streamed bodies are decoded element by element, untimed
+                self._emit(event, self._last_error())
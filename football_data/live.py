@@ -0,0 +1,205 @@
+"""
+Polling of the live matches, reporting only what changed between polls.
+"""
+import logging
+import threading
+
+from .utils import LIVE_STATUSES
+
+# What the poller decodes of each live match (see the fields= projection)
+LIVE_FIELDS = ('id', 'utcDate', 'status', 'score', 'homeTeam.id',
+               'homeTeam.name', 'awayTeam.id', 'awayTeam.name',
+               'competition.id', 'competition.code')
+
+
+class MatchChange(object):
+    """
+    A change of one match between two polls: `kind` is 'status' or 'score',
+    `before` and `after` the status strings or (home, away) goals, and
+    `match` the match as last fetched. `before` is None for a match first
+    seen live.
+    """
+    __slots__ = ('kind', 'match', 'before', 'after')
+
+    def __init__(self, kind, match, before, after):
+        self.kind = kind
+        self.match = match
+        self.before = before
+        self.after = after
+
+    def __repr__(self):
+        return (f'MatchChange({self.kind!r}, match={self.match.id}, '
+                f'{self.before!r} -> {self.after!r})')
+
+
+class LivePoller(object):
+    """
+    Poll FootballData.matches(status='LIVE') and report the status and score
+    changes to the callbacks added with on_change() (or to asyncio queues
+    added with add_queue()):
+
+        poller = LivePoller(football, competitions='PL,SA')
+        poller.on_change(print)
+        poller.start()
+
+    Matches that leave the live list are fetched once more with
+    FootballData.match(), to report how they ended.
+
+    The interval between polls is `live_interval` seconds while matches are
+    in play. Without any, it doubles after each poll up to `idle_interval`.
+    It never goes below what keeps the poller within `budget` (a share) of
+    the requests per minute of the client's rate limiter, or of
+    `requests_per_minute` when the client has none.
+    """
+
+    def __init__(self, football, competitions=None, live_interval=15,
+                 idle_interval=300, requests_per_minute=10, budget=0.5,
+                 fields=LIVE_FIELDS):
+        self.football = football
+        self.competitions = competitions
+        self.live_interval = live_interval
+        self.idle_interval = idle_interval
+        if football.rate_limiter is not None:
+            requests_per_minute = football.rate_limiter.requests_per_minute
+        self.requests_per_minute = requests_per_minute
+        self.budget = budget
+        self.fields = fields
+        self.interval = live_interval
+        self.logger = logging.getLogger(__name__)
+        self.stats = {
+            'polls': 0,
+            'requests': 0,
+            'changes': 0
+        }
+        # match id -> (hash, status, score, match) at the last poll
+        self._live = {}
+        self._idle_polls = 0
+        self._callbacks = []
+        self._queues = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def on_change(self, callback):
+        """
+        Call callback(change) with each MatchChange, from the polling thread.
+        """
+        self._callbacks.append(callback)
+        return callback
+
+    def add_queue(self, queue, loop=None):
+        """
+        Put each MatchChange in an asyncio.Queue, from the polling thread,
+        through `loop` (by default the running one).
+        """
+        if loop is None:
+            import asyncio
+            loop = asyncio.get_running_loop()
+        self._queues.append((queue, loop))
+
+    def poll(self):
+        """
+        Poll once, dispatching and returning the changes since the last poll.
+        """
+        self.stats['polls'] += 1
+        requests = 1
+        matches = self.football.matches(self.competitions, status='LIVE',
+                                        fields=self.fields)
+        if self.football.error['msg']:
+            # Don't take a failed poll for all the matches having ended
+            self.logger.error(f'live poll failed: {self.football.error["msg"]}')
+            self._schedule(live=False, requests=requests)
+            return []
+
+        changes = []
+        seen = set()
+        for match in matches:
+            seen.add(match.id)
+            self._diff(match, changes)
+
+        for match_id in [i for i in self._live if i not in seen]:
+            requests += 1
+            match = self.football.match(match_id)
+            if not match:
+                # Try again at the next poll
+                continue
+            self._diff(match, changes)
+            if match.status not in LIVE_STATUSES:
+                del self._live[match_id]
+
+        self._schedule(live=bool(self._live), requests=requests)
+        self._dispatch(changes)
+        return changes
+
+    def run(self):
+        """
+        Poll until stop() is called, waiting `interval` between polls.
+        """
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception:
+                self.logger.exception('live poll failed')
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """
+        Run the poller in a background (daemon) thread.
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, daemon=True,
+                                        name='LivePoller')
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _diff(self, match, changes):
+        status = match.status
+        score = _goals(match)
+        fingerprint = hash((status, score))
+        previous = self._live.get(match.id)
+        self._live[match.id] = (fingerprint, status, score, match)
+        if previous is not None and previous[0] == fingerprint:
+            return
+
+        before_status = previous[1] if previous else None
+        before_score = previous[2] if previous else None
+        if status != before_status:
+            changes.append(MatchChange('status', match, before_status, status))
+        # A match first seen live reports a score only once someone scored
+        if score != before_score and (previous or any(score)):
+            changes.append(MatchChange('score', match, before_score, score))
+
+    def _schedule(self, live, requests):
+        if live:
+            self._idle_polls = 0
+            interval = self.live_interval
+        else:
+            interval = min(self.idle_interval,
+                           self.live_interval * 2 ** self._idle_polls)
+            self._idle_polls += 1
+        self.stats['requests'] += requests
+        # Seconds these requests take out of the budget
+        floor = requests * 60 / (self.requests_per_minute * self.budget)
+        self.interval = max(interval, floor)
+
+    def _dispatch(self, changes):
+        self.stats['changes'] += len(changes)
+        for change in changes:
+            for callback in self._callbacks:
+                try:
+                    callback(change)
+                except Exception:
+                    self.logger.exception(f'live callback failed on {change}')
+            for queue, loop in self._queues:
+                loop.call_soon_threadsafe(queue.put_nowait, change)
+
+
+def _goals(match):
+    full_time = getattr(getattr(match, 'score', None), 'fullTime', None)
+    if full_time is None:
+        return (None, None)
+    return (full_time.home, full_time.away)
@@ -0,0 +1,440 @@
+"""
+Instrumentation of the API calls: FootballData(hooks=[...]) calls each hook
+with a RequestEvent when a call completes. Built-in hooks:
+
+- RequestMetrics: aggregates the events into counters and latency
+  histograms, exposed as a summary or in the Prometheus text format
+- SpanHook: turns each event into an OpenTelemetry-style span, passed to a
+  callback or recorded on an OpenTelemetry tracer
+
+Without hooks the client builds no events at all.
+"""
+import threading
+import time
+from bisect import bisect_left
+from functools import lru_cache
+
+from .utils import endpoint_template
+
+# URL template -> the FootballData method calling it
+ENDPOINTS = {
+    'competitions': 'competitions',
+    'competitions/{id}': 'competition',
+    'competitions/{id}/teams': 'competition_teams',
+    'competitions/{id}/matches': 'competition_matches',
+    'matches': 'matches',
+    'matches/{id}': 'match',
+    'teams/{id}': 'team',
+    'teams/{id}/matches': 'team_matches',
+}
+
+
+# Pollers call the same few URLs over and over
+_url_template = lru_cache(maxsize=1024)(endpoint_template)
+
+
+def _header_int(headers, name):
+    try:
+        return int(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestEvent(object):
+    """
+    What one API call did, from the call to its decoded result:
+
+    - url, url_template ('competitions/{id}/matches') and endpoint (the
+      FootballData method, 'competition_matches')
+    - start: when the call started (seconds since the epoch) and duration
+    - status: HTTP status of the last response, None when no request was
+      sent (fresh cache hit) or none was answered (network error)
+    - error: message of the error the call failed with, else None
+    - cache: 'hit', 'miss' or 'revalidated' (304 Not Modified), None
+      without cache
+    - coalesced: True when the result came from an identical call in flight
+      (see the coalesce argument), which did the request
+    - retries: requests retried, and the seconds waited before them
+      (backoff_time) and for the rate limiter (throttle_time)
+    - bytes_sent / bytes_received: on the wire, retries included
+    - timings: Timings of the last response (dns, connect, wait, transfer)
+    - decode_time: seconds decoding the body, 0 for an already decoded
+      cache entry, None when nothing was decoded
+    - quota_remaining / quota_reset: requests left in the quota window and
+      seconds until it resets, as the API last reported them
+    """
+    __slots__ = ('url', 'url_template', 'endpoint', 'start', 'duration',
+                 'status', 'error', 'cache', 'coalesced', 'retries',
+                 'backoff_time', 'throttle_time', 'bytes_sent',
+                 'bytes_received', 'timings', 'decode_time', 'quota_remaining',
+                 'quota_reset', '_started', '_response')
+
+    def __init__(self, url):
+        self.url = url
+        self.url_template = None
+        self.endpoint = None
+        self.start = time.time()
+        self.duration = None
+        self.status = None
+        self.error = None
+        self.cache = None
+        self.coalesced = False
+        self.retries = 0
+        self.backoff_time = 0.0
+        self.throttle_time = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.timings = None
+        self.decode_time = None
+        self.quota_remaining = None
+        self.quota_reset = None
+        self._started = time.perf_counter()
+        self._response = None
+
+    def as_dict(self):
+        event = {name: getattr(self, name) for name in self.__slots__
+                 if not name.startswith('_')}
+        if self.timings is not None:
+            event['timings'] = self.timings.as_dict()
+        return event
+
+    def __repr__(self):
+        return (f'RequestEvent({self.endpoint}, status={self.status}, '
+                f'duration={self.duration * 1000:.2f}ms)'
+                if self.duration is not None else f'RequestEvent({self.url})')
+
+    def _retried(self, response, delay):
+        """
+        Account for an attempt that is retried in `delay` seconds, with its
+        (closed) response or None after a network error.
+        """
+        if response is not None:
+            self.bytes_sent += response.bytes_sent
+            self.bytes_received += response.bytes_received
+        self.retries += 1
+        self.backoff_time += delay
+
+    def _finish(self, error=None):
+        """
+        Fill in what's known once the call is done, its last response read.
+        """
+        self.duration = time.perf_counter() - self._started
+        self.url_template = _url_template(self.url) if self.url else ''
+        self.endpoint = ENDPOINTS.get(self.url_template, self.url_template)
+        if error is not None:
+            self.error = error['msg'] or f'HTTP error {error["code"]}'
+        response = self._response
+        if response is not None:
+            self._response = None
+            self.bytes_sent += response.bytes_sent
+            self.bytes_received += response.bytes_received
+            self.timings = response.timings
+            headers = response.headers
+            self.quota_remaining = _header_int(
+                headers, 'X-Requests-Available-Minute')
+            self.quota_reset = _header_int(headers, 'X-RequestCounter-Reset')
+
+
+class Histogram(object):
+    """
+    Counts of the observed values per bucket, `buckets` being the upper
+    bounds (plus +Inf), and their sum, like a Prometheus histogram.
+    """
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """
+        Estimate of the q-quantile (0.99 for the 99th percentile),
+        interpolating within its bucket as Prometheus' histogram_quantile()
+        does. None without observations.
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+# Name, type, labels and help of the metrics of RequestMetrics
+METRICS = (
+    ('requests_total', 'counter', ('endpoint', 'status'),
+     'API calls by endpoint and HTTP status (none: no response).'),
+    ('errors_total', 'counter', ('endpoint',), 'Failed API calls.'),
+    ('cache_total', 'counter', ('endpoint', 'outcome'),
+     'Cache outcomes of the calls: hit, miss or revalidated.'),
+    ('coalesced_total', 'counter', ('endpoint',),
+     'Calls served by an identical call in flight.'),
+    ('retries_total', 'counter', ('endpoint',), 'Requests retried.'),
+    ('sent_bytes_total', 'counter', ('endpoint',),
+     'Bytes sent, retries included.'),
+    ('received_bytes_total', 'counter', ('endpoint',),
+     'Bytes received, retries included.'),
+    ('phase_seconds_total', 'counter', ('endpoint', 'phase'),
+     'Seconds spent per phase of the calls: dns, connect, wait, transfer, '
+     'decode, throttle (rate limiter) and backoff (before retries).'),
+    ('request_duration_seconds', 'histogram', ('endpoint',),
+     'Duration of the calls.'),
+    ('network_seconds', 'histogram', ('endpoint',),
+     'Time on the network of the last request of the calls.'),
+    ('decode_seconds', 'histogram', ('endpoint',),
+     'Time decoding the responses.'),
+    ('quota_remaining', 'gauge', (),
+     'Requests left in the quota window, as last reported by the API.'),
+    ('quota_reset_seconds', 'gauge', (),
+     'Seconds until the quota window resets, as last reported by the API.'),
+)
+
+PHASES = ('dns', 'connect', 'wait', 'transfer')
+
+
+def _escape(value):
+    return (str(value).replace('\\', r'\\').replace('"', r'\"')
+            .replace('\n', r'\n'))
+
+
+def _labels(names, values, extra=''):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class RequestMetrics(object):
+    """
+    Hook aggregating the RequestEvents of one or more clients into counters
+    and histograms per endpoint (see METRICS), thread-safe:
+
+        metrics = RequestMetrics()
+        football = FootballData(hooks=[metrics])
+        ...
+        metrics.summary()      # per endpoint, to see where the time goes
+        metrics.prometheus()   # to serve at /metrics
+
+    `buckets` are the upper bounds of the histograms, in seconds.
+    """
+
+    BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+               2.5, 5.0, 10.0)
+
+    def __init__(self, buckets=BUCKETS, prefix='football_data'):
+        self.buckets = tuple(buckets)
+        self.prefix = prefix
+        # Metric name -> {label values: value or Histogram}
+        self.metrics = {name: {} for name, _, _, _ in METRICS}
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        endpoint = event.endpoint
+        key = (endpoint,)
+        metrics = self.metrics
+        with self._lock:
+            self._add('requests_total', (
+                endpoint, 'none' if event.status is None else str(event.status)))
+            if event.error is not None:
+                self._add('errors_total', key)
+            if event.cache is not None:
+                self._add('cache_total', (endpoint, event.cache))
+            if event.coalesced:
+                self._add('coalesced_total', key)
+            if event.retries:
+                self._add('retries_total', key, event.retries)
+            self._add('sent_bytes_total', key, event.bytes_sent)
+            self._add('received_bytes_total', key, event.bytes_received)
+
+            self._observe('request_duration_seconds', key, event.duration)
+            timings = event.timings
+            if timings is not None:
+                self._observe('network_seconds', key, timings.total)
+                for phase in PHASES:
+                    self._add('phase_seconds_total', (endpoint, phase),
+                              getattr(timings, phase) or 0.0)
+            if event.decode_time is not None:
+                self._observe('decode_seconds', key, event.decode_time)
+                self._add('phase_seconds_total', (endpoint, 'decode'),
+                          event.decode_time)
+            if event.throttle_time:
+                self._add('phase_seconds_total', (endpoint, 'throttle'),
+                          event.throttle_time)
+            if event.backoff_time:
+                self._add('phase_seconds_total', (endpoint, 'backoff'),
+                          event.backoff_time)
+
+            if event.quota_remaining is not None:
+                metrics['quota_remaining'][()] = event.quota_remaining
+            if event.quota_reset is not None:
+                metrics['quota_reset_seconds'][()] = event.quota_reset
+
+    def _add(self, name, labels, value=1):
+        values = self.metrics[name]
+        values[labels] = values.get(labels, 0) + value
+
+    def _observe(self, name, labels, value):
+        values = self.metrics[name]
+        histogram = values.get(labels)
+        if histogram is None:
+            histogram = values[labels] = Histogram(self.buckets)
+        histogram.observe(value)
+
+    def reset(self):
+        with self._lock:
+            for values in self.metrics.values():
+                values.clear()
+
+    def summary(self):
+        """
+        Per endpoint: calls, errors, retries, the 50th, 90th and 99th
+        percentiles of their duration (estimated from the histogram) and the
+        total seconds spent in each phase.
+        """
+        metrics = self.metrics
+        summary = {}
+        with self._lock:
+            for (endpoint,), histogram in metrics['request_duration_seconds'].items():
+                summary[endpoint] = {
+                    'calls': histogram.count,
+                    'errors': metrics['errors_total'].get((endpoint,), 0),
+                    'retries': metrics['retries_total'].get((endpoint,), 0),
+                    'p50': histogram.quantile(0.5),
+                    'p90': histogram.quantile(0.9),
+                    'p99': histogram.quantile(0.99),
+                    'seconds': histogram.sum,
+                    'phases': {}
+                }
+            for (endpoint, phase), seconds in metrics['phase_seconds_total'].items():
+                summary[endpoint]['phases'][phase] = seconds
+        return summary
+
+    def prometheus(self):
+        """
+        The metrics in the Prometheus text exposition format (version 0.0.4).
+        """
+        lines = []
+        with self._lock:
+            for name, kind, label_names, help_ in METRICS:
+                values = self.metrics[name]
+                if not values:
+                    continue
+                metric = f'{self.prefix}_{name}'
+                lines.append(f'# HELP {metric} {help_}')
+                lines.append(f'# TYPE {metric} {kind}')
+                for labels, value in sorted(values.items()):
+                    if kind != 'histogram':
+                        lines.append(
+                            f'{metric}{_labels(label_names, labels)} {value}')
+                        continue
+                    cumulative = 0
+                    bounds = [repr(float(bound)) for bound in value.buckets]
+                    for bound, count in zip(bounds + ['+Inf'], value.counts):
+                        cumulative += count
+                        le = f'le="{bound}"'
+                        lines.append(f'{metric}_bucket'
+                                     f'{_labels(label_names, labels, le)} '
+                                     f'{cumulative}')
+                    lines.append(f'{metric}_sum{_labels(label_names, labels)} '
+                                 f'{value.sum}')
+                    lines.append(f'{metric}_count{_labels(label_names, labels)} '
+                                 f'{value.count}')
+        return '\n'.join(lines) + '\n'
+
+
+class SpanHook(object):
+    """
+    Hook turning each RequestEvent into an OpenTelemetry-style span, a dict
+    passed to `export`:
+
+        {'name': 'GET competitions/{id}/matches', 'kind': 'CLIENT',
+         'start_time_unix_nano': ..., 'end_time_unix_nano': ...,
+         'attributes': {'http.request.method': 'GET', 'url.full': ...,
+                        'url.template': ..., 'http.response.status_code': 200,
+                        ...},
+         'status': {'code': 'UNSET'} or {'code': 'ERROR', 'description': ...}}
+
+    or, given an OpenTelemetry `tracer` instead (opentelemetry-api
+    installed), recorded as a span of that tracer.
+    """
+
+    def __init__(self, export=None, tracer=None):
+        if tracer is not None:
+            export = _tracer_export(tracer)
+        if export is None:
+            raise ValueError('SpanHook needs an export callback or a tracer')
+        self.export = export
+
+    def __call__(self, event):
+        self.export(self.span(event))
+
+    def span(self, event):
+        start = int(event.start * 1e9)
+        attributes = {
+            'http.request.method': 'GET',
+            'url.full': event.url,
+            'url.template': event.url_template,
+            'football_data.endpoint': event.endpoint,
+            'http.response.status_code': event.status,
+            'http.request.resend_count': event.retries or None,
+            'football_data.cache': event.cache,
+            'football_data.coalesced': event.coalesced or None,
+            'football_data.bytes_sent': event.bytes_sent,
+            'football_data.bytes_received': event.bytes_received,
+            'football_data.decode_seconds': event.decode_time,
+            'football_data.throttle_seconds': event.throttle_time or None,
+            'football_data.backoff_seconds': event.backoff_time or None,
+            'football_data.quota_remaining': event.quota_remaining,
+        }
+        if event.timings is not None:
+            for phase in PHASES:
+                attributes[f'football_data.{phase}_seconds'] = getattr(
+                    event.timings, phase)
+        if event.error is not None:
+            attributes['error.type'] = (str(event.status) if event.status
+                                        else 'request_error')
+            status = {'code': 'ERROR', 'description': event.error}
+        else:
+            status = {'code': 'UNSET'}
+        return {
+            'name': f'GET {event.url_template}',
+            'kind': 'CLIENT',
+            'start_time_unix_nano': start,
+            'end_time_unix_nano': start + int(event.duration * 1e9),
+            # OpenTelemetry attributes can't be None
+            'attributes': {name: value for name, value in attributes.items()
+                           if value is not None},
+            'status': status
+        }
+
+
+def _tracer_export(tracer):
+    try:
+        from opentelemetry.trace import SpanKind, Status, StatusCode
+    except ImportError:
+        raise ImportError('SpanHook(tracer=...) needs opentelemetry-api: '
+                          'pip install football_data[otel]') from None
+
+    def export(span):
+        otel_span = tracer.start_span(
+            span['name'], kind=SpanKind.CLIENT,
+            start_time=span['start_time_unix_nano'],
+            attributes=span['attributes'])
+        if span['status']['code'] == 'ERROR':
+            otel_span.set_status(
+                Status(StatusCode.ERROR, span['status']['description']))
+        otel_span.end(end_time=span['end_time_unix_nano'])
+    return export
@@ -0,0 +1,108 @@
+"""
+Field projection of list responses: only the selected fields of each match
+(or team) are turned into objects, the rest of the parsed JSON is dropped.
+"""
+from types import SimpleNamespace
+
+from .utils import _CONTAINERS, dict2obj, json2obj, json_loads
+
+# Lists of the responses the projection applies to
+PROJECTED_KEYS = ('matches', 'teams')
+
+
+def compile_fields(fields):
+    """
+    Turn dotted field paths ('id', 'homeTeam.id'...) into a tree of dicts,
+    where None selects a whole subtree:
+
+        >>> compile_fields(['id', 'score', 'homeTeam.id', 'homeTeam.name'])
+        {'id': None, 'score': None, 'homeTeam': {'id': None, 'name': None}}
+    """
+    if isinstance(fields, str):
+        fields = fields.split(',')
+    tree = {}
+    for field in fields:
+        node = tree
+        *parents, leaf = field.strip().split('.')
+        for name in parents:
+            if name in node and node[name] is None:
+                # The whole parent is already selected
+                break
+            node = node.setdefault(name, {})
+        else:
+            node[leaf] = None
+    return tree
+
+
+def project(value, tree):
+    """
+    Keep the fields of `tree` of a parsed JSON object (or of each object of
+    a list), missing ones are left out.
+    """
+    if type(value) is list:
+        return [project(item, tree) for item in value]
+    if type(value) is not dict:
+        return value
+    return {name: value[name] if sub is None else project(value[name], sub)
+            for name, sub in tree.items() if name in value}
+
+
+def project2obj(value, tree):
+    """
+    Same as project(), building the SimpleNamespace objects of json2obj
+    directly, rather than dicts to convert afterwards.
+    """
+    if type(value) is list:
+        return [project2obj(item, tree) for item in value]
+    if type(value) is not dict:
+        return value
+    obj = SimpleNamespace()
+    attrs = obj.__dict__
+    for name, sub in tree.items():
+        if name in value:
+            field = value[name]
+            if sub is not None:
+                field = project2obj(field, sub)
+            elif type(field) in _CONTAINERS:
+                field = dict2obj(field)
+            attrs[name] = field
+    return obj
+
+
+class Projection(object):
+    """
+    Decoder keeping only `fields` of each element of the response lists
+    (see PROJECTED_KEYS), then building objects with `decode` out of what's
+    left. Other parts of the response are decoded whole.
+
+    With json2obj, the objects are built while projecting, so the response
+    is walked once.
+    """
+
+    def __init__(self, fields, decode):
+        self.fields = tuple(fields)
+        self.tree = compile_fields(fields)
+        self.decode = decode
+
+    def __call__(self, data):
+        res = json_loads(data)
+        if self.decode is json2obj:
+            return self._obj(res)
+        if type(res) is dict:
+            for key in PROJECTED_KEYS:
+                items = res.get(key)
+                if type(items) is list:
+                    res[key] = [project(item, self.tree) for item in items]
+        return self.decode(res)
+
+    def _obj(self, res):
+        if type(res) is not dict:
+            return dict2obj(res)
+        obj = SimpleNamespace()
+        attrs = obj.__dict__
+        for key, value in res.items():
+            if key in PROJECTED_KEYS and type(value) is list:
+                attrs[key] = [project2obj(item, self.tree) for item in value]
+            else:
+                attrs[key] = dict2obj(value)
+        return obj
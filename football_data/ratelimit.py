@@ -0,0 +1,75 @@
+"""
+Client-side pacing of the API calls, to stay within the plan's quota.
+"""
+import threading
+import time
+
+
+class RateLimiter(object):
+    """
+    Token bucket allowing `requests_per_minute` calls, in bursts of at most
+    `burst` (the whole minute's quota by default).
+
+    Callers over budget aren't refused: each one reserves the next free slot
+    and waits for it, so they're served in arrival order. The bucket is
+    thread-safe and can be shared by several clients using the same API key.
+
+    The bucket follows the quota the API reports with each response (see
+    update()), so requests made elsewhere with the same key are accounted for.
+    """
+
+    def __init__(self, requests_per_minute=10, burst=None):
+        self.requests_per_minute = requests_per_minute
+        self.capacity = burst or requests_per_minute
+        self.rate = requests_per_minute / 60.0
+        self.tokens = float(self.capacity)
+        self.stats = {
+            'requests': 0,
+            'delayed': 0,
+            'wait_time': 0.0
+        }
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Take a slot, returning the seconds to wait before using it.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait = max(0.0, -self.tokens / self.rate,
+                       self._blocked_until - now)
+
+            self.stats['requests'] += 1
+            if wait:
+                self.stats['delayed'] += 1
+                self.stats['wait_time'] += wait
+            return wait
+
+    def acquire(self):
+        """
+        Block the calling thread until it may send a request.
+        """
+        wait = self.reserve()
+        if wait:
+            time.sleep(wait)
+
+    def update(self, available, reset):
+        """
+        Sync the bucket with the quota reported by the API: `available`
+        requests left in the current window, which resets in `reset` seconds.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens = min(self.tokens, available)
+            if available <= 0:
+                self._blocked_until = max(self._blocked_until, now + reset)
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity,
+                          self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
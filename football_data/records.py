@@ -0,0 +1,212 @@
+"""
+Compact record types for the common API entities, built by json2records.
+
+Records keep their known fields in __slots__ instead of a per-object
+__dict__. Fields the API adds later (or that aren't listed here) are still
+reachable as attributes, through the `_extra` dict.
+"""
+from types import SimpleNamespace
+
+from .utils import json_loads
+
+
+class Record(object):
+    """
+    Base class of the records: known fields in slots, the others in _extra.
+    """
+    __slots__ = ('_extra',)
+
+    def __getattr__(self, name):
+        # Only called for unknown fields (or known ones missing from the
+        # response, which stay unset)
+        if name == '_extra':
+            raise AttributeError(name)
+        extra = self._extra
+        if extra is not None and name in extra:
+            return extra[name]
+        raise AttributeError(name)
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._asdict() == other._asdict()
+
+    # Compared by value but mutable, like SimpleNamespace: unhashable
+    __hash__ = None
+
+    def __repr__(self):
+        items = ', '.join(f'{k}={v!r}' for k, v in self._asdict().items())
+        return f'{type(self).__name__}({items})'
+
+    def _asdict(self):
+        fields = {name: getattr(self, name) for name in self.__slots__
+                  if hasattr(self, name)}
+        fields.update(self._extra or {})
+        return fields
+
+
+class Area(Record):
+    __slots__ = ('id', 'name', 'code', 'flag')
+
+
+class Competition(Record):
+    __slots__ = ('id', 'name', 'code', 'type', 'emblem', 'area',
+                 'currentSeason', 'seasons', 'lastUpdated')
+
+
+class Season(Record):
+    __slots__ = ('id', 'startDate', 'endDate', 'currentMatchday', 'winner')
+
+
+class Team(Record):
+    __slots__ = ('id', 'name', 'shortName', 'tla', 'crest')
+
+
+class Person(Record):
+    __slots__ = ('id', 'name', 'position', 'nationality', 'type')
+
+
+class Goals(Record):
+    __slots__ = ('home', 'away')
+
+
+class Score(Record):
+    __slots__ = ('winner', 'duration', 'fullTime', 'halfTime')
+
+
+class Match(Record):
+    __slots__ = ('id', 'utcDate', 'status', 'matchday', 'stage', 'group',
+                 'lastUpdated', 'area', 'competition', 'season', 'homeTeam',
+                 'awayTeam', 'score', 'odds', 'referees')
+
+
+# Set lookups of the known fields, used while decoding
+FIELDS = {cls: frozenset(cls.__slots__)
+          for cls in (Area, Competition, Season, Team, Person, Goals, Score,
+                      Match)}
+
+
+# Record type of an object, from the key it's found under
+OBJECT_KEYS = {
+    'area': Area,
+    'competition': Competition,
+    'season': Season,
+    'currentSeason': Season,
+    'winner': Team,
+    'homeTeam': Team,
+    'awayTeam': Team,
+    'team': Team,
+    'coach': Person,
+    'score': Score,
+    'fullTime': Goals,
+    'halfTime': Goals,
+    'regularTime': Goals,
+    'extraTime': Goals,
+    'penalties': Goals,
+}
+
+# Record type of the objects in a list, from the key of the list
+LIST_KEYS = {
+    'matches': Match,
+    'teams': Team,
+    'competitions': Competition,
+    'runningCompetitions': Competition,
+    'seasons': Season,
+    'referees': Person,
+    'squad': Person,
+    'staff': Person,
+}
+
+_CONTAINERS = (dict, list)
+
+
+class RecordDecoder(object):
+    """
+    Decode responses into records, interning identical flat objects (areas,
+    competitions, team references, scores...) so each one is stored once,
+    across all the responses decoded by the same decoder.
+
+    Interned records are shared: treat decoded responses as read-only.
+    """
+
+    def __init__(self, max_interned=100000):
+        self.max_interned = max_interned
+        self._interned = {}
+
+    def __call__(self, data):
+        return self.decode(data)
+
+    def decode(self, data):
+        """
+        Decode a response body. The top-level object is a record when the
+        response is a single entity (a match, team or competition), and a
+        SimpleNamespace holding the records otherwise. `data` may also be
+        JSON already parsed into dicts and lists.
+        """
+        res = data if type(data) in _CONTAINERS else json_loads(data)
+        if type(res) is not dict:
+            return self._convert(None, res)
+        return self._build(_root_type(res), res)
+
+    def _convert(self, key, value):
+        if type(value) is dict:
+            return self._build(OBJECT_KEYS.get(key), value)
+        cls = LIST_KEYS.get(key)
+        return [self._build(cls, item) if type(item) is dict
+                else self._convert(None, item) if type(item) is list
+                else item
+                for item in value]
+
+    def _build(self, cls, obj):
+        if cls is None:
+            return SimpleNamespace(**{
+                k: self._convert(k, v) if type(v) in _CONTAINERS else v
+                for k, v in obj.items()})
+
+        flat = True
+        for value in obj.values():
+            if type(value) in _CONTAINERS:
+                flat = False
+                break
+        if flat:
+            key = (cls, tuple(obj.items()))
+            record = self._interned.get(key)
+            if record is not None:
+                return record
+
+        record = cls.__new__(cls)
+        extra = None
+        slots = FIELDS[cls]
+        for k, v in obj.items():
+            if type(v) in _CONTAINERS:
+                v = self._convert(k, v)
+            if k in slots:
+                setattr(record, k, v)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[k] = v
+        record._extra = extra
+
+        if flat:
+            if len(self._interned) >= self.max_interned:
+                self._interned.clear()
+            self._interned[key] = record
+        return record
+
+
+def _root_type(res):
+    if 'homeTeam' in res and 'utcDate' in res:
+        return Match
+    if 'squad' in res or ('tla' in res and 'crest' in res):
+        return Team
+    if 'currentSeason' in res and 'code' in res:
+        return Competition
+    return None
+
+
+def json2records(data):
+    """
+    Decode a response body into records, with a fresh intern table.
+    """
+    return RecordDecoder().decode(data)
@@ -0,0 +1,64 @@
+"""
+Retry policy for transient API failures (throttling, server errors and
+network errors).
+"""
+import random
+import time
+
+
+class RetryPolicy(object):
+    """
+    Retry a request up to `max_attempts` times in total when it fails with
+    one of `retry_statuses` or a network error.
+
+    Between attempts it waits as long as the `Retry-After` header asks, or
+    else a random delay between 0 and `backoff_base * 2 ** (attempt - 1)`
+    seconds, capped at `backoff_cap` ("full jitter" exponential backoff).
+    """
+
+    def __init__(self, max_attempts=3, backoff_base=0.5, backoff_cap=30,
+                 retry_statuses=(429, 500, 502, 503, 504)):
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def should_retry(self, attempt, status=None):
+        """
+        Whether to retry after `attempt` failed, with the HTTP `status` it
+        got (None for a network error).
+        """
+        if attempt >= self.max_attempts:
+            return False
+        return status is None or status in self.retry_statuses
+
+    def delay(self, attempt, retry_after=None):
+        """
+        Seconds to wait before the attempt following `attempt`.
+        """
+        seconds = parse_retry_after(retry_after)
+        if seconds is not None:
+            return seconds
+        backoff = min(self.backoff_cap,
+                      self.backoff_base * 2 ** (attempt - 1))
+        return random.uniform(0, backoff)
+
+
+def parse_retry_after(value):
+    """
+    Seconds to wait from a Retry-After header, given either in seconds or as
+    an HTTP date. None when missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    # Rarely needed, and email takes as long to import as the rest
+    import email.utils
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, date.timestamp() - time.time())
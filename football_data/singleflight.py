@@ -0,0 +1,61 @@
+"""
+Coalescing of concurrent identical calls ("single flight").
+"""
+import threading
+
+
+class _Flight(object):
+    __slots__ = ('done', 'result', 'exception')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+
+
+class SingleFlight(object):
+    """
+    Run a function once for all the threads calling it with the same key at
+    the same time: the first caller runs it, the ones arriving meanwhile wait
+    and get the same result (or exception). Calls made after it's done run
+    it again, nothing is cached.
+    """
+
+    def __init__(self):
+        self.stats = {
+            'calls': 0,
+            'coalesced': 0
+        }
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func, *args):
+        """
+        Return (func(*args), shared), shared being True when the result comes
+        from a call already in flight for `key`.
+        """
+        with self._lock:
+            self.stats['calls'] += 1
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.stats['coalesced'] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.exception is not None:
+                raise flight.exception
+            return flight.result, True
+
+        try:
+            flight.result = func(*args)
+        except BaseException as e:
+            flight.exception = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result, False
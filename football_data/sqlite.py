@@ -0,0 +1,86 @@
+"""
+SQLite plumbing shared by SQLiteCache and MatchStore: connections per thread
+and process, write transactions and schema versions.
+"""
+import os
+import sqlite3
+import threading
+
+
+class SQLiteDatabase(object):
+    """
+    The SQLite file at `path`, in WAL mode so readers never block on a
+    writer, writers waiting up to `timeout` seconds for each other.
+
+    `create_schema(db)` is run in a transaction when the file doesn't hold
+    `schema_version` yet, to (re)build the tables of that version.
+    """
+
+    # Raised by the connections
+    Error = sqlite3.Error
+
+    def __init__(self, path, timeout, schema_version, create_schema):
+        self.path = os.fspath(path)
+        self.timeout = timeout
+        self.schema_version = schema_version
+        self._local = threading.local()
+        self._migrate(create_schema)
+
+    def connection(self):
+        """
+        One connection per thread and per process, sqlite3 connections
+        can't be shared across either.
+        """
+        db = getattr(self._local, 'db', None)
+        if db is None or self._local.pid != os.getpid():
+            db = sqlite3.connect(self.path, timeout=self.timeout,
+                                 isolation_level=None,
+                                 check_same_thread=False)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            self._local.db = db
+            self._local.pid = os.getpid()
+        return db
+
+    def transaction(self):
+        """
+        A write transaction on the connection of the calling thread:
+
+            with database.transaction() as db:
+                db.execute(...)
+        """
+        return Transaction(self.connection())
+
+    def close(self):
+        """
+        Close the connection of the calling thread.
+        """
+        db = getattr(self._local, 'db', None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+    def _migrate(self, create_schema):
+        with self.transaction() as db:
+            version = db.execute('PRAGMA user_version').fetchone()[0]
+            if version == self.schema_version:
+                return
+            create_schema(db)
+            db.execute(f'PRAGMA user_version = {self.schema_version}')
+
+
+class Transaction(object):
+    """
+    Write transaction taking the database lock upfront, so concurrent
+    writers queue on the busy timeout instead of failing to upgrade a lock.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        self.db.execute('BEGIN IMMEDIATE')
+        return self.db
+
+    def __exit__(self, exc_type, *exc_info):
+        self.db.execute('ROLLBACK' if exc_type else 'COMMIT')
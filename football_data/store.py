@@ -0,0 +1,368 @@
+"""
+Local match store: matches fetched through FootballData kept in an indexed
+SQLite database, to answer repeat queries without calling the API.
+"""
+import json
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from .sqlite import SQLiteDatabase
+from .utils import FINAL_STATUSES, json_loads
+
+TEAM_FILTER = '(home_team_id = ? OR away_team_id = ?)'
+
+
+class MatchStore(object):
+    """
+    Matches of the API in a SQLite file at `path`, indexed by match id, team,
+    competition and utcDate, filled by the sync_* methods of the store with
+    the `football` client and queried locally with the others:
+
+        store = MatchStore(football, 'matches.db')
+        store.sync_competition('PL', 2022)
+        store.team_matches(57, season=2022)
+
+    Syncs are incremental: a sync already done only refetches what can still
+    change, the date windows of the matches that aren't final yet. Queries
+    return matches decoded like the client's responses, sorted by utcDate.
+    """
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, football, path, timeout=30):
+        self.football = football
+        self.path = os.fspath(path)
+        self.timeout = timeout
+        self.stats = {
+            'requests': 0,
+            'skipped': 0
+        }
+        self._stats_lock = threading.Lock()
+        self._db = SQLiteDatabase(self.path, timeout, self.SCHEMA_VERSION,
+                                  self._create_schema)
+
+    def __len__(self):
+        return self._db.connection().execute(
+            'SELECT COUNT(*) FROM matches').fetchone()[0]
+
+    def match(self, match_id):
+        """
+        One particular match, or None when it's not in the store.
+        """
+        matches = self._query('id = ?', [match_id])
+        return matches[0] if matches else None
+
+    def team_matches(self, team_id, season=None, dateFrom=None, dateTo=None, competition=None, status=None):
+        """
+        The matches of a particular team, optionally in one season (its start
+        year), between two dates (both included), of one competition (id or
+        code) or with some statuses.
+        """
+        where = [TEAM_FILTER]
+        params = [team_id, team_id]
+        self._filters(where, params, season, dateFrom, dateTo, competition,
+                      status)
+        return self._query(' AND '.join(where), params)
+
+    def competition_matches(self, competition, season=None, dateFrom=None, dateTo=None, status=None):
+        """
+        The matches of a particular competition (id or code), filtered like
+        team_matches().
+        """
+        where = []
+        params = []
+        self._filters(where, params, season, dateFrom, dateTo, competition,
+                      status)
+        return self._query(' AND '.join(where), params)
+
+    def matches(self, dateFrom, dateTo=None, competitions=None, status=None):
+        """
+        The matches between two dates (both included, dateTo defaults to
+        dateFrom for the fixtures of one day), of any of `competitions` (ids
+        or codes) when given.
+        """
+        where, params = self._competitions_filter(competitions)
+        where = [where]
+        self._filters(where, params, None, dateFrom, dateTo or dateFrom,
+                      None, status)
+        return self._query(' AND '.join(where), params)
+
+    def sync_competition(self, competition, season=None, full=False):
+        """
+        Fetch the matches of a competition season (the current one by
+        default) into the store. After the first sync, only the date windows
+        of the matches that aren't final are fetched again, and nothing once
+        they all are; full=True fetches the whole season again.
+
+        Returns the number of matches stored, or None on error (see
+        football.error).
+        """
+        if season is None:
+            current = self.football.competition(competition)
+            if not current:
+                return None
+            season = int(current.currentSeason.startDate[:4])
+
+        key = f'competitions/{competition}/{season}'
+        where = []
+        params = []
+        self._filters(where, params, season, None, None, competition, None)
+        where = ' AND '.join(where)
+
+        state = self._sync_state(key)
+        if state is not None and not full:
+            if state:
+                self._count('skipped')
+                return 0
+            urls = [self.football._competition_matches_url(
+                competition, start, end, season=season)
+                for start, end in self._pending_windows(where, params)]
+        else:
+            urls = [self.football._competition_matches_url(
+                competition, season=season)]
+
+        stored = self._fetch(urls)
+        if stored is None:
+            return None
+        self._set_sync_state(key, not self._pending(where, params))
+        return stored
+
+    def sync_matches(self, dateFrom, dateTo, competitions=None):
+        """
+        Fetch the matches between two dates (both included), however far
+        apart, into the store, one API-sized window at a time. Windows in the
+        past whose matches are all final aren't fetched again.
+        """
+        def url_for(start, end):
+            return self.football._matches_url(competitions, start, end)
+
+        where, params = self._competitions_filter(competitions)
+        return self._sync_windows(f'matches/{competitions or ""}', dateFrom,
+                                  dateTo, url_for, where, params)
+
+    def sync_team(self, team_id, dateFrom, dateTo):
+        """
+        Fetch the matches of a particular team between two dates into the
+        store, like sync_matches().
+        """
+        def url_for(start, end):
+            return self.football._team_matches_url(team_id, start, end)
+
+        return self._sync_windows(f'teams/{team_id}/matches', dateFrom,
+                                  dateTo, url_for, TEAM_FILTER,
+                                  [team_id, team_id])
+
+    def clear(self):
+        with self._db.transaction() as db:
+            db.execute('DELETE FROM matches')
+            db.execute('DELETE FROM syncs')
+
+    def close(self):
+        """
+        Close the connection of the calling thread.
+        """
+        self._db.close()
+
+    def _sync_windows(self, prefix, dateFrom, dateTo, url_for, where, params):
+        """
+        Sync the API-sized windows of dateFrom..dateTo not complete yet, the
+        matches fetched by url_for(start, end) being those matching `where`.
+        """
+        windows = self.football._date_windows(dateFrom, dateTo)
+        if not windows:
+            return None
+
+        today = datetime.now(timezone.utc).date().isoformat()
+        stored = 0
+        for start, end in windows:
+            key = f'{prefix}/{start}/{end}'
+            if self._sync_state(key):
+                self._count('skipped')
+                continue
+            count = self._fetch([url_for(start, end)])
+            if count is None:
+                return None
+            stored += count
+            # Future windows get new fixtures and reschedules until they pass
+            complete = end < today and not self._pending(
+                f'{where} AND utc_date >= ? AND utc_date < ?',
+                params + [start, _next_day(end)])
+            self._set_sync_state(key, complete)
+        return stored
+
+    def _fetch(self, urls):
+        """
+        Fetch urls and store their matches, returning how many, or None when
+        one of them fails.
+        """
+        stored = 0
+        for url in urls:
+            if not url:
+                return None
+            self._count('requests')
+            res = self.football._api_request(url, decode=json_loads)
+            if res is False:
+                return None
+            matches = res.get('matches') or []
+            self._upsert(matches)
+            stored += len(matches)
+        return stored
+
+    def _upsert(self, matches):
+        rows = []
+        for match in matches:
+            competition = match.get('competition') or {}
+            season = match.get('season') or {}
+            start = season.get('startDate')
+            rows.append((
+                match['id'],
+                match['utcDate'],
+                match.get('status'),
+                competition.get('id'),
+                competition.get('code'),
+                int(start[:4]) if start else None,
+                match.get('matchday'),
+                (match.get('homeTeam') or {}).get('id'),
+                (match.get('awayTeam') or {}).get('id'),
+                json.dumps(match, separators=(',', ':')),
+            ))
+        with self._db.transaction() as db:
+            db.executemany(
+                'INSERT OR REPLACE INTO matches (id, utc_date, status,'
+                ' competition_id, competition_code, season, matchday,'
+                ' home_team_id, away_team_id, data)'
+                ' VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+
+    def _competitions_filter(self, competitions):
+        if not competitions:
+            return '1', []
+        if isinstance(competitions, str):
+            competitions = competitions.split(',')
+        marks = ', '.join('?' * len(competitions))
+        where = (f'(competition_id IN ({marks})'
+                 f' OR competition_code IN ({marks}))')
+        params = [_competition_id(c) for c in competitions]
+        params += [str(c) for c in competitions]
+        return where, params
+
+    def _filters(self, where, params, season, dateFrom, dateTo, competition, status):
+        if season:
+            where.append('season = ?')
+            params.append(int(season))
+        if dateFrom:
+            where.append('utc_date >= ?')
+            params.append(str(dateFrom))
+        if dateTo:
+            where.append('utc_date < ?')
+            params.append(_next_day(dateTo))
+        if competition:
+            where.append('(competition_id = ? OR competition_code = ?)')
+            params += [_competition_id(competition), str(competition)]
+        if status:
+            if isinstance(status, str):
+                status = status.split(',')
+            where.append(f'status IN ({", ".join("?" * len(status))})')
+            params += list(status)
+
+    def _query(self, where, params):
+        rows = self._db.connection().execute(
+            f'SELECT data FROM matches WHERE {where or "1"}'
+            ' ORDER BY utc_date, id', params).fetchall()
+        if not rows:
+            return []
+        # One decoder call for the whole result, like a list response
+        body = '{"matches":[' + ','.join(row[0] for row in rows) + ']}'
+        return self.football.decode(body).matches
+
+    def _pending(self, where, params):
+        marks = ', '.join('?' * len(FINAL_STATUSES))
+        return self._db.connection().execute(
+            f'SELECT COUNT(*) FROM matches WHERE {where}'
+            f' AND status NOT IN ({marks})',
+            params + list(FINAL_STATUSES)).fetchone()[0]
+
+    def _pending_windows(self, where, params):
+        """
+        The fewest API-sized date windows covering the matches that aren't
+        final.
+        """
+        marks = ', '.join('?' * len(FINAL_STATUSES))
+        days = [row[0] for row in self._db.connection().execute(
+            f'SELECT DISTINCT substr(utc_date, 1, 10) FROM matches'
+            f' WHERE {where} AND status NOT IN ({marks}) ORDER BY 1',
+            params + list(FINAL_STATUSES))]
+
+        windows = []
+        max_days = self.football.MAX_DATE_RANGE
+        for day in days:
+            if windows and day <= windows[-1][1]:
+                continue
+            windows.append((day, _add_days(day, max_days - 1)))
+        return windows
+
+    def _sync_state(self, key):
+        """
+        None when key was never synced, else whether its matches are all
+        final (nothing left to sync).
+        """
+        row = self._db.connection().execute(
+            'SELECT complete FROM syncs WHERE key = ?', (key,)).fetchone()
+        return None if row is None else bool(row[0])
+
+    def _set_sync_state(self, key, complete):
+        self._db.connection().execute(
+            'INSERT OR REPLACE INTO syncs (key, synced_at, complete)'
+            ' VALUES (?, ?, ?)', (key, time.time(), int(complete)))
+
+    def _count(self, stat):
+        with self._stats_lock:
+            self.stats[stat] += 1
+
+    def _create_schema(self, db):
+        # Another layout: the store mirrors the API, sync it again
+        db.execute('DROP TABLE IF EXISTS matches')
+        db.execute('DROP TABLE IF EXISTS syncs')
+        db.execute(
+            'CREATE TABLE matches ('
+            ' id INTEGER PRIMARY KEY,'
+            ' utc_date TEXT NOT NULL,'
+            ' status TEXT,'
+            ' competition_id INTEGER,'
+            ' competition_code TEXT,'
+            ' season INTEGER,'
+            ' matchday INTEGER,'
+            ' home_team_id INTEGER,'
+            ' away_team_id INTEGER,'
+            ' data TEXT NOT NULL)')
+        db.execute('CREATE INDEX matches_date ON matches (utc_date)')
+        db.execute('CREATE INDEX matches_competition'
+                   ' ON matches (competition_id, utc_date)')
+        db.execute('CREATE INDEX matches_competition_code'
+                   ' ON matches (competition_code, utc_date)')
+        db.execute('CREATE INDEX matches_home_team'
+                   ' ON matches (home_team_id, utc_date)')
+        db.execute('CREATE INDEX matches_away_team'
+                   ' ON matches (away_team_id, utc_date)')
+        db.execute(
+            'CREATE TABLE syncs ('
+            ' key TEXT PRIMARY KEY,'
+            ' synced_at REAL NOT NULL,'
+            ' complete INTEGER NOT NULL)')
+
+
+def _competition_id(competition):
+    # Competitions are given by id or by code ('PL'), match either column
+    try:
+        return int(competition)
+    except ValueError:
+        return None
+
+
+def _add_days(day, days):
+    return (date.fromisoformat(str(day)) + timedelta(days=days)).isoformat()
+
+
+def _next_day(day):
+    return _add_days(day, 1)
@@ -0,0 +1,149 @@
+"""
+Incremental parsing of the big list in an API response (`matches`,
+`teams`...), element by element, as the body is downloaded.
+"""
+import codecs
+import json
+import re
+
+# Characters that change the structure, strings are skipped as a whole
+TOKEN_RE = re.compile(r'["\[\]{},:]')
+STRING_END_RE = re.compile(r'(?:[^"\\]|\\.)*"', re.DOTALL)
+# Separators between the elements of the array
+SKIP_RE = re.compile(r'[\s,]*')
+
+# Last character of an element that can't go on in the next chunk
+CLOSED = frozenset('}]"')
+# What may follow a complete number or literal
+SEPARATORS = frozenset(', \t\r\n]')
+# What must come with the data completing an element: its last character,
+# or the comma or bracket after a number or literal
+END_RE = re.compile(r'[}\]",]')
+
+_decoder = json.JSONDecoder()
+
+
+class ArrayStreamParser(object):
+    """
+    Find the array under `key` in a top-level JSON object fed chunk by chunk,
+    and return the raw JSON of each of its elements as soon as it's complete.
+
+        parser = ArrayStreamParser('matches')
+        for chunk in chunks:
+            for element in parser.feed(chunk):
+                match = json.loads(element)
+
+    Only the current (incomplete) element is buffered, never the whole body.
+    The part before the array is scanned token by token, the elements are
+    delimited by the C JSON scanner.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.done = False
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._buf = ''
+        self._pos = 0
+        self._depth = 0
+        self._in_array = False
+        self._last_key = None
+        self._key_matched = False
+        # Whether the buffer holds an element known to be incomplete
+        self._incomplete = False
+
+    def feed(self, chunk):
+        """
+        Parse the next chunk (bytes) of the body, returning the elements it
+        completes as strings.
+        """
+        if self.done:
+            return []
+        text = self._text.decode(chunk)
+        self._buf += text
+        if not self._in_array:
+            self._find_array()
+        if not self._in_array:
+            return []
+        if self._incomplete and not END_RE.search(text):
+            # Nothing that could complete the pending element yet
+            return []
+        return self._elements()
+
+    def _find_array(self):
+        buf = self._buf
+        pos = self._pos
+        while True:
+            m = TOKEN_RE.search(buf, pos)
+            if m is None:
+                pos = len(buf)
+                break
+            i = m.start()
+            c = buf[i]
+
+            if c == '"':
+                end = STRING_END_RE.match(buf, i + 1)
+                if end is None:
+                    # The string goes on in the next chunk
+                    pos = i
+                    break
+                if self._depth == 1:
+                    self._last_key = buf[i + 1:end.end() - 1]
+                pos = end.end()
+                continue
+            pos = i + 1
+
+            if c == ':':
+                if self._depth == 1:
+                    self._key_matched = self._last_key == self.key
+            elif c in '{[':
+                if c == '[' and self._depth == 1 and self._key_matched:
+                    self._in_array = True
+                    break
+                self._depth += 1
+            elif c in '}]':
+                self._depth -= 1
+            elif self._depth == 1:
+                self._key_matched = False
+
+        # Drop what's parsed
+        self._buf = buf[pos:]
+        self._pos = 0
+
+    def _elements(self):
+        buf = self._buf
+        pos = 0
+        elements = []
+        self._incomplete = False
+        while True:
+            pos = SKIP_RE.match(buf, pos).end()
+            if pos == len(buf):
+                break
+            if buf[pos] == ']':
+                self.done = True
+                break
+            try:
+                _, end = _decoder.raw_decode(buf, pos)
+            except ValueError:
+                end = None
+            if end is None or (buf[end - 1] not in CLOSED
+                               and buf[end:end + 1] not in SEPARATORS):
+                # Incomplete, or a number that may go on in the next chunk
+                self._incomplete = True
+                break
+            elements.append(buf[pos:end])
+            pos = end
+
+        self._buf = buf[pos:]
+        return elements
+
+
+def iter_array(chunks, key):
+    """
+    Yield the raw JSON of each element of the `key` array, parsing chunks
+    (an iterable of bytes) incrementally.
+    """
+    parser = ArrayStreamParser(key)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+        if parser.done:
+            break
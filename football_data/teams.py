@@ -0,0 +1,196 @@
+"""
+Resolution of free-form team names (bookmaker feeds, user input...) to
+football-data team ids, over the aliases of constants.TEAM_ID.
+"""
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from functools import lru_cache
+from itertools import chain
+
+# Letters NFKD doesn't decompose into a base letter and an accent
+FOLD = str.maketrans({'ß': 'ss', 'ø': 'o', 'æ': 'ae', 'œ': 'oe', 'ł': 'l',
+                      'đ': 'd', 'ð': 'd', 'þ': 'th', 'ı': 'i'})
+# Dropped so 'F.C.' and 'fc' read the same, the rest separates words
+DROPPED_RE = re.compile(r"[.'`´’]")
+SEPARATORS_RE = re.compile(r'[^a-z0-9]+')
+
+# Words left out of the short form of a name ("arsenal fc" -> "arsenal")
+NOISE_WORDS = frozenset(('fc', 'cf', 'afc', 'ac', 'sc', 'ssc', 'as', 'sv',
+                         'vfb', 'vfl', 'fk', 'cd', 'ca', 'club', 'de', 'calcio',
+                         'football', 'futbol', 'the'))
+
+
+def normalize(name):
+    """
+    Lowercase name, fold its accents ('Köln' -> 'koln') and reduce its
+    punctuation and spacing to single spaces.
+    """
+    name = unicodedata.normalize('NFKD', name.lower().translate(FOLD))
+    name = ''.join(c for c in name if not unicodedata.combining(c))
+    return SEPARATORS_RE.sub(' ', DROPPED_RE.sub('', name)).strip()
+
+
+def short_form(normalized):
+    """
+    A normalized name without its NOISE_WORDS, or the name itself when it's
+    nothing but.
+    """
+    words = [w for w in normalized.split() if w not in NOISE_WORDS]
+    return ' '.join(words) or normalized
+
+
+def trigrams(normalized):
+    padded = f'  {normalized} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TeamResolver(object):
+    """
+    Resolve team names to ids over `aliases` (alias -> id, TEAM_ID by
+    default), with precomputed indexes:
+
+    - exact lookups of the normalized aliases and of their short forms
+    - a trigram inverted index for the others, ranking the aliases by the
+      similarity of their trigrams (Dice coefficient)
+
+    Names resolve to the best alias scoring at least `min_score`, and at
+    least `margin` more than the best alias of any other team (so
+    'Manchester' resolves to neither City nor United). The last `cache_size`
+    distinct names are cached.
+    """
+
+    def __init__(self, aliases=None, min_score=0.5, margin=0.1,
+                 cache_size=4096):
+        if aliases is None:
+            from .constants import TEAM_ID as aliases
+        self.min_score = min_score
+        self.margin = margin
+
+        self._exact = {}
+        short = {}
+        for alias, team_id in aliases.items():
+            key = normalize(alias)
+            self._exact.setdefault(key, team_id)
+            # Short forms shared by different teams resolve to neither
+            short.setdefault(short_form(key), set()).add(team_id)
+        for key, ids in short.items():
+            if len(ids) == 1:
+                self._exact.setdefault(key, next(iter(ids)))
+
+        self._keys = list(self._exact)
+        self._ids = [self._exact[key] for key in self._keys]
+        self._sizes = []
+        self._index = defaultdict(list)
+        for i, key in enumerate(self._keys):
+            grams = trigrams(key)
+            self._sizes.append(len(grams))
+            for gram in grams:
+                self._index[gram].append(i)
+
+        self._resolve = lru_cache(maxsize=cache_size)(self._resolve_uncached)
+
+    def resolve(self, name):
+        """
+        The id of the team called `name`, or None when nothing is similar
+        enough.
+        """
+        return self._resolve(name)
+
+    def resolve_many(self, names):
+        """
+        Resolve a batch of names, returning their ids (or None) in order.
+        Each distinct name is resolved once.
+        """
+        resolve = self._resolve
+        ids = {name: resolve(name) for name in set(names)}
+        return [ids[name] for name in names]
+
+    def candidates(self, name, limit=5):
+        """
+        Up to `limit` (id, alias, score) candidates for `name`, best first,
+        one per team. An exact match of the normalized name scores 1.
+        """
+        key = normalize(name)
+        exact = self._exact.get(key)
+        if exact is None:
+            exact = self._exact.get(short_form(key))
+        ranked = [(exact, key, 1.0)] if exact is not None else []
+
+        seen = {exact}
+        for score, i in self._ranked(key):
+            if len(ranked) >= limit:
+                break
+            if self._ids[i] not in seen:
+                seen.add(self._ids[i])
+                ranked.append((self._ids[i], self._keys[i], score))
+        return ranked[:limit]
+
+    def cache_info(self):
+        return self._resolve.cache_info()
+
+    def _resolve_uncached(self, name):
+        key = normalize(name)
+        team_id = self._exact.get(key)
+        if team_id is None:
+            team_id = self._exact.get(short_form(key))
+        if team_id is not None:
+            return team_id
+
+        scores = self._ranked(key, ordered=False)
+        if not scores:
+            return None
+        score, best = max(scores)
+        if score < self.min_score:
+            return None
+        team_id = self._ids[best]
+        ids = self._ids
+        runner_up = max((s for s, i in scores if ids[i] != team_id), default=0)
+        if score - runner_up < self.margin:
+            return None
+        return team_id
+
+    def _ranked(self, key, ordered=True):
+        grams = trigrams(key)
+        index = self._index
+        # Counted in C, the postings are short lists of alias positions
+        shared = Counter(chain.from_iterable(
+            index[gram] for gram in grams if gram in index))
+        if not shared:
+            return []
+
+        size = len(grams)
+        sizes = self._sizes
+        scores = [(2 * count / (size + sizes[i]), i)
+                  for i, count in shared.items()]
+        if ordered:
+            scores.sort(reverse=True)
+        return scores
+
+
+_default = None
+
+
+def default_resolver():
+    """
+    The shared TeamResolver over TEAM_ID, built on first use.
+    """
+    global _default
+    if _default is None:
+        _default = TeamResolver()
+    return _default
+
+
+def resolve_team(name):
+    """
+    The id of the team called `name` (any case, accents, punctuation or
+    small typos), or None. See TeamResolver.
+    """
+    return default_resolver().resolve(name)
+
+
+def resolve_teams(names):
+    """
+    Batch version of resolve_team(), ids (or None) in the order of names.
+    """
+    return default_resolver().resolve_many(names)
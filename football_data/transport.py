@@ -0,0 +1,595 @@
+"""
+Transports, how FootballData sends its requests:
+
+- RequestsTransport: a pooled requests session (the default)
+- HTTPXTransport: a pooled httpx client, multiplexing concurrent requests
+  over HTTP/2 connections (pip install football_data[http2])
+- InProcessTransport: a function answering the requests in-process, for
+  load tests
+- RecordingTransport / ReplayTransport: record the responses of another
+  transport to a file, and replay them in-process
+
+They all return Response objects reporting the bytes sent and received and
+the time spent in each phase of the request (Timings), and keep totals in
+their `stats`.
+"""
+import json
+import threading
+import time
+import urllib.parse
+
+from .utils import endpoint_template
+
+# Bytes read at a time to fill Response.content
+CHUNK_SIZE = 64 * 1024
+
+
+class TransportError(Exception):
+    """
+    A request that got no (complete) response.
+    """
+
+
+class NetworkError(TransportError):
+    """
+    A connection error or timeout, retried according to the RetryPolicy.
+    """
+
+
+class Headers(dict):
+    """
+    Response headers, looked up by name in any case.
+    """
+
+    def __init__(self, headers=()):
+        if hasattr(headers, 'items'):
+            headers = headers.items()
+        super().__init__((name.lower(), value) for name, value in headers)
+
+    def __getitem__(self, name):
+        return super().__getitem__(name.lower())
+
+    def __contains__(self, name):
+        return super().__contains__(name.lower())
+
+    def get(self, name, default=None):
+        return super().get(name.lower(), default)
+
+
+class Timings(object):
+    """
+    Seconds spent in each phase of a request, None when the transport can't
+    tell:
+
+    - dns: resolving the host name of a new connection, 0 for a pooled one
+    - connect: opening a new connection (TCP and TLS), 0 for a pooled one
+    - wait: from sending the request to receiving the response headers
+    - transfer: reading the body (so far, for a streamed response)
+    """
+    __slots__ = ('dns', 'connect', 'wait', 'transfer')
+
+    def __init__(self, dns=None, connect=None, wait=0.0, transfer=0.0):
+        self.dns = dns
+        self.connect = connect
+        self.wait = wait
+        self.transfer = transfer
+
+    @property
+    def total(self):
+        return (self.dns or 0) + (self.connect or 0) + self.wait + self.transfer
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return 'Timings(' + ', '.join(
+            f'{name}={value * 1000:.2f}ms' if value is not None else f'{name}=?'
+            for name, value in self.as_dict().items()) + ')'
+
+
+def request_size(url, headers, method='GET'):
+    """
+    Bytes of a request without body, as HTTP/1.1 sends it (HTTP/2 compresses
+    the headers, so it's an upper bound there).
+    """
+    split = urllib.parse.urlsplit(url)
+    target = split.path + (f'?{split.query}' if split.query else '')
+    size = len(method) + len(target) + len(split.netloc) + 27
+    for name, value in headers.items():
+        size += len(name) + len(str(value)) + 4
+    return size
+
+
+def headers_size(status, headers):
+    """
+    Bytes of the status line and headers of a response, as HTTP/1.1 sends
+    them.
+    """
+    return 17 + len(str(status)) + sum(len(name) + len(str(value)) + 4
+                                       for name, value in headers.items())
+
+
+class Response(object):
+    """
+    A response of a transport, read like a requests response: status_code,
+    headers (case-insensitive), url, content, iter_content() and close()
+    (or use it as a context manager).
+
+    bytes_sent counts the request, bytes_received the response headers and
+    body as received (before decompression), and timings (Timings) where
+    the time went. bytes_received and timings.transfer are final once the
+    body is read or the response closed.
+
+    This base class holds a body already read whole (`content`). Subclasses
+    reading it from a connection implement _chunks(), _wire_bytes() and
+    _release().
+    """
+
+    def __init__(self, status_code, headers, url, content=None, bytes_sent=0,
+                 timings=None, transport=None):
+        self.status_code = status_code
+        self.headers = headers if isinstance(headers, Headers) else Headers(headers)
+        self.url = url
+        self.bytes_sent = bytes_sent
+        self.bytes_received = headers_size(status_code, self.headers)
+        self.timings = timings or Timings()
+        self._transport = transport
+        self._content = content
+        self._consumed = False
+        self._done = False
+        if content is not None:
+            self._finish(len(content))
+
+    @property
+    def content(self):
+        if self._content is None:
+            if self._consumed:
+                raise RuntimeError('the body of this response was already read')
+            self._content = b''.join(self.iter_content(CHUNK_SIZE))
+        return self._content
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def iter_content(self, chunk_size=CHUNK_SIZE):
+        content = self._content
+        if content is not None:
+            for i in range(0, len(content), chunk_size):
+                yield content[i:i + chunk_size]
+            return
+        if self._consumed:
+            raise RuntimeError('the body of this response was already read')
+        self._consumed = True
+
+        chunks = self._chunks(chunk_size)
+        try:
+            while True:
+                # Only the reads are timed, not what the caller does between
+                start = time.perf_counter()
+                chunk = next(chunks, None)
+                self.timings.transfer += time.perf_counter() - start
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            self.close()
+
+    def close(self):
+        if not self._done:
+            self._release()
+            self._finish(self._wire_bytes())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _finish(self, body_bytes):
+        self._done = True
+        self.bytes_received += body_bytes
+        if self._transport is not None:
+            self._transport._count(self)
+
+    def _chunks(self, chunk_size):
+        return iter(())
+
+    def _wire_bytes(self):
+        return 0
+
+    def _release(self):
+        pass
+
+
+class Transport(object):
+    """
+    Base class of the transports. send() makes a GET request and returns
+    its Response, raising NetworkError for connection errors and timeouts
+    and TransportError for the other failures. The body is read whole unless
+    stream=True, in which case it's read with iter_content().
+
+    stats counts the requests, the bytes sent and received and the seconds
+    they took (headers and body), all responses complete.
+    """
+
+    def __init__(self):
+        self.stats = {
+            'requests': 0,
+            'bytes_sent': 0,
+            'bytes_received': 0,
+            'seconds': 0.0
+        }
+        self._stats_lock = threading.Lock()
+
+    def send(self, url, headers, timeout=None, stream=False):
+        """
+        GET url with headers. timeout is (connect, read) seconds, or None to
+        wait forever.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _count(self, response):
+        with self._stats_lock:
+            stats = self.stats
+            stats['requests'] += 1
+            stats['bytes_sent'] += response.bytes_sent
+            stats['bytes_received'] += response.bytes_received
+            stats['seconds'] += response.timings.total
+
+
+# Connect time of the connection opened by the current request of each
+# thread, if any: urllib3 connects in the thread sending the request
+_connect_times = threading.local()
+
+
+class RequestsTransport(Transport):
+    """
+    Send the requests with a requests Session, created (and requests
+    imported) by the first request, keeping `pool_maxsize` connections
+    alive per host in `pool_connections` pools (see requests' HTTPAdapter).
+
+    DNS resolution is counted in timings.connect.
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, pool_block=False):
+        super().__init__()
+        self._pool = (pool_connections, pool_maxsize, pool_block)
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """
+        The requests Session, created on first use.
+        """
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session(*self._pool)
+        return self._session
+
+    @session.setter
+    def session(self, session):
+        self._session = session
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+
+    def send(self, url, headers, timeout=None, stream=False):
+        import requests
+
+        session = self.session
+        _connect_times.connect = 0.0
+        start = time.perf_counter()
+        try:
+            res = session.get(url, headers=headers, timeout=timeout,
+                              stream=True)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            raise NetworkError(str(e)) from e
+        except requests.RequestException as e:
+            raise TransportError(str(e)) from e
+        connect = _connect_times.connect
+        timings = Timings(None, connect,
+                          time.perf_counter() - start - connect)
+
+        response = _RequestsResponse(res, timings, self)
+        if not stream:
+            with response:
+                response.content
+        return response
+
+    def _create_session(self, pool_connections, pool_maxsize, pool_block):
+        """
+        Create the keep-alive session used for every request.
+        """
+        import requests
+
+        session = requests.Session()
+        adapter = _timed_adapter_class()(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+            pool_block=pool_block)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+
+class _RequestsResponse(Response):
+
+    def __init__(self, res, timings, transport):
+        request = res.request
+        super().__init__(res.status_code, res.headers.items(), res.url,
+                         bytes_sent=request_size(request.url, request.headers,
+                                                 request.method),
+                         timings=timings, transport=transport)
+        self._res = res
+
+    def _chunks(self, chunk_size):
+        from urllib3.exceptions import HTTPError
+
+        try:
+            yield from self._res.raw.stream(chunk_size, decode_content=True)
+        except (HTTPError, OSError) as e:
+            raise NetworkError(str(e)) from e
+
+    def _wire_bytes(self):
+        return self._res.raw.tell()
+
+    def _release(self):
+        self._res.close()
+
+
+_TIMED_ADAPTER = None
+
+
+def _timed_adapter_class():
+    """
+    An HTTPAdapter whose new connections record how long they took to
+    connect in _connect_times. Built on first use, so requests and urllib3
+    are only imported then.
+    """
+    global _TIMED_ADAPTER
+    if _TIMED_ADAPTER is not None:
+        return _TIMED_ADAPTER
+
+    import requests
+    from urllib3.connection import HTTPConnection, HTTPSConnection
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+    class TimedConnection(object):
+
+        def connect(self):
+            start = time.perf_counter()
+            super().connect()
+            # DNS and TLS included
+            _connect_times.connect = time.perf_counter() - start
+
+    class TimedHTTPConnection(TimedConnection, HTTPConnection):
+        pass
+
+    class TimedHTTPSConnection(TimedConnection, HTTPSConnection):
+        pass
+
+    class TimedHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = TimedHTTPConnection
+
+    class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = TimedHTTPSConnection
+
+    class TimedHTTPAdapter(requests.adapters.HTTPAdapter):
+
+        def init_poolmanager(self, *args, **kwargs):
+            super().init_poolmanager(*args, **kwargs)
+            self.poolmanager.pool_classes_by_scheme = {
+                'http': TimedHTTPConnectionPool,
+                'https': TimedHTTPSConnectionPool
+            }
+
+    _TIMED_ADAPTER = TimedHTTPAdapter
+    return _TIMED_ADAPTER
+
+
+class HTTPXTransport(Transport):
+    """
+    Send the requests with a pooled httpx Client. With http2=True (requires
+    pip install football_data[http2]) concurrent requests to the API share
+    a few multiplexed HTTP/2 connections instead of one connection each,
+    for high-concurrency fan-out. Up to `max_connections` connections are
+    opened, `max_keepalive_connections` kept alive.
+
+    DNS resolution is counted in timings.connect.
+    """
+
+    def __init__(self, http2=True, max_connections=100,
+                 max_keepalive_connections=20):
+        super().__init__()
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError(
+                'HTTPXTransport requires httpx: pip install football_data[http2]')
+        self._httpx = httpx
+        self.client = httpx.Client(http2=http2, limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections))
+
+    def close(self):
+        self.client.close()
+
+    def send(self, url, headers, timeout=None, stream=False):
+        httpx = self._httpx
+        if timeout is not None:
+            connect, read = timeout
+            timeout = httpx.Timeout(read, connect=connect)
+        events = {}
+
+        def trace(name, info):
+            events[name] = time.perf_counter()
+
+        request = self.client.build_request('GET', url, headers=headers,
+                                            timeout=timeout,
+                                            extensions={'trace': trace})
+        start = time.perf_counter()
+        try:
+            res = self.client.send(request, stream=True)
+        except (httpx.TimeoutException, httpx.NetworkError,
+                httpx.RemoteProtocolError) as e:
+            raise NetworkError(str(e)) from e
+        except httpx.HTTPError as e:
+            raise TransportError(str(e)) from e
+        elapsed = time.perf_counter() - start
+
+        connect = 0.0
+        if 'connection.connect_tcp.started' in events:
+            connected = events.get('connection.start_tls.complete',
+                                   events.get('connection.connect_tcp.complete'))
+            connect = connected - events['connection.connect_tcp.started']
+        timings = Timings(None, connect, elapsed - connect)
+
+        response = _HTTPXResponse(res, request, timings, self, httpx)
+        if not stream:
+            with response:
+                response.content
+        return response
+
+
+class _HTTPXResponse(Response):
+
+    def __init__(self, res, request, timings, transport, httpx):
+        super().__init__(res.status_code, res.headers.items(), str(res.url),
+                         bytes_sent=request_size(str(request.url),
+                                                 request.headers),
+                         timings=timings, transport=transport)
+        self._res = res
+        self._httpx = httpx
+
+    def _chunks(self, chunk_size):
+        httpx = self._httpx
+        try:
+            yield from self._res.iter_bytes(chunk_size)
+        except (httpx.TimeoutException, httpx.NetworkError,
+                httpx.RemoteProtocolError) as e:
+            raise NetworkError(str(e)) from e
+
+    def _wire_bytes(self):
+        return self._res.num_bytes_downloaded
+
+    def _release(self):
+        self._res.close()
+
+
+class InProcessTransport(Transport):
+    """
+    Answer the requests in-process with handler(url, headers), returning
+    (status, headers, body), after sleeping `latency` seconds: the client
+    runs as usual, without any socket or server, for load tests.
+    """
+
+    def __init__(self, handler, latency=0):
+        super().__init__()
+        self.handler = handler
+        self.latency = latency
+
+    def send(self, url, headers, timeout=None, stream=False):
+        start = time.perf_counter()
+        if self.latency:
+            time.sleep(self.latency)
+        status, res_headers, body = self.handler(url, headers)
+        if isinstance(body, str):
+            body = body.encode()
+        return Response(status, res_headers, url, content=body,
+                        bytes_sent=request_size(url, headers),
+                        timings=Timings(wait=time.perf_counter() - start),
+                        transport=self)
+
+
+def load_recordings(path):
+    """
+    Recorded responses from a JSON lines file, one response per line:
+    {"url": ..., "status": ..., "headers": {...}, "body": "..."}, as
+    written by RecordingTransport.
+    """
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class RecordingTransport(Transport):
+    """
+    Send the requests through `transport` (a RequestsTransport by default)
+    and append each response to the JSON lines file at path, for
+    ReplayTransport (or the benchmarks' replay server) to replay. Bodies
+    are read whole, even when streamed.
+    """
+
+    def __init__(self, path, transport=None):
+        self.transport = transport or RequestsTransport()
+        # The responses are counted by the transport that received them
+        self.stats = self.transport.stats
+        self.path = path
+        self._file = open(path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def close(self):
+        self.transport.close()
+        self._file.close()
+
+    def send(self, url, headers, timeout=None, stream=False):
+        response = self.transport.send(url, headers, timeout)
+        line = json.dumps({'url': url, 'status': response.status_code,
+                           'headers': dict(response.headers),
+                           'body': response.content.decode('utf-8', 'replace')})
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+        return response
+
+
+class ReplayTransport(InProcessTransport):
+    """
+    Replay `recordings` (a path, see load_recordings, or a list of them)
+    in-process. A request gets the recording of the same URL, or with
+    fallback=True the first one of the same endpoint, and otherwise a 404.
+    """
+
+    def __init__(self, recordings, latency=0, fallback=False):
+        super().__init__(self._replay, latency)
+        if isinstance(recordings, str):
+            recordings = load_recordings(recordings)
+        self.fallback = fallback
+        self._responses = {}
+        self._endpoints = {}
+        for recording in recordings:
+            body = recording['body']
+            if not isinstance(body, str):
+                body = json.dumps(body)
+            response = (recording.get('status', 200),
+                        recording.get('headers', {}), body.encode())
+            self._responses.setdefault(_target(recording['url']), response)
+            self._endpoints.setdefault(endpoint_template(recording['url']),
+                                       response)
+
+    def _replay(self, url, headers):
+        response = self._responses.get(_target(url))
+        if response is None and self.fallback:
+            response = self._endpoints.get(endpoint_template(url))
+        if response is None:
+            body = json.dumps({'message': f'no recording of {url}',
+                               'errorCode': 404})
+            return 404, {'Content-Type': 'application/json'}, body
+        return response
+
+
+def _target(url):
+    # Path and query, whatever the host the recording was made against
+    split = urllib.parse.urlsplit(url)
+    return split.path + (f'?{split.query}' if split.query else '')
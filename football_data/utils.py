@@ -1,12 +1,141 @@
 import json
 import re
+import urllib.parse
+from datetime import datetime, timedelta
 from types import SimpleNamespace
 
+# orjson, imported by the first load_orjson() or json_loads() call, False
+# when it isn't installed
+orjson = None
+
+# Match statuses of the API
+MATCH_STATUSES = ('SCHEDULED', 'TIMED', 'IN_PLAY', 'PAUSED', 'EXTRA_TIME',
+                  'PENALTY_SHOOTOUT', 'FINISHED', 'SUSPENDED', 'POSTPONED',
+                  'CANCELLED', 'AWARDED', 'LIVE')
+# Statuses of a match being played
+LIVE_STATUSES = frozenset(('IN_PLAY', 'PAUSED', 'EXTRA_TIME',
+                           'PENALTY_SHOOTOUT', 'LIVE'))
+# Statuses a match won't leave anymore
+FINAL_STATUSES = frozenset(('FINISHED', 'AWARDED'))
+
 
 def json2obj(data):
+    if type(data) in _CONTAINERS:
+        # Already parsed (see projection.py)
+        return dict2obj(data)
     return json.loads(data, object_hook=lambda d: SimpleNamespace(**d))
 
 
+def dict2obj(obj):
+    """
+    Same as json2obj, for JSON already parsed into dicts and lists.
+    """
+    if type(obj) is dict:
+        return SimpleNamespace(**{k: dict2obj(v) for k, v in obj.items()})
+    if type(obj) is list:
+        return [dict2obj(item) for item in obj]
+    return obj
+
+
+def load_orjson():
+    """
+    The orjson module, or False when it isn't installed.
+    """
+    global orjson
+    if orjson is None:
+        try:
+            import orjson as module
+        except ImportError:  # pragma: no cover - optional dependency
+            module = False
+        orjson = module
+    return orjson
+
+
+def json_loads(data):
+    """
+    Parse JSON with orjson when it's installed, the json module otherwise.
+    """
+    if orjson is None:
+        load_orjson()
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json2lazy(data):
+    """
+    Faster alternative to json2obj: same attribute access, but the objects
+    are LazyNamespace proxies over the parsed dicts, built only for the parts
+    of the response actually accessed.
+    """
+    if type(data) in _CONTAINERS:
+        return _lazy(data)
+    return _lazy(json_loads(data))
+
+
+class LazyNamespace(object):
+    """
+    Read attributes of a parsed JSON object, wrapping nested objects (and
+    lists of objects) on first access.
+    """
+
+    def __init__(self, data):
+        self._data = data
+
+    def __getattr__(self, name):
+        if name == '_data':
+            raise AttributeError(name)
+        try:
+            value = self._data[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        if type(value) in _CONTAINERS:
+            value = _lazy(value)
+        # Next lookups of name find a plain instance attribute
+        self.__dict__[name] = value
+        return value
+
+    def __dir__(self):
+        return list(self._data)
+
+    def __eq__(self, other):
+        if isinstance(other, LazyNamespace):
+            return self._asdict() == other._asdict()
+        return NotImplemented
+
+    def __repr__(self):
+        items = ', '.join(f'{k}={v!r}' for k, v in self._data.items())
+        return f'LazyNamespace({items})'
+
+    def _asdict(self):
+        """
+        The underlying object as plain dicts and lists.
+        """
+        return _plain(self._data)
+
+
+_CONTAINERS = (dict, list)
+
+
+def _lazy(value):
+    if type(value) is dict:
+        return LazyNamespace(value)
+    if type(value) is list:
+        return [_lazy(item) if type(item) in _CONTAINERS else item
+                for item in value]
+    return value
+
+
+def _plain(value):
+    if isinstance(value, LazyNamespace):
+        value = value._data
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
+
+
 def validate_date(d):
 
     if d:
@@ -15,3 +144,40 @@ def validate_date(d):
         if pattern.match(d):
             return True
     return False
+
+
+def date_windows(dateFrom, dateTo, days):
+    """
+    Split the dateFrom..dateTo range (both included, 'YYYY-MM-DD') into
+    consecutive windows of at most `days` days, as (dateFrom, dateTo) pairs.
+    """
+    start = datetime.strptime(str(dateFrom), '%Y-%m-%d').date()
+    end = datetime.strptime(str(dateTo), '%Y-%m-%d').date()
+
+    windows = []
+    while start <= end:
+        window_end = min(end, start + timedelta(days=days - 1))
+        windows.append((start.isoformat(), window_end.isoformat()))
+        start = window_end + timedelta(days=1)
+    return windows
+
+
+RESOURCES = ('areas', 'competitions', 'matches', 'persons', 'teams')
+
+
+def endpoint_template(url):
+    """
+    Reduce an API URL to its endpoint, ids replaced by a placeholder:
+    '.../v4/competitions/PL/matches/?season=2020' -> 'competitions/{id}/matches'
+    """
+    path = urllib.parse.urlsplit(url).path
+    parts = [part for part in path.split('/') if part]
+    if parts and re.match(r'v[0-9]+$', parts[0]):
+        parts = parts[1:]
+
+    template = []
+    prev = None
+    for part in parts:
+        template.append('{id}' if prev in RESOURCES else part)
+        prev = part
+    return '/'.join(template)
@@ -17,5 +17,12 @@ setup(
     ],
     keywords="football football-data api",
     install_requires=['requests'],
-    python_requires=">=3.6"
+    extras_require={
+        'async': ['aiohttp'],
+        'fast': ['orjson'],
+        'columnar': ['numpy', 'pandas'],
+        'http2': ['httpx[http2]'],
+        'otel': ['opentelemetry-api'],
+    },
+    python_requires=">=3.7"
 )
@@ -0,0 +1,175 @@
+"""
+A fake football-data API for the client tests, answering like the real one
+from generated data: api(url, headers) -> (status, headers, body), the
+handler signature of transport.InProcessTransport.
+
+- competitions/XX, teams/404 and matches/404 don't exist (404)
+- matches?dateFrom&dateTo has one match per day, plus one the day after
+  dateTo (as a match late on dateTo UTC would be), newest first, so
+  consecutive date windows overlap by a match
+- every response has an ETag, and a request with a matching If-None-Match
+  gets a 304 Not Modified
+
+Recorder serves it recording the requests, and client() builds a
+FootballData on it.
+"""
+import hashlib
+import json
+import threading
+import time
+import urllib.parse
+from datetime import date, timedelta
+
+from football_data import FootballData
+from football_data.transport import InProcessTransport
+from football_data.utils import endpoint_template
+
+COMPETITIONS = ('PL', 'SA', 'BL1')
+
+
+def error(status, message):
+    return status, {'Content-Type': 'application/json'}, json.dumps(
+        {'message': message, 'errorCode': status})
+
+
+def match(match_id, day, **fields):
+    return dict({'id': match_id, 'utcDate': f'{day}T15:00:00Z',
+                 'status': 'FINISHED',
+                 'homeTeam': {'id': 57, 'name': 'Arsenal FC'},
+                 'awayTeam': {'id': 65, 'name': 'Manchester City FC'},
+                 'score': {'fullTime': {'home': 1, 'away': 0}}}, **fields)
+
+
+def competition_matches(code, season=None):
+    """
+    Three matches per competition and season, ids telling them apart.
+    """
+    base = (COMPETITIONS.index(code) + 1) * 1000 + (int(season or 2022) % 100) * 10
+    return [match(base + i, f'{season or 2022}-08-0{i + 1}',
+                  competition={'code': code}, season={'year': season})
+            for i in range(3)]
+
+
+def day_matches(dateFrom, dateTo):
+    start = date.fromisoformat(dateFrom)
+    end = date.fromisoformat(dateTo) + timedelta(days=1)
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    return [match(day.toordinal(), day.isoformat()) for day in reversed(days)]
+
+
+def body(url):
+    """
+    (status, payload) of the API response to url.
+    """
+    split = urllib.parse.urlsplit(url)
+    query = dict(urllib.parse.parse_qsl(split.query))
+    parts = [part for part in split.path.split('/') if part][1:]
+    template = endpoint_template(url)
+
+    if template == 'competitions':
+        return 200, {'count': len(COMPETITIONS), 'competitions': [
+            {'id': 2000 + i, 'code': code} for i, code in enumerate(COMPETITIONS)]}
+    if template.startswith('competitions/') and parts[1] not in COMPETITIONS:
+        return 404, None
+    if template == 'competitions/{id}':
+        return 200, {'id': 2000 + COMPETITIONS.index(parts[1]), 'code': parts[1]}
+    if template == 'competitions/{id}/teams':
+        return 200, {'count': 2, 'teams': [
+            {'id': 57, 'name': 'Arsenal FC', 'area': {'code': 'ENG'}},
+            {'id': 65, 'name': 'Manchester City FC', 'area': {'code': 'ENG'}}]}
+    if template == 'competitions/{id}/matches':
+        return 200, {'matches': competition_matches(parts[1], query.get('season'))}
+    if template in ('matches', 'teams/{id}/matches'):
+        if parts[-2:-1] == ['404']:
+            return 404, None
+        if 'dateFrom' in query:
+            return 200, {'matches': day_matches(query['dateFrom'], query['dateTo'])}
+        return 200, {'matches': [match(1, '2022-08-05'), match(2, '2022-08-06')]}
+    if template == 'matches/{id}':
+        if parts[1] == '404':
+            return 404, None
+        return 200, match(int(parts[1]), '2022-08-05')
+    if template == 'teams/{id}':
+        if parts[1] == '404':
+            return 404, None
+        return 200, {'id': int(parts[1]), 'name': f'Team {parts[1]}'}
+    return 404, None
+
+
+def api(url, headers):
+    status, payload = body(url)
+    if status == 404:
+        return error(404, 'The resource you are looking for does not exist.')
+    content = json.dumps(payload)
+    etag = '"' + hashlib.md5(content.encode()).hexdigest() + '"'
+    response_headers = {'Content-Type': 'application/json', 'ETag': etag,
+                        'Last-Modified': 'Mon, 01 Aug 2022 12:00:00 GMT'}
+    if headers.get('If-None-Match') == etag:
+        return 304, response_headers, ''
+    return status, response_headers, content
+
+
+class Recorder(object):
+    """
+    Handler serving `response` (status, headers, body) to every request, or
+    the answer of `handler` (the fake API by default), after `delay`
+    seconds, with a 500 error for the urls containing `fail`. Records the
+    urls and headers requested, when they were, and the most requests in
+    flight at once.
+    """
+
+    def __init__(self, fail=None, delay=0, response=None, handler=api):
+        self.fail = fail
+        self.delay = delay
+        self.response = response
+        self.handler = handler
+        self.urls = []
+        self.headers = []
+        self.times = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, url, headers):
+        with self._lock:
+            self.urls.append(url)
+            self.headers.append(dict(headers))
+            self.times.append(time.monotonic())
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            if self.fail and self.fail in url:
+                return error(500, 'server error')
+            return self.response or self.handler(url, headers)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def client(test, handler=api, **kwargs):
+    """
+    A FootballData answered by handler in-process, without retries unless
+    given, closed at the end of test.
+    """
+    kwargs.setdefault('retry', False)
+    football = FootballData('key', log_level='CRITICAL',
+                            transport=InProcessTransport(handler), **kwargs)
+    test.addCleanup(football.close)
+    return football
+
+
+def count_decodes(football):
+    """
+    The list of the bodies decoded by football from now on.
+    """
+    decoded = []
+    decode = football.decode
+
+    def counting_decode(content):
+        decoded.append(content)
+        return decode(content)
+
+    football.decode = counting_decode
+    return decoded
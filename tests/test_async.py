@@ -0,0 +1,234 @@
+"""
+Contains unit tests for the AsyncFootballData class, against the fake API
+(fake_api.py) served by a local aiohttp server.
+"""
+import asyncio
+import time
+import unittest
+
+from fake_api import api, competition_matches
+from football_data import FootballData, MemoryCache, RetryPolicy
+from football_data.transport import InProcessTransport
+
+try:
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+    from football_data import AsyncFootballData
+except ImportError:
+    web = None
+
+
+class FakeServer(object):
+    """
+    Serves the fake API, answering with `responses` first if any, after
+    `delay` seconds. Records the requests and the most in flight at once.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.responses = []
+        self.delay = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle(self, request):
+        self.requests.append(request)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            if self.responses:
+                status, headers, body = self.responses.pop(0)
+            else:
+                status, headers, body = api(str(request.url), request.headers)
+            return web.Response(status=status, headers=headers,
+                                body=body.encode())
+        finally:
+            self.in_flight -= 1
+
+
+@unittest.skipUnless(web, 'aiohttp not installed')
+class AsyncFootballDataTest(unittest.IsolatedAsyncioTestCase):
+    """
+    Class for unit testing the AsyncFootballData class.
+    """
+
+    async def asyncSetUp(self):
+        self.fake = FakeServer()
+        app = web.Application()
+        app.router.add_get('/{path:.*}', self.fake.handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.addAsyncCleanup(self.server.close)
+
+    def client(self, **kwargs):
+        football = AsyncFootballData('key', log_level='CRITICAL', **kwargs)
+        football.API_URL = str(self.server.make_url('/v4/'))
+        self.addAsyncCleanup(football.close)
+        return football
+
+    async def test_endpoints_match_sync_client(self):
+        football = self.client()
+        sync = FootballData('key', log_level='CRITICAL',
+                            transport=InProcessTransport(api))
+        calls = [
+            ('competitions', ()),
+            ('competition', ('PL',)),
+            ('competition_teams', ('PL',)),
+            ('competition_matches', ('PL',)),
+            ('matches', ()),
+            ('match', (1,)),
+            ('team', (57,)),
+            ('team_matches', (57,)),
+            ('team', (404,)),
+            ('match', (404,)),
+        ]
+        for name, args in calls:
+            with self.subTest(name, args=args):
+                expected = getattr(sync, name)(*args)
+                self.assertEqual(await getattr(football, name)(*args), expected)
+                self.assertEqual(football.error, sync.error)
+        self.assertEqual(football.error['code'], 404)
+
+    async def test_gather(self):
+        self.fake.delay = 0.05
+        football = self.client()
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(football.competition_matches(code) for code in ('PL', 'SA', 'BL1')),
+            football.team(57), football.match(1))
+        elapsed = time.perf_counter() - start
+        self.assertEqual([m.id for m in results[1]],
+                         [m['id'] for m in competition_matches('SA')])
+        self.assertEqual(results[3].id, 57)
+        self.assertEqual(self.fake.max_in_flight, 5)
+        self.assertLess(elapsed, 5 * 0.05)
+
+    async def test_max_concurrency(self):
+        self.fake.delay = 0.02
+        football = self.client(max_concurrency=2)
+        teams = await asyncio.gather(*(football.team(i) for i in range(1, 9)))
+        self.assertEqual([team.id for team in teams], list(range(1, 9)))
+        self.assertEqual(self.fake.max_in_flight, 2)
+
+    async def test_errors(self):
+        football = self.client()
+        self.assertIsNone(await football.team(404))
+        self.assertEqual(football.error, {
+            'code': 404,
+            'msg': 'The resource you are looking for does not exist.'})
+        # Cleared by the next call
+        self.assertEqual((await football.team(57)).id, 57)
+        self.assertEqual(football.error, {'code': None, 'msg': ''})
+
+        self.fake.responses.append((500, {}, 'Internal Server Error'))
+        football = self.client(retry=False)
+        self.assertEqual(await football.competitions(), [])
+        self.assertEqual(football.error, {'code': 500, 'msg': 'HTTP error 500'})
+
+        football = self.client(retry=False)
+        football.API_URL = 'http://127.0.0.1:9/v4/'
+        self.assertEqual(await football.competitions(), [])
+        self.assertTrue(football.error['msg'].startswith('aiohttp get error'))
+
+    async def test_errors_per_task(self):
+        football = self.client()
+        missing, found = await asyncio.gather(football.team(404), football.team(57))
+        self.assertIsNone(missing)
+        self.assertEqual(found.id, 57)
+
+    async def test_cache_revalidation(self):
+        cache = MemoryCache(ttls={'teams/{id}': 0})
+        football = self.client(cache=cache)
+        first = await football.team(57)
+        second = await football.team(57)
+        self.assertIs(second, first)
+
+        revalidation = self.fake.requests[1]
+        self.assertEqual(revalidation.headers['If-None-Match'],
+                         api(football._team_url(57), {})[1]['ETag'])
+        self.assertEqual(revalidation.headers['If-Modified-Since'],
+                         'Mon, 01 Aug 2022 12:00:00 GMT')
+        counters = football.stats['revalidation']['teams/{id}']
+        self.assertEqual(counters['not_modified'], 1)
+        self.assertGreater(counters['bytes_saved'], 0)
+
+        # Fresh entries are served without a request
+        football = self.client(cache=MemoryCache())
+        await football.competitions()
+        await football.competitions()
+        self.assertEqual(len(self.fake.requests), 3)
+
+    async def test_retries(self):
+        self.fake.responses.extend([
+            (429, {'Retry-After': '0'}, '{"message": "slow down", "errorCode": 429}'),
+            (503, {}, 'Service Unavailable')])
+        football = self.client(retry=RetryPolicy(backoff_base=0))
+        self.assertEqual((await football.team(57)).id, 57)
+        self.assertEqual(len(self.fake.requests), 3)
+        self.assertEqual(football.stats['retries'], {'teams/{id}': 2})
+
+        self.fake.responses.extend([(503, {}, '')] * 2)
+        football = self.client(retry=RetryPolicy(max_attempts=2, backoff_base=0))
+        self.assertIsNone(await football.team(57))
+        self.assertEqual(football.error['code'], 503)
+
+    async def test_matches_range(self):
+        football = self.client()
+        matches = await football.matches_range('2022-08-01', '2022-08-25')
+        windows = [(r.query['dateFrom'], r.query['dateTo'])
+                   for r in self.fake.requests]
+        self.assertEqual(sorted(windows), [('2022-08-01', '2022-08-10'),
+                                           ('2022-08-11', '2022-08-20'),
+                                           ('2022-08-21', '2022-08-25')])
+        # One per day and the day after, deduplicated and sorted
+        self.assertEqual(len(matches), 26)
+        self.assertEqual([m.utcDate for m in matches],
+                         sorted(m.utcDate for m in matches))
+
+        self.assertEqual(await football.team_matches_range(
+            404, '2022-08-01', '2022-08-25'), [])
+        self.assertEqual(football.error['code'], 404)
+
+        self.assertEqual(await football.matches_range('2022-08-25', '2022-08-01'), [])
+
+    async def test_iter_competition_matches(self):
+        football = self.client()
+        ids = [match.id async for match in football.iter_competition_matches(
+            ['PL', 'XX', 'SA'], seasons=[2021, 2022])]
+        expected = [m['id'] for code in ('PL', 'SA') for season in (2021, 2022)
+                    for m in competition_matches(code, season)]
+        self.assertEqual(ids, expected)
+        # The failing competition was skipped, its error left for the consumer
+        self.assertEqual(football.error['code'], 404)
+
+        # Cleared when the next iteration starts
+        ids = [match.id async for match in football.iter_competition_matches(['PL'])]
+        self.assertEqual(len(ids), 3)
+        self.assertEqual(football.error, {'code': None, 'msg': ''})
+
+    async def test_iter_prefetch(self):
+        self.fake.delay = 0.02
+        football = self.client()
+        matches = football.iter_competition_matches(
+            ['PL', 'SA', 'BL1'], seasons=[2020, 2021, 2022], prefetch=2)
+        await matches.__anext__()
+        # The first response and the two after it
+        self.assertEqual(self.fake.max_in_flight, 3)
+        await matches.aclose()
+        await asyncio.sleep(0.05)
+        self.assertEqual(len(self.fake.requests), 3)
+
+    async def test_iter_matches(self):
+        football = self.client()
+        days = [match.utcDate[:10] async for match in
+                football.iter_matches('2022-08-01', '2022-08-15')]
+        # Window by window, as the API returns them
+        self.assertEqual(len(days), 11 + 6)
+        self.assertEqual(days[0], '2022-08-11')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Contains unit tests for the *_bulk methods of FootballData, against the fake
+API (fake_api.py).
+"""
+import unittest
+
+from fake_api import Recorder, client
+from football_data import BulkResult, RateLimiter
+
+
+class BulkTest(unittest.TestCase):
+    """
+    Class for unit testing teams_bulk, team_matches_bulk and matches_bulk.
+    """
+
+    def client(self, **kwargs):
+        self.api = Recorder()
+        return client(self, self.api, **kwargs)
+
+    def test_results_by_id(self):
+        football = self.client()
+        teams = football.teams_bulk([57, 65, 66])
+        self.assertIsInstance(teams, BulkResult)
+        self.assertEqual(list(teams), [57, 65, 66])
+        self.assertEqual([team.id for team in teams.values()], [57, 65, 66])
+        self.assertEqual(teams.errors, {})
+
+        matches = football.team_matches_bulk([57, 65])
+        self.assertEqual([[m.id for m in matches[57]], [m.id for m in matches[65]]],
+                         [[1, 2], [1, 2]])
+
+    def test_duplicate_ids(self):
+        football = self.client()
+        teams = football.teams_bulk([57, 65, 57, 57])
+        self.assertEqual(list(teams), [57, 65])
+        self.assertEqual(len(self.api.urls), 2)
+
+    def test_errors_per_id(self):
+        football = self.client()
+        teams = football.teams_bulk([57, 404, 65])
+        self.assertEqual(list(teams), [57, 65])
+        self.assertEqual(teams.errors, {404: {
+            'code': 404,
+            'msg': 'The resource you are looking for does not exist.'}})
+
+        matches = football.matches_bulk([1, 404])
+        self.assertEqual(list(matches), [1])
+        self.assertEqual(matches.errors[404]['code'], 404)
+
+    def test_invalid_filters(self):
+        football = self.client()
+        matches = football.team_matches_bulk([57, 65], venue='NOWHERE')
+        self.assertEqual(matches, {})
+        self.assertEqual(matches.errors, {
+            57: {'code': None, 'msg': 'invalid filters'},
+            65: {'code': None, 'msg': 'invalid filters'}})
+        self.assertEqual(self.api.urls, [])
+
+    def test_empty(self):
+        football = self.client()
+        for method in ('teams_bulk', 'team_matches_bulk', 'matches_bulk'):
+            with self.subTest(method):
+                results = getattr(football, method)([])
+                self.assertEqual(results, {})
+                self.assertEqual(results.errors, {})
+        self.assertEqual(self.api.urls, [])
+
+    def test_rate_limited(self):
+        limiter = RateLimiter(requests_per_minute=1200, burst=1)
+        football = self.client(rate_limit=limiter)
+        teams = football.teams_bulk(range(1, 6), max_workers=5)
+        self.assertEqual(list(teams), [1, 2, 3, 4, 5])
+        # One immediately, then one every 50ms despite the 5 workers
+        times = sorted(self.api.times)
+        self.assertGreaterEqual(times[-1] - times[0], 0.19)
+        self.assertEqual(limiter.stats['requests'], 5)
+        self.assertEqual(limiter.stats['delayed'], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,240 @@
+"""
+Contains unit tests for the response caches in cache.py.
+"""
+import json
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+
+from fake_api import Recorder, api, client, count_decodes
+from football_data.cache import MemoryCache, SQLiteCache
+from football_data.utils import endpoint_template
+
+URL = 'https://api.football-data.org/v4/'
+
+
+def matches_payload(*statuses):
+    return json.dumps({'matches': [
+        {'id': i, 'status': status} for i, status in enumerate(statuses)
+    ]}).encode()
+
+
+class MemoryCacheTest(unittest.TestCase):
+    """
+    Class for unit testing MemoryCache.
+    """
+
+    def test_hit_miss(self):
+        cache = MemoryCache()
+        self.assertIsNone(cache.get(URL + 'competitions'))
+        cache.set(URL + 'competitions', b'{"competitions": []}')
+        entry = cache.get(URL + 'competitions')
+        self.assertEqual(entry.content, b'{"competitions": []}')
+        self.assertEqual(cache.stats, {'hits': 1, 'misses': 1, 'evictions': 0})
+
+    def test_lru_eviction(self):
+        cache = MemoryCache(maxsize=2)
+        cache.set(URL + 'teams/1', b'{}')
+        cache.set(URL + 'teams/2', b'{}')
+        cache.get(URL + 'teams/1')
+        cache.set(URL + 'teams/3', b'{}')
+        self.assertIsNone(cache.get(URL + 'teams/2'))
+        self.assertIsNotNone(cache.get(URL + 'teams/1'))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats['evictions'], 1)
+
+    def test_expiry(self):
+        cache = MemoryCache(ttls={'teams/{id}': 0.01})
+        cache.set(URL + 'teams/1', b'{}')
+        time.sleep(0.02)
+        self.assertIsNone(cache.get(URL + 'teams/1'))
+
+    def test_match_status_ttl(self):
+        cache = MemoryCache(live_ttl=15, upcoming_ttl=60, finished_ttl=None)
+        url = URL + 'competitions/PL/matches'
+        self.assertIsNone(
+            cache.ttl_for(url, matches_payload('FINISHED', 'FINISHED')))
+        self.assertEqual(
+            cache.ttl_for(url, matches_payload('FINISHED', 'SCHEDULED')), 60)
+        self.assertEqual(
+            cache.ttl_for(url, matches_payload('IN_PLAY', 'SCHEDULED')), 15)
+        for status in ('PAUSED', 'EXTRA_TIME', 'PENALTY_SHOOTOUT', 'LIVE'):
+            self.assertEqual(
+                cache.ttl_for(url, matches_payload('FINISHED', status)), 15)
+        self.assertIsNone(
+            cache.ttl_for(url, matches_payload('FINISHED', 'AWARDED')))
+        self.assertEqual(cache.ttl_for(URL + 'teams/1', b'{}'), 24 * 3600)
+
+    def test_stale_refresh(self):
+        cache = MemoryCache(ttls={'teams/{id}': 0.01})
+        cache.set(URL + 'teams/1', b'{}')
+        cache.set(URL + 'teams/2', b'{}', etag='"v1"')
+        time.sleep(0.02)
+        # Nothing to revalidate without a validator
+        self.assertIsNone(cache.stale(URL + 'teams/1'))
+        entry = cache.stale(URL + 'teams/2')
+        self.assertEqual(entry.etag, '"v1"')
+        cache.refresh(URL + 'teams/2', entry)
+        self.assertIs(cache.get(URL + 'teams/2'), entry)
+
+    def test_endpoint_template(self):
+        self.assertEqual(endpoint_template(URL + 'competitions'),
+                         'competitions')
+        self.assertEqual(
+            endpoint_template(URL + 'competitions/PL/matches/?season=2020'),
+            'competitions/{id}/matches')
+        self.assertEqual(endpoint_template(URL + 'matches/200063'),
+                         'matches/{id}')
+
+
+def _fill(path, start):
+    cache = SQLiteCache(path)
+    for i in range(start, start + 50):
+        cache.set(URL + f'teams/{i}', b'{"id": %d}' % i)
+
+
+class SQLiteCacheTest(unittest.TestCase):
+    """
+    Class for unit testing SQLiteCache.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'cache.sqlite')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_shared_across_instances(self):
+        cache = SQLiteCache(self.path)
+        cache.set(URL + 'competitions', b'{"competitions": []}', etag='"abc"')
+        cache.close()
+
+        entry = SQLiteCache(self.path).get(URL + 'competitions')
+        self.assertEqual(entry.content, b'{"competitions": []}')
+        self.assertEqual(entry.etag, '"abc"')
+
+    def test_stale_refresh(self):
+        cache = SQLiteCache(self.path, ttls={'teams/{id}': 0.01})
+        cache.set(URL + 'teams/1', b'{}', last_modified='Mon, 01 Jun 2020')
+        time.sleep(0.02)
+        self.assertIsNone(cache.get(URL + 'teams/1'))
+        entry = cache.stale(URL + 'teams/1')
+        cache.refresh(URL + 'teams/1', entry, etag='"v2"')
+        entry = cache.get(URL + 'teams/1')
+        self.assertEqual(entry.etag, '"v2"')
+        self.assertEqual(entry.last_modified, 'Mon, 01 Jun 2020')
+
+    def test_size_capped(self):
+        cache = SQLiteCache(self.path, max_bytes=100)
+        for i in range(5):
+            cache.set(URL + f'teams/{i}', b'x' * 40)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats['evictions'], 3)
+        self.assertIsNotNone(cache.get(URL + 'teams/4'))
+        self.assertIsNone(cache.get(URL + 'teams/0'))
+
+    def test_concurrent_processes(self):
+        SQLiteCache(self.path)
+        procs = [multiprocessing.Process(target=_fill, args=(self.path, i * 50))
+                 for i in range(4)]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+            self.assertEqual(proc.exitcode, 0)
+        self.assertEqual(len(SQLiteCache(self.path)), 200)
+
+    def test_locked(self):
+        cache = SQLiteCache(self.path, timeout=0.05)
+        football = client(self, cache=cache)
+        self.assertEqual(football.team(57).id, 57)
+
+        # Another process holding the write lock past the timeout
+        other = sqlite3.connect(self.path, isolation_level=None)
+        self.addCleanup(other.close)
+        other.execute('BEGIN IMMEDIATE')
+        with self.assertLogs('football_data.cache', 'WARNING'):
+            self.assertEqual(football.team(65).id, 65)
+        self.assertEqual(football.error, {'code': None, 'msg': ''})
+        self.assertEqual(cache.stats['errors'], 1)
+        # Still read
+        self.assertEqual(football.team(57).id, 57)
+        other.execute('ROLLBACK')
+        self.assertIsNone(cache.get(football._team_url(65)))
+
+    def test_damaged(self):
+        cache = SQLiteCache(self.path)
+        football = client(self, cache=cache)
+        other = sqlite3.connect(self.path, isolation_level=None)
+        self.addCleanup(other.close)
+        other.execute('DROP TABLE responses')
+        with self.assertLogs('football_data.cache', 'WARNING') as logs:
+            self.assertEqual(football.team(57).id, 57)
+        # The lookups of a fresh then a stale entry, then the write
+        self.assertEqual(len(logs.records), 3)
+        self.assertEqual(cache.stats['errors'], 3)
+        self.assertEqual(cache.stats['misses'], 1)
+
+
+class RevalidationTest(unittest.TestCase):
+    """
+    Class for unit testing the revalidation of stale entries by FootballData.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def client(self, cache):
+        recorder = Recorder()
+        football = client(self, recorder, cache=cache)
+        return football, recorder.headers, count_decodes(football)
+
+    def check_revalidation(self, cache, decodes):
+        football, sent, decoded = self.client(cache)
+        first = football.team(57)
+        second = football.team(57)
+        self.assertEqual(second, first)
+
+        _, headers, body = api(football._team_url(57), {})
+        self.assertNotIn('If-None-Match', sent[0])
+        self.assertEqual(sent[1]['If-None-Match'], headers['ETag'])
+        self.assertEqual(sent[1]['If-Modified-Since'], headers['Last-Modified'])
+        self.assertEqual(len(decoded), decodes)
+        counters = football.stats['revalidation']['teams/{id}']
+        self.assertEqual(counters['not_modified'], 1)
+        self.assertEqual(counters['bytes_saved'], len(body))
+        return first, second
+
+    def test_memory_cache(self):
+        first, second = self.check_revalidation(
+            MemoryCache(ttls={'teams/{id}': 0}), decodes=1)
+        # Served as decoded the first time
+        self.assertIs(second, first)
+
+    def test_sqlite_cache(self):
+        path = os.path.join(self.tmpdir.name, 'cache.sqlite')
+        # Entries are read back from the file, so their body is decoded
+        # again, but not downloaded
+        self.check_revalidation(SQLiteCache(path, ttls={'teams/{id}': 0}),
+                                decodes=2)
+
+    def test_changed(self):
+        football, sent, decoded = self.client(MemoryCache(ttls={'teams/{id}': 0}))
+        football.team(57)
+        football.cache.stale(football._team_url(57)).etag = '"old"'
+        self.assertEqual(football.team(57).id, 57)
+        self.assertEqual(sent[1]['If-None-Match'], '"old"')
+        # A new body, decoded and cached with its own validator
+        self.assertEqual(len(decoded), 2)
+        self.assertNotEqual(football.cache.stale(football._team_url(57)).etag,
+                            '"old"')
+        self.assertEqual(football.stats['revalidation'], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+Contains unit tests for the columnar decoding in columnar.py.
+"""
+import json
+import unittest
+
+from football_data.columnar import (MISSING, STATUS_CODES, json2columns,
+                                    merge_arrays, np, to_columns,
+                                    to_dataframe)
+
+MATCHES = [
+    {'id': 1, 'utcDate': '2022-08-05T19:00:00Z', 'status': 'FINISHED',
+     'matchday': 1, 'competition': {'id': 2021}, 'season': {'id': 1490},
+     'homeTeam': {'id': 354}, 'awayTeam': {'id': 57},
+     'score': {'fullTime': {'home': 0, 'away': 2},
+               'halfTime': {'home': 0, 'away': 1}}},
+    {'id': 2, 'utcDate': '2023-05-28T15:30:00Z', 'status': 'TIMED',
+     'matchday': None, 'competition': {'id': 2021}, 'season': {'id': 1490},
+     'homeTeam': {'id': 57}, 'awayTeam': {'id': None},
+     'score': {'fullTime': {'home': None, 'away': None},
+               'halfTime': {'home': None, 'away': None}}},
+]
+BODY = json.dumps({'resultSet': {'count': 2}, 'matches': MATCHES}).encode()
+
+
+@unittest.skipIf(np is None, 'numpy not installed')
+class ColumnarTest(unittest.TestCase):
+    """
+    Class for unit testing the columnar decoding.
+    """
+
+    def test_json2columns(self):
+        res = json2columns(BODY)
+        self.assertEqual(res.resultSet.count, 2)
+        matches = res.matches
+        self.assertEqual(matches['id'].tolist(), [1, 2])
+        self.assertEqual(matches['utcDate'][0],
+                         np.datetime64('2022-08-05T19:00:00'))
+        self.assertEqual(matches['status'].tolist(),
+                         [STATUS_CODES['FINISHED'], STATUS_CODES['TIMED']])
+        self.assertEqual(matches['matchday'].tolist(), [1, MISSING])
+        self.assertEqual(matches['awayTeam'].tolist(), [57, MISSING])
+        self.assertEqual(matches['fullTimeAway'].tolist(), [2, MISSING])
+        self.assertEqual(matches['halfTimeAway'].tolist(), [1, MISSING])
+
+        # Vectorized: goals scored away in finished matches
+        finished = matches['status'] == STATUS_CODES['FINISHED']
+        self.assertEqual(matches['fullTimeAway'][finished].sum(), 2)
+
+    def test_no_matches(self):
+        res = json2columns(b'{"teams": [{"id": 57}]}')
+        self.assertEqual(res.teams[0].id, 57)
+
+    def test_merge_arrays(self):
+        matches = json2columns(BODY).matches
+        merged = merge_arrays([matches[::-1], matches[:1]])
+        self.assertEqual(merged['id'].tolist(), [1, 2])
+
+    def test_to_columns(self):
+        columns = to_columns(json2columns(BODY).matches)
+        self.assertEqual(columns['homeTeam'].tolist(), [354, 57])
+
+    def test_to_dataframe(self):
+        try:
+            df = to_dataframe(json2columns(BODY).matches)
+        except ImportError:
+            self.skipTest('pandas not installed')
+        self.assertEqual(list(df['status']), ['FINISHED', 'TIMED'])
+        self.assertEqual(str(df['utcDate'].dt.tz), 'UTC')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Contains unit tests for the pooled keep-alive connections of FootballData.
+"""
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from football_data import FootballData
+
+BODY = b'{"count": 1, "competitions": [{"id": 2019, "code": "SA"}]}'
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.opened += 1
+
+    def finish(self):
+        super().finish()
+        with self.server.lock:
+            self.server.closed += 1
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ConnectionPoolTest(unittest.TestCase):
+    """
+    Class for unit testing the connection pool.
+    """
+
+    def setUp(self):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.lock = threading.Lock()
+        self.httpd.opened = self.httpd.closed = 0
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.addCleanup(self.httpd.server_close)
+        self.addCleanup(self.httpd.shutdown)
+
+    def client(self, **kwargs):
+        football = FootballData('key', log_level='CRITICAL', **kwargs)
+        football.API_URL = f'http://127.0.0.1:{self.httpd.server_port}/v4/'
+        self.addCleanup(football.close)
+        return football
+
+    def wait_closed(self, count):
+        deadline = time.monotonic() + 5
+        while self.httpd.closed < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return self.httpd.closed
+
+    def test_connection_reused(self):
+        football = self.client()
+        for _ in range(3):
+            self.assertEqual(football.competitions()[0].code, 'SA')
+        self.assertEqual(self.httpd.opened, 1)
+        self.assertEqual(self.httpd.closed, 0)
+
+    def test_close_releases_connection(self):
+        football = self.client()
+        football.competitions()
+        football.close()
+        self.assertEqual(self.wait_closed(1), 1)
+
+    def test_context_manager(self):
+        with self.client() as football:
+            football.competitions()
+            football.competitions()
+        self.assertEqual(self.wait_closed(1), 1)
+        self.assertEqual(self.httpd.opened, 1)
+
+    def test_no_keep_alive(self):
+        football = self.client(keep_alive=False)
+        for _ in range(3):
+            football.competitions()
+        self.assertEqual(self.httpd.opened, 3)
+        self.assertEqual(self.wait_closed(3), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+"""
+Contains unit tests for the per-thread and per-task errors of the clients,
+and for how they are read from the API responses.
+"""
+import asyncio
+import threading
+import unittest
+from unittest import mock
+
+from fake_api import Recorder, client, count_decodes
+from football_data import FootballData
+from football_data import football_data as module
+
+
+class ErrorTest(unittest.TestCase):
+    """
+    Class for unit testing the error reporting, without network access.
+    """
+
+    def setUp(self):
+        self.football = FootballData('key', log_level='CRITICAL')
+
+    def tearDown(self):
+        self.football.close()
+
+    def test_default(self):
+        self.assertEqual(self.football.error, {'code': None, 'msg': ''})
+
+    def test_set_and_clear(self):
+        self.football._set_error(404, 'not found')
+        self.assertEqual(self.football.error, {'code': 404, 'msg': 'not found'})
+        self.football._clear_error()
+        self.assertEqual(self.football.error['code'], None)
+
+    def test_threads(self):
+        barrier = threading.Barrier(4)
+        seen = {}
+
+        def call(n):
+            self.football._set_error(n, f'error {n}')
+            # Every thread has set its error before any reads it back
+            barrier.wait()
+            seen[n] = self.football.error
+
+        threads = [threading.Thread(target=call, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(seen, {n: {'code': n, 'msg': f'error {n}'}
+                                for n in range(4)})
+        self.assertEqual(self.football.error['code'], None)
+
+    def test_tasks(self):
+        async def call(n):
+            self.football._clear_error()
+            if n % 2:
+                self.football._set_error(n, 'odd')
+            await asyncio.sleep(0)
+            return self.football.error['code']
+
+        async def main():
+            return await asyncio.gather(*(call(n) for n in range(4)))
+
+        self.assertEqual(asyncio.run(main()), [None, 1, None, 3])
+
+    def test_clients_apart(self):
+        other = FootballData('key', log_level='CRITICAL')
+        self.addCleanup(other.close)
+        self.football._set_error(404, 'not found')
+        self.assertEqual(other.error['code'], None)
+
+        async def task():
+            other._set_error(500, 'server error')
+            return other.error['code'], self.football.error['code']
+
+        # Seen by the task, not by the context it was started from
+        self.assertEqual(asyncio.run(task()), (500, 404))
+        self.assertEqual(other.error['code'], None)
+
+    def test_close_forgets_error(self):
+        for _ in range(100):
+            football = FootballData('key', log_level='CRITICAL')
+            football._set_error(404, 'not found')
+            football.close()
+            self.assertEqual(football.error['code'], None)
+        self.assertEqual(module._errors.get(), {})
+
+    def test_worker_errors_reach_caller(self):
+        def api_request(url, fields=None):
+            if url.endswith('2'):
+                self.football._set_error(500, 'server error')
+                return False
+            return object()
+
+        self.football._api_request = api_request
+        self.assertEqual(self.football._fetch_matches(['1', '2', '3'], 3), [])
+        self.assertEqual(self.football.error, {'code': 500, 'msg': 'server error'})
+
+        bulk = self.football.matches_bulk([1, 2, 3])
+        self.assertEqual(list(bulk.errors), [2])
+        self.assertEqual(bulk.errors[2]['code'], 500)
+
+
+class CheckStatusTest(unittest.TestCase):
+    """
+    Class for unit testing how FootballData parses the bodies of successful
+    and failed responses.
+    """
+
+    def client(self, response=None):
+        """
+        A client answering `response` (status, headers, body), or from the
+        fake API. The bodies decoded are in self.decoded, those parsed as
+        errors in self.parsed.
+        """
+        football = client(self, Recorder(response=response))
+        self.decoded = count_decodes(football)
+        self.parsed = []
+        json_loads = module.json_loads
+
+        def counting_loads(content):
+            self.parsed.append(content)
+            return json_loads(content)
+
+        patcher = mock.patch.object(module, 'json_loads', counting_loads)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return football
+
+    def test_success_decoded_once(self):
+        football = self.client()
+        self.assertEqual(football.team(57).id, 57)
+        self.assertEqual(len(self.decoded), 1)
+        self.assertEqual(self.parsed, [])
+        self.assertEqual(football.error, {'code': None, 'msg': ''})
+
+    def test_json_error(self):
+        football = self.client((400, {'Content-Type': 'application/json'},
+                                '{"message": "Bad filter", "errorCode": 400}'))
+        self.assertIsNone(football.team(57))
+        self.assertEqual(football.error, {'code': 400, 'msg': 'Bad filter'})
+        # Parsed as an error, never handed to the decoder
+        self.assertEqual(len(self.parsed), 1)
+        self.assertEqual(self.decoded, [])
+
+        football = self.client((403, {}, '{"error": 403, "message": "Restricted"}'))
+        self.assertIsNone(football.team(57))
+        self.assertEqual(football.error, {'code': 403, 'msg': 'Restricted'})
+
+    def test_non_json_error(self):
+        for body in ('<html>Bad Gateway</html>', '', '["not", "an", "error"]',
+                     '{"unexpected": true}'):
+            with self.subTest(body=body):
+                football = self.client((502, {'Content-Type': 'text/html'}, body))
+                self.assertEqual(football.competitions(), [])
+                self.assertEqual(football.error,
+                                 {'code': 502, 'msg': 'HTTP error 502'})
+                self.assertEqual(self.decoded, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Contains unit tests for the iter_* methods of FootballData, against the fake
+API (fake_api.py). Their AsyncFootballData counterparts are in test_async.py.
+"""
+import time
+import unittest
+
+from fake_api import Recorder, client, competition_matches
+
+
+class IterTest(unittest.TestCase):
+    """
+    Class for unit testing iter_competition_matches and iter_matches.
+    """
+
+    def client(self, delay=0):
+        self.api = Recorder(delay=delay)
+        return client(self, self.api)
+
+    def test_order(self):
+        football = self.client(delay=0.01)
+        ids = [match.id for match in football.iter_competition_matches(
+            ['PL', 'SA', 'BL1'], seasons=[2021, 2022], prefetch=3)]
+        # Competition by competition, season by season, whatever the order
+        # their responses arrive in
+        expected = [m['id'] for code in ('PL', 'SA', 'BL1')
+                    for season in (2021, 2022)
+                    for m in competition_matches(code, season)]
+        self.assertEqual(ids, expected)
+        self.assertEqual(football.error, {'code': None, 'msg': ''})
+
+    def test_clears_error(self):
+        football = self.client()
+        self.assertIsNone(football.team(404))
+        matches = football.iter_matches('2022-08-01', '2022-08-05')
+        self.assertEqual(football.error['code'], 404)
+        # Cleared when the iteration starts
+        self.assertEqual(len(list(matches)), 6)
+        self.assertEqual(football.error, {'code': None, 'msg': ''})
+
+    def test_failing_url_skipped(self):
+        football = self.client()
+        ids = [match.id for match in football.iter_competition_matches(
+            ['PL', 'XX', 'SA'], seasons=[2022])]
+        self.assertEqual(ids, [m['id'] for code in ('PL', 'SA')
+                               for m in competition_matches(code, 2022)])
+        self.assertEqual(len(self.api.urls), 3)
+        # Set on the consuming thread, not only on the worker's
+        self.assertEqual(football.error['code'], 404)
+
+    def test_prefetch(self):
+        for prefetch in (1, 2):
+            with self.subTest(prefetch=prefetch):
+                football = self.client(delay=0.02)
+                matches = football.iter_competition_matches(
+                    ['PL', 'SA', 'BL1'], seasons=[2020, 2021, 2022],
+                    prefetch=prefetch)
+                next(matches)
+                self.assertLessEqual(len(self.api.urls), prefetch + 1)
+                self.assertLessEqual(self.api.max_in_flight, prefetch + 1)
+
+                # Closing early drops the responses fetched ahead, the rest
+                # is never requested
+                matches.close()
+                time.sleep(0.1)
+                self.assertLessEqual(len(self.api.urls), prefetch + 1)
+
+    def test_iter_matches(self):
+        football = self.client()
+        days = [match.utcDate[:10]
+                for match in football.iter_matches('2022-08-01', '2022-08-15')]
+        # Window by window, as the API returns them, newest first
+        self.assertEqual(len(days), 11 + 6)
+        self.assertEqual(days[0], '2022-08-11')
+        self.assertEqual(days[11], '2022-08-16')
+        self.assertEqual(days[-1], '2022-08-11')
+
+        self.assertEqual(list(football.iter_matches('2022-08-15', '2022-08-01')), [])
+        self.assertEqual(len(self.api.urls), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Contains unit tests for the lazy imports of the package, each in a fresh
+interpreter.
+"""
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def imported(statement):
+    """
+    The modules imported after running statement in a new interpreter.
+    """
+    script = (f'{statement}\n'
+              'import sys\n'
+              'print(*sys.modules)')
+    return set(run(script).split())
+
+
+def run(script):
+    """
+    The output of script run in a new interpreter.
+    """
+    proc = subprocess.run([sys.executable, '-c', script], check=True,
+                          capture_output=True, text=True,
+                          env=dict(os.environ, PYTHONPATH=ROOT))
+    return proc.stdout
+
+
+class LazyImportTest(unittest.TestCase):
+    """
+    Class for unit testing the lazy imports.
+    """
+
+    def test_import_package(self):
+        modules = imported('import football_data')
+        for module in ('requests', 'aiohttp', 'numpy', 'football_data.constants',
+                       'football_data.football_data'):
+            self.assertNotIn(module, modules)
+
+    def test_client_without_request(self):
+        modules = imported(
+            'import logging\n'
+            'from football_data import FootballData\n'
+            "FootballData('key')\n"
+            'assert not logging.getLogger().handlers')
+        for module in ('requests', 'aiohttp', 'numpy', 'sqlite3', 'orjson',
+                       'football_data.constants'):
+            self.assertNotIn(module, modules)
+
+    def test_first_use(self):
+        modules = imported(
+            'import football_data\n'
+            "assert football_data.TEAM_ID['arsenal'] == 57\n"
+            "assert 'MatchStore' in dir(football_data)\n"
+            "football_data.FootballData('key').session")
+        self.assertIn('football_data.constants', modules)
+        self.assertIn('requests', modules)
+        self.assertNotIn('numpy', modules)
+
+    def test_concurrent_first_requests(self):
+        # One client per thread, all making their first request (importing
+        # requests) at once
+        output = run(
+            'import threading\n'
+            'from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer\n'
+            'from football_data import FootballData\n'
+            '\n'
+            'class Handler(BaseHTTPRequestHandler):\n'
+            "    protocol_version = 'HTTP/1.1'\n"
+            '    def do_GET(self):\n'
+            "        body = b'{\"competitions\": [{\"code\": \"PL\"}]}'\n"
+            '        self.send_response(200)\n'
+            "        self.send_header('Content-Length', str(len(body)))\n"
+            '        self.end_headers()\n'
+            '        self.wfile.write(body)\n'
+            '    def log_message(self, *args):\n'
+            '        pass\n'
+            '\n'
+            "httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)\n"
+            'threading.Thread(target=httpd.serve_forever, daemon=True).start()\n'
+            'barrier = threading.Barrier(8)\n'
+            'results = []\n'
+            '\n'
+            'def call():\n'
+            "    football = FootballData('key', log_level='CRITICAL')\n"
+            "    football.API_URL = f'http://127.0.0.1:{httpd.server_port}/v4/'\n"
+            '    barrier.wait()\n'
+            '    try:\n'
+            '        results.append(football.competitions()[0].code)\n'
+            '    except Exception as e:\n'
+            '        results.append(repr(e))\n'
+            '\n'
+            'threads = [threading.Thread(target=call) for _ in range(8)]\n'
+            'for thread in threads:\n'
+            '    thread.start()\n'
+            'for thread in threads:\n'
+            '    thread.join()\n'
+            'print(*results)')
+        self.assertEqual(output.split(), ['PL'] * 8)
+
+    def test_unknown_name(self):
+        import football_data
+        with self.assertRaises(AttributeError):
+            football_data.NotAThing
+
+
+if __name__ == '__main__':
+    unittest.main()
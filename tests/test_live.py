@@ -0,0 +1,124 @@
+"""
+Contains unit tests for the live match poller in live.py.
+"""
+import asyncio
+import unittest
+from types import SimpleNamespace
+
+from football_data.live import LivePoller
+from football_data.ratelimit import RateLimiter
+
+
+def match(id_, status, home=0, away=0):
+    return SimpleNamespace(
+        id=id_, status=status,
+        score=SimpleNamespace(fullTime=SimpleNamespace(home=home, away=away)))
+
+
+class ScriptedFootballData(object):
+    """
+    Answers matches(status='LIVE') with the next list of `polls`, and match()
+    from `final`, without any network access.
+    """
+
+    def __init__(self, polls, final=None, rate_limiter=None):
+        self.polls = list(polls)
+        self.final = final or {}
+        self.rate_limiter = rate_limiter
+        self.error = {'code': None, 'msg': ''}
+        self.match_calls = []
+
+    def matches(self, competitions=None, status=None, fields=None):
+        res = self.polls.pop(0)
+        if res is None:
+            self.error = {'code': 500, 'msg': 'server error'}
+            return []
+        self.error = {'code': None, 'msg': ''}
+        return res
+
+    def match(self, match_id):
+        self.match_calls.append(match_id)
+        return self.final.get(match_id)
+
+
+class LivePollerTest(unittest.TestCase):
+    """
+    Class for unit testing LivePoller.
+    """
+
+    def changes(self, poller):
+        return [(c.kind, c.match.id, c.before, c.after) for c in poller.poll()]
+
+    def test_deltas(self):
+        football = ScriptedFootballData(
+            [[match(1, 'IN_PLAY'), match(2, 'IN_PLAY', 1, 0)],
+             [match(1, 'IN_PLAY'), match(2, 'IN_PLAY', 1, 0)],
+             [match(1, 'PAUSED', 1, 0), match(2, 'IN_PLAY', 1, 0)],
+             [match(1, 'IN_PLAY', 1, 0)]],
+            final={2: match(2, 'FINISHED', 1, 1)})
+        poller = LivePoller(football)
+        self.assertEqual(self.changes(poller), [
+            ('status', 1, None, 'IN_PLAY'),
+            ('status', 2, None, 'IN_PLAY'),
+            ('score', 2, None, (1, 0))])
+        # Nothing changed, nothing reported
+        self.assertEqual(self.changes(poller), [])
+        self.assertEqual(self.changes(poller), [
+            ('status', 1, 'IN_PLAY', 'PAUSED'),
+            ('score', 1, (0, 0), (1, 0))])
+        # Match 2 left the live list: fetched once more to see how it ended
+        self.assertEqual(self.changes(poller), [
+            ('status', 1, 'PAUSED', 'IN_PLAY'),
+            ('status', 2, 'IN_PLAY', 'FINISHED'),
+            ('score', 2, (1, 0), (1, 1))])
+        self.assertEqual(football.match_calls, [2])
+        self.assertEqual(poller.stats['changes'], 8)
+
+    def test_failed_poll(self):
+        football = ScriptedFootballData([[match(1, 'IN_PLAY')], None])
+        poller = LivePoller(football)
+        poller.poll()
+        # A failed poll isn't taken for the match having ended
+        self.assertEqual(poller.poll(), [])
+        self.assertEqual(football.match_calls, [])
+
+    def test_intervals(self):
+        football = ScriptedFootballData(
+            [[match(1, 'IN_PLAY')], [], [], [], [], [], []],
+            final={1: match(1, 'FINISHED')})
+        poller = LivePoller(football, live_interval=15, idle_interval=100,
+                            requests_per_minute=60, budget=1)
+        intervals = []
+        for _ in range(6):
+            poller.poll()
+            intervals.append(poller.interval)
+        self.assertEqual(intervals, [15, 15, 30, 60, 100, 100])
+
+    def test_budget(self):
+        football = ScriptedFootballData([[match(1, 'IN_PLAY')]],
+                                        rate_limiter=RateLimiter(10))
+        poller = LivePoller(football, live_interval=1, budget=0.5)
+        poller.poll()
+        # 1 request out of 5 per minute
+        self.assertEqual(poller.interval, 12)
+
+    def test_callbacks_and_queue(self):
+        football = ScriptedFootballData([[match(1, 'IN_PLAY', 1, 0)]])
+        poller = LivePoller(football)
+        received = []
+        poller.on_change(received.append)
+        poller.on_change(lambda change: 1 / 0)  # logged, doesn't stop others
+
+        async def main():
+            queue = asyncio.Queue()
+            poller.add_queue(queue)
+            poller.poll()
+            return [await queue.get(), await queue.get()]
+
+        queued = asyncio.run(main())
+        self.assertEqual([c.kind for c in received], ['status', 'score'])
+        self.assertEqual(queued, received)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+"""
+Contains unit tests for the instrumentation hooks in metrics.py.
+"""
+import json
+import unittest
+
+from fake_api import client
+from football_data import MemoryCache, RetryPolicy
+from football_data.metrics import Histogram, RequestMetrics, SpanHook
+from football_data.transport import NetworkError
+
+MATCH = json.dumps({'id': 1, 'status': 'FINISHED'})
+QUOTA = {'X-Requests-Available-Minute': '7', 'X-RequestCounter-Reset': '42'}
+
+
+def api(url, headers):
+    if url.endswith('/matches/1'):
+        return 200, QUOTA, MATCH
+    if '/matches' in url:
+        return 200, QUOTA, json.dumps({'matches': [json.loads(MATCH)]})
+    return 404, QUOTA, '{"message": "not found", "errorCode": 404}'
+
+
+class MetricsTest(unittest.TestCase):
+    """
+    Class for unit testing the instrumentation hooks.
+    """
+
+    def client(self, handler=api, **kwargs):
+        events = []
+        kwargs.setdefault('hooks', [events.append])
+        return client(self, handler, **kwargs), events
+
+    def test_event(self):
+        football, events = self.client()
+        football.match(1)
+        event, = events
+        self.assertEqual(event.endpoint, 'match')
+        self.assertEqual(event.url_template, 'matches/{id}')
+        self.assertEqual(event.status, 200)
+        self.assertIsNone(event.error)
+        self.assertIsNone(event.cache)
+        self.assertGreater(event.bytes_sent, 0)
+        self.assertGreater(event.bytes_received, len(MATCH))
+        self.assertGreaterEqual(event.decode_time, 0)
+        self.assertGreaterEqual(event.duration, event.timings.total)
+        self.assertEqual((event.quota_remaining, event.quota_reset), (7, 42))
+
+        football.team(57)
+        self.assertEqual(events[1].status, 404)
+        self.assertEqual(events[1].error, 'not found')
+        self.assertIsNone(events[1].decode_time)
+
+    def test_no_hooks(self):
+        football, events = self.client(hooks=None)
+        self.assertEqual(football.match(1).id, 1)
+        self.assertEqual(events, [])
+
+    def test_cache(self):
+        football, events = self.client(cache=MemoryCache())
+        football.match(1)
+        football.match(1)
+        self.assertEqual([e.cache for e in events], ['miss', 'hit'])
+        self.assertEqual([e.status for e in events], [200, None])
+        self.assertEqual(events[1].bytes_received, 0)
+        self.assertEqual(events[1].decode_time, 0)
+
+    def test_retries(self):
+        failures = [NetworkError('timeout'), (503, {}, '')]
+
+        def handler(url, headers):
+            if failures:
+                failure = failures.pop()
+                if isinstance(failure, Exception):
+                    raise failure
+                return failure
+            return api(url, headers)
+
+        football, events = self.client(
+            handler, retry=RetryPolicy(backoff_base=0.001))
+        self.assertEqual(football.match(1).id, 1)
+        event, = events
+        self.assertEqual(event.retries, 2)
+        self.assertGreater(event.backoff_time, 0)
+        self.assertEqual(event.status, 200)
+
+    def test_stream(self):
+        football, events = self.client()
+        self.assertEqual(len(list(football.stream_competition_matches('PL'))), 1)
+        event, = events
+        self.assertEqual(event.endpoint, 'competition_matches')
+        self.assertEqual(event.status, 200)
+        self.assertGreater(event.bytes_received, 0)
+
+    def test_failing_hook(self):
+        def hook(event):
+            raise RuntimeError('boom')
+
+        football, _ = self.client(hooks=[hook])
+        self.assertEqual(football.match(1).id, 1)
+
+    def test_histogram(self):
+        histogram = Histogram((0.1, 0.2, 0.4))
+        for value in (0.05, 0.15, 0.15, 0.3, 1.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [1, 2, 1, 1])
+        self.assertAlmostEqual(histogram.quantile(0.5), 0.175)
+        self.assertEqual(histogram.quantile(1), 0.4)
+        self.assertIsNone(Histogram((1,)).quantile(0.5))
+
+    def test_request_metrics(self):
+        metrics = RequestMetrics()
+        football, _ = self.client(hooks=[metrics], cache=MemoryCache())
+        football.match(1)
+        football.match(1)
+        football.team(57)
+
+        summary = metrics.summary()
+        self.assertEqual(summary['match']['calls'], 2)
+        self.assertEqual(summary['team']['errors'], 1)
+        self.assertIn('decode', summary['match']['phases'])
+
+        text = metrics.prometheus()
+        self.assertIn('# TYPE football_data_requests_total counter', text)
+        self.assertIn('football_data_requests_total{endpoint="match",status="200"} 1',
+                      text)
+        self.assertIn('football_data_requests_total{endpoint="match",status="none"} 1',
+                      text)
+        self.assertIn('football_data_cache_total{endpoint="match",outcome="hit"} 1',
+                      text)
+        self.assertIn('football_data_request_duration_seconds_bucket'
+                      '{endpoint="team",le="+Inf"} 1', text)
+        self.assertIn('football_data_quota_remaining 7', text)
+
+        metrics.reset()
+        self.assertEqual(metrics.prometheus(), '\n')
+
+    def test_span_hook(self):
+        spans = []
+        football, _ = self.client(hooks=[SpanHook(spans.append)])
+        football.match(1)
+        football.team(57)
+
+        span = spans[0]
+        self.assertEqual(span['name'], 'GET matches/{id}')
+        self.assertEqual(span['kind'], 'CLIENT')
+        self.assertGreater(span['end_time_unix_nano'],
+                           span['start_time_unix_nano'])
+        self.assertEqual(span['attributes']['http.response.status_code'], 200)
+        self.assertEqual(span['attributes']['url.template'], 'matches/{id}')
+        self.assertNotIn(None, span['attributes'].values())
+        self.assertEqual(span['status'], {'code': 'UNSET'})
+        self.assertEqual(spans[1]['status'],
+                         {'code': 'ERROR', 'description': 'not found'})
+        self.assertEqual(spans[1]['attributes']['error.type'], '404')
+
+        with self.assertRaises(ValueError):
+            SpanHook()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+"""
+Contains unit tests for the field projection in projection.py.
+"""
+import json
+import threading
+import unittest
+from unittest import mock
+
+from fake_api import client
+from football_data import MemoryCache
+from football_data.cache import CacheEntry
+from football_data.projection import (Projection, compile_fields, project,
+                                      project2obj)
+from football_data.records import Match, RecordDecoder
+from football_data.utils import json2lazy, json2obj
+
+MATCH = {
+    'id': 1, 'utcDate': '2022-08-05T19:00:00Z', 'status': 'FINISHED',
+    'area': {'id': 2072, 'name': 'England'},
+    'homeTeam': {'id': 354, 'name': 'Crystal Palace FC'},
+    'awayTeam': {'id': 57, 'name': 'Arsenal FC'},
+    'score': {'fullTime': {'home': 0, 'away': 2}},
+    'odds': {'msg': 'Activate Odds-Package in User-Panel to retrieve odds.'},
+    'referees': [{'id': 11585, 'name': 'Anthony Taylor'}],
+}
+BODY = json.dumps({'resultSet': {'count': 1}, 'matches': [MATCH]}).encode()
+FIELDS = ['id', 'status', 'score', 'homeTeam.id', 'awayTeam.id']
+
+
+class ProjectionTest(unittest.TestCase):
+    """
+    Class for unit testing the field projection.
+    """
+
+    def test_compile_fields(self):
+        self.assertEqual(
+            compile_fields(['score.fullTime', 'id', 'score', 'score.halfTime']),
+            {'score': None, 'id': None})
+        self.assertEqual(compile_fields('id, homeTeam.id'),
+                         {'id': None, 'homeTeam': {'id': None}})
+
+    def test_project(self):
+        self.assertEqual(project(MATCH, compile_fields(FIELDS)), {
+            'id': 1, 'status': 'FINISHED',
+            'score': {'fullTime': {'home': 0, 'away': 2}},
+            'homeTeam': {'id': 354}, 'awayTeam': {'id': 57}})
+
+    def test_project_lists_and_missing(self):
+        tree = compile_fields(['referees.name', 'group'])
+        self.assertEqual(project(MATCH, tree),
+                         {'referees': [{'name': 'Anthony Taylor'}]})
+
+    def test_project2obj(self):
+        tree = compile_fields(FIELDS + ['referees.name'])
+        self.assertEqual(project2obj(MATCH, tree), json2obj(project(MATCH, tree)))
+
+    def test_namespace(self):
+        res = Projection(FIELDS, json2obj)(BODY)
+        match = res.matches[0]
+        self.assertEqual(res.resultSet.count, 1)
+        self.assertEqual((match.id, match.homeTeam.id), (1, 354))
+        self.assertEqual(match.score.fullTime.away, 2)
+        self.assertFalse(hasattr(match, 'referees'))
+        self.assertFalse(hasattr(match.homeTeam, 'name'))
+
+    def test_lazy(self):
+        match = Projection(FIELDS, json2lazy)(BODY).matches[0]
+        self.assertEqual(match.awayTeam.id, 57)
+        self.assertFalse(hasattr(match, 'odds'))
+
+    def test_records(self):
+        match = Projection(FIELDS, RecordDecoder())(BODY).matches[0]
+        self.assertIsInstance(match, Match)
+        self.assertEqual(match.status, 'FINISHED')
+        self.assertFalse(hasattr(match, 'area'))
+
+    def test_decoders_accept_parsed(self):
+        parsed = json.loads(BODY)
+        self.assertEqual(json2obj(json.loads(BODY)), json2obj(BODY))
+        self.assertEqual(json2lazy(parsed).matches[0].homeTeam.name,
+                         'Crystal Palace FC')
+
+
+class ClientProjectionTest(unittest.TestCase):
+    """
+    Class for unit testing the fields= argument of FootballData, against
+    the fake API (fake_api.py).
+    """
+
+    def test_competition_matches(self):
+        for decoder in ('namespace', 'lazy', 'records'):
+            with self.subTest(decoder):
+                football = client(self, decoder=decoder)
+                matches = football.competition_matches(
+                    'PL', fields='id,status,homeTeam.id')
+                whole = football.competition_matches('PL')
+                self.assertEqual([m.id for m in matches], [m.id for m in whole])
+                self.assertEqual(matches[0].status, 'FINISHED')
+                self.assertEqual(matches[0].homeTeam.id, 57)
+                self.assertFalse(hasattr(matches[0], 'score'))
+                self.assertFalse(hasattr(matches[0].homeTeam, 'name'))
+                self.assertEqual(whole[0].homeTeam.name, 'Arsenal FC')
+
+    def test_competition_teams(self):
+        football = client(self)
+        teams = football.competition_teams('PL', fields=['id', 'area.code'])
+        self.assertEqual([team.id for team in teams], [57, 65])
+        self.assertEqual(teams[0].area.code, 'ENG')
+        self.assertFalse(hasattr(teams[0], 'name'))
+
+    def test_concurrent_projections(self):
+        # Two projections of the same cached response decoded at once: each
+        # stores its value on the entry, then waits for the other to have
+        # stored its own before carrying on
+        barrier = threading.Barrier(2, timeout=5)
+        armed = threading.Event()
+
+        class InterleavedEntry(CacheEntry):
+            __slots__ = ()
+
+            def __setattr__(self, name, value):
+                super().__setattr__(name, value)
+                if armed.is_set():
+                    barrier.wait()
+
+        football = client(self, cache=MemoryCache())
+        with mock.patch('football_data.cache.CacheEntry', InterleavedEntry):
+            football.competition_matches('PL')
+        armed.set()
+
+        results = {}
+
+        def call(field):
+            results[field] = football.competition_matches('PL', fields=[field])
+
+        threads = [threading.Thread(target=call, args=(field,))
+                   for field in ('id', 'status')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(vars(results['id'][0]), {'id': 1220})
+        self.assertEqual(vars(results['status'][0]), {'status': 'FINISHED'})
+
+
+if __name__ == '__main__':
+    unittest.main()
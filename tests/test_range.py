@@ -0,0 +1,87 @@
+"""
+Contains unit tests for matches_range and team_matches_range, against the
+fake API (fake_api.py).
+"""
+import unittest
+import urllib.parse
+
+from fake_api import Recorder, client
+
+WINDOWS = [('2022-08-01', '2022-08-10'), ('2022-08-11', '2022-08-20'),
+           ('2022-08-21', '2022-08-25')]
+
+
+class RangeTest(unittest.TestCase):
+    """
+    Class for unit testing the date range methods.
+    """
+
+    def client(self, fail=None):
+        self.api = Recorder(fail=fail)
+        return client(self, self.api)
+
+    def windows(self):
+        windows = []
+        for url in self.api.urls:
+            query = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(url).query))
+            windows.append((query['dateFrom'], query['dateTo']))
+        return sorted(windows)
+
+    def test_windows_requested(self):
+        football = self.client()
+        football.matches_range('2022-08-01', '2022-08-25', competitions='PL')
+        self.assertEqual(self.windows(), WINDOWS)
+        self.assertTrue(all('/v4/matches' in url and 'competitions=PL' in url
+                            for url in self.api.urls))
+
+        football = self.client()
+        football.team_matches_range(57, '2022-08-01', '2022-08-25', venue='HOME')
+        self.assertEqual(self.windows(), WINDOWS)
+        self.assertTrue(all('/v4/teams/57/matches' in url and 'venue=HOME' in url
+                            for url in self.api.urls))
+
+    def test_merged(self):
+        for method, args in (('matches_range', ()), ('team_matches_range', (57,))):
+            with self.subTest(method):
+                matches = getattr(self.client(), method)(
+                    *args, '2022-08-01', '2022-08-25')
+                # One match per day and the day after each window, which the
+                # next window has too
+                ids = [match.id for match in matches]
+                self.assertEqual(len(ids), 26)
+                self.assertEqual(len(set(ids)), 26)
+                dates = [match.utcDate for match in matches]
+                self.assertEqual(dates, sorted(dates))
+                self.assertEqual(dates[0][:10], '2022-08-01')
+                self.assertEqual(dates[-1][:10], '2022-08-26')
+
+    def test_failing_window(self):
+        football = self.client(fail='dateFrom=2022-08-11')
+        self.assertEqual(football.matches_range('2022-08-01', '2022-08-25'), [])
+        self.assertEqual(football.error, {'code': 500, 'msg': 'server error'})
+        self.assertEqual(len(self.api.urls), 3)
+
+        self.assertEqual(football.team_matches_range(
+            57, '2022-08-01', '2022-08-25'), [])
+        self.assertEqual(football.error['code'], 500)
+
+    def test_invalid_dates(self):
+        football = self.client()
+        self.assertEqual(football.matches_range('2022-08-25', '2022-08-01'), [])
+        self.assertEqual(football.matches_range('2022-02-30', '2022-03-01'), [])
+        self.assertEqual(football.team_matches_range(
+            57, '2022-08-25', '2022-08-01'), [])
+        self.assertEqual(football.team_matches_range(
+            57, '2022-08-01', '2022-08-25', venue='NOWHERE'), [])
+        self.assertEqual(self.api.urls, [])
+
+    def test_single_window(self):
+        football = self.client()
+        matches = football.matches_range('2022-08-01', '2022-08-01')
+        self.assertEqual([m.utcDate[:10] for m in matches],
+                         ['2022-08-01', '2022-08-02'])
+        self.assertEqual(self.windows(), [('2022-08-01', '2022-08-01')])
+
+
+if __name__ == '__main__':
+    unittest.main()
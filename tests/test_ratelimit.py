@@ -0,0 +1,54 @@
+"""
+Contains unit tests for the RateLimiter in ratelimit.py.
+"""
+import threading
+import time
+import unittest
+
+from football_data.ratelimit import RateLimiter
+
+
+class RateLimiterTest(unittest.TestCase):
+    """
+    Class for unit testing RateLimiter.
+    """
+
+    def test_burst_then_paced(self):
+        limiter = RateLimiter(requests_per_minute=600, burst=3)
+        waits = [limiter.reserve() for _ in range(5)]
+        self.assertEqual(waits[:3], [0, 0, 0])
+        self.assertAlmostEqual(waits[3], 0.1, places=2)
+        self.assertAlmostEqual(waits[4], 0.2, places=2)
+        self.assertEqual(limiter.stats['delayed'], 2)
+
+    def test_update_from_quota_headers(self):
+        limiter = RateLimiter(requests_per_minute=600)
+        limiter.update(available=0, reset=2)
+        self.assertGreater(limiter.reserve(), 1.9)
+
+        limiter = RateLimiter(requests_per_minute=600)
+        limiter.update(available=1, reset=30)
+        self.assertEqual(limiter.reserve(), 0)
+        self.assertGreater(limiter.reserve(), 0)
+
+    def test_shared_across_threads(self):
+        limiter = RateLimiter(requests_per_minute=1200, burst=1)
+        done = []
+
+        def worker():
+            limiter.acquire()
+            done.append(time.monotonic())
+
+        start = time.monotonic()
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # One immediately, then one every 50ms
+        self.assertGreaterEqual(max(done) - start, 0.19)
+        self.assertEqual(limiter.stats['requests'], 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+Contains unit tests for the record types in records.py.
+"""
+import json
+import sys
+import unittest
+from types import SimpleNamespace
+
+from football_data.records import (Area, Goals, Match, RecordDecoder, Team,
+                                   json2records)
+
+MATCH = {
+    'area': {'id': 2072, 'name': 'England', 'code': 'ENG'},
+    'id': 1,
+    'utcDate': '2022-08-05T19:00:00Z',
+    'status': 'FINISHED',
+    'homeTeam': {'id': 57, 'name': 'Arsenal FC', 'tla': 'ARS'},
+    'awayTeam': {'id': 354, 'name': 'Crystal Palace FC', 'tla': 'CRY'},
+    'score': {'winner': 'HOME_TEAM', 'fullTime': {'home': 2, 'away': 0}},
+    'odds': {'msg': 'Activate Odds-Package'},
+    'brandNewField': 'still here',
+}
+
+
+def body(**payload):
+    return json.dumps(payload).encode()
+
+
+class RecordsTest(unittest.TestCase):
+    """
+    Class for unit testing the record decoder.
+    """
+
+    def test_decode_matches(self):
+        res = json2records(body(count=1, matches=[MATCH]))
+        self.assertIsInstance(res, SimpleNamespace)
+        match = res.matches[0]
+        self.assertIsInstance(match, Match)
+        self.assertIsInstance(match.homeTeam, Team)
+        self.assertIsInstance(match.area, Area)
+        self.assertIsInstance(match.score.fullTime, Goals)
+        self.assertEqual(match.score.fullTime.home, 2)
+        self.assertEqual(match.awayTeam.tla, 'CRY')
+        # Unknown objects and fields stay reachable
+        self.assertEqual(match.odds.msg, 'Activate Odds-Package')
+        self.assertEqual(match.brandNewField, 'still here')
+        self.assertFalse(hasattr(match, 'nothing'))
+        self.assertFalse(hasattr(match, 'group'))
+        self.assertFalse(hasattr(match, '__dict__'))
+
+    def test_interning(self):
+        other = dict(MATCH, id=2, homeTeam=MATCH['awayTeam'],
+                     awayTeam=MATCH['homeTeam'])
+        decoder = RecordDecoder()
+        first = decoder(body(matches=[MATCH, other])).matches
+        second = decoder(body(matches=[MATCH])).matches
+        self.assertIs(first[0].homeTeam, first[1].awayTeam)
+        self.assertIs(first[0].area, second[0].area)
+        self.assertIsNot(first[0], second[0])
+        self.assertEqual(first[0], second[0])
+
+    def test_unhashable(self):
+        # Equal records from different decoders aren't interned together,
+        # they can't go in sets or dict keys either
+        first = json2records(body(**MATCH))
+        second = json2records(body(**MATCH))
+        self.assertIsNot(first.homeTeam, second.homeTeam)
+        self.assertEqual(first.homeTeam, second.homeTeam)
+        with self.assertRaises(TypeError):
+            {first.homeTeam, second.homeTeam}
+        with self.assertRaises(TypeError):
+            hash(first)
+
+    def test_single_entity_root(self):
+        self.assertIsInstance(json2records(body(**MATCH)), Match)
+        team = json2records(body(id=57, name='Arsenal FC', tla='ARS',
+                                 crest='57.png', squad=[]))
+        self.assertIsInstance(team, Team)
+        self.assertEqual(team.squad, [])
+
+    def test_smaller_than_namespace(self):
+        team = json2records(body(**MATCH)).homeTeam
+        namespace = SimpleNamespace(**MATCH['homeTeam'])
+        self.assertLess(sys.getsizeof(team),
+                        sys.getsizeof(namespace) +
+                        sys.getsizeof(namespace.__dict__))
+
+
+if __name__ == '__main__':
+    unittest.main()
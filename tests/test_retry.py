@@ -0,0 +1,91 @@
+"""
+Contains unit tests for the RetryPolicy in retry.py.
+"""
+import email.utils
+import time
+import unittest
+
+from fake_api import api
+from football_data import FootballData, RateLimiter
+from football_data.retry import RetryPolicy, parse_retry_after
+from football_data.transport import InProcessTransport
+
+
+class RetryPolicyTest(unittest.TestCase):
+    """
+    Class for unit testing RetryPolicy.
+    """
+
+    def test_should_retry(self):
+        policy = RetryPolicy(max_attempts=3)
+        self.assertTrue(policy.should_retry(1, 429))
+        self.assertTrue(policy.should_retry(2, 502))
+        self.assertTrue(policy.should_retry(1, None))
+        self.assertFalse(policy.should_retry(3, 502))
+        self.assertFalse(policy.should_retry(1, 200))
+        self.assertFalse(policy.should_retry(1, 404))
+
+    def test_delay_full_jitter(self):
+        policy = RetryPolicy(backoff_base=1, backoff_cap=5)
+        for attempt, bound in ((1, 1), (2, 2), (3, 4), (4, 5), (10, 5)):
+            for _ in range(50):
+                delay = policy.delay(attempt)
+                self.assertGreaterEqual(delay, 0)
+                self.assertLessEqual(delay, bound)
+
+    def test_retry_after(self):
+        policy = RetryPolicy(backoff_cap=1)
+        self.assertEqual(policy.delay(1, '7'), 7)
+        http_date = email.utils.formatdate(time.time() + 30, usegmt=True)
+        self.assertAlmostEqual(parse_retry_after(http_date), 30, delta=2)
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertIsNone(parse_retry_after(None))
+
+
+class ClientRetryTest(unittest.TestCase):
+    """
+    Class for unit testing the retries of FootballData on 429 responses.
+    """
+
+    def retried_after(self, retry_after, rate_limit=None):
+        """
+        Seconds between a 429 asking to retry after `retry_after` and the
+        retry.
+        """
+        sent = []
+
+        def handler(url, headers):
+            sent.append(time.monotonic())
+            if len(sent) == 1:
+                return 429, {'Retry-After': retry_after}, (
+                    '{"message": "You reached your request limit.", '
+                    '"errorCode": 429}')
+            return api(url, headers)
+
+        football = FootballData(
+            'key', log_level='CRITICAL', rate_limit=rate_limit,
+            retry=RetryPolicy(max_attempts=2, backoff_base=0.01),
+            transport=InProcessTransport(handler))
+        self.assertEqual(football.team(57).id, 57)
+        self.assertEqual(football.stats['retries'], {'teams/{id}': 1})
+        return sent[1] - sent[0]
+
+    def test_http_date(self):
+        http_date = email.utils.formatdate(time.time() + 2, usegmt=True)
+        # Whole seconds in the date, so between 1 and 2 seconds away
+        self.assertGreater(self.retried_after(http_date), 0.9)
+        http_date = email.utils.formatdate(time.time() + 2, usegmt=True)
+        self.assertGreater(
+            self.retried_after(http_date, RateLimiter(600)), 0.9)
+
+    def test_fractional(self):
+        self.assertGreater(self.retried_after('0.3'), 0.29)
+        self.assertGreater(self.retried_after('0.3', RateLimiter(600)), 0.29)
+
+    def test_invalid(self):
+        # The backoff of the retry policy instead
+        self.assertLess(self.retried_after('soon', RateLimiter(600)), 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+"""
+Contains unit tests for the call coalescing in singleflight.py, and its use
+by FootballData.
+"""
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from fake_api import Recorder, client
+from football_data.singleflight import SingleFlight
+
+
+class SingleFlightTest(unittest.TestCase):
+    """
+    Class for unit testing SingleFlight.
+    """
+
+    def setUp(self):
+        self.flights = SingleFlight()
+        self.runs = 0
+        self.release = threading.Event()
+
+    def slow(self, value):
+        self.runs += 1
+        self.release.wait(5)
+        return value
+
+    def run_concurrently(self, calls, func, *args):
+        with ThreadPoolExecutor(max_workers=calls) as pool:
+            futures = [pool.submit(self.flights.do, 'key', func, *args)
+                       for _ in range(calls)]
+            # Let every call reach the flight before the first one finishes
+            while self.flights.stats['calls'] < calls:
+                time.sleep(0.001)
+            self.release.set()
+            return futures
+
+    def test_coalesced(self):
+        futures = self.run_concurrently(8, self.slow, 'result')
+        results = [future.result() for future in futures]
+        self.assertEqual(self.runs, 1)
+        self.assertEqual([value for value, _ in results], ['result'] * 8)
+        self.assertEqual(sum(shared for _, shared in results), 7)
+        self.assertEqual(self.flights.stats, {'calls': 8, 'coalesced': 7})
+
+    def test_exception_shared(self):
+        def fail():
+            self.runs += 1
+            self.release.wait(5)
+            raise ValueError('boom')
+
+        futures = self.run_concurrently(4, fail)
+        for future in futures:
+            with self.assertRaises(ValueError):
+                future.result()
+        self.assertEqual(self.runs, 1)
+
+    def test_sequential_not_coalesced(self):
+        self.release.set()
+        self.assertEqual(self.flights.do('key', self.slow, 1), (1, False))
+        self.assertEqual(self.flights.do('key', self.slow, 2), (2, False))
+        self.assertEqual(self.runs, 2)
+
+    def test_keys_independent(self):
+        self.release.set()
+        self.flights.do('a', self.slow, 1)
+        self.flights.do('b', self.slow, 2)
+        self.assertEqual(self.flights.stats['coalesced'], 0)
+
+
+class ClientCoalescingTest(unittest.TestCase):
+    """
+    Class for unit testing the coalescing of identical calls by FootballData,
+    against the fake API (fake_api.py).
+    """
+
+    def call_concurrently(self, football, calls):
+        """
+        Make the calls (functions of the client) on as many threads at
+        once, returning their results and the errors each thread saw.
+        """
+        barrier = threading.Barrier(len(calls))
+
+        def call(func):
+            barrier.wait()
+            return func(football), football.error
+
+        with ThreadPoolExecutor(max_workers=len(calls)) as pool:
+            return list(pool.map(call, calls))
+
+    def client(self, fail=None, **kwargs):
+        self.api = Recorder(fail=fail, delay=0.1)
+        self.events = []
+        return client(self, self.api, hooks=[self.events.append], **kwargs)
+
+    def test_shared_request(self):
+        football = self.client()
+        results = self.call_concurrently(
+            football, [lambda f: f.competition_matches('PL')] * 5)
+        self.assertEqual(len(self.api.urls), 1)
+        first = results[0][0]
+        self.assertEqual(len(first), 3)
+        for matches, error in results:
+            self.assertIs(matches, first)
+            self.assertEqual(error, {'code': None, 'msg': ''})
+        self.assertEqual(football.stats['coalesced'],
+                         {'competitions/{id}/matches': 4})
+        self.assertEqual(sorted(event.coalesced for event in self.events),
+                         [False] + [True] * 4)
+        self.assertEqual({event.status for event in self.events}, {200})
+
+    def test_shared_error(self):
+        football = self.client(fail='competitions/PL')
+        results = self.call_concurrently(
+            football, [lambda f: f.competition_matches('PL')] * 5)
+        self.assertEqual(len(self.api.urls), 1)
+        # Every follower gets the error recorded by the leader's thread
+        self.assertEqual(results, [([], {'code': 500, 'msg': 'server error'})] * 5)
+        self.assertEqual([event.error for event in self.events],
+                         ['server error'] * 5)
+
+    def test_key(self):
+        # Same url, but decoded differently: not the same call
+        football = self.client()
+        results = self.call_concurrently(football, [
+            lambda f: f.competition_matches('PL'),
+            lambda f: f.competition_matches('PL', fields=['id'])])
+        self.assertEqual(len(self.api.urls), 2)
+        self.assertTrue(hasattr(results[0][0][0], 'status'))
+        self.assertFalse(hasattr(results[1][0][0], 'status'))
+        self.assertEqual(football.stats['coalesced'], {})
+
+    def test_disabled(self):
+        football = self.client(coalesce=False)
+        self.call_concurrently(
+            football, [lambda f: f.competition_matches('PL')] * 3)
+        self.assertEqual(len(self.api.urls), 3)
+        self.assertEqual(football.stats['coalesced'], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Contains unit tests for the SQLite helpers in sqlite.py.
+"""
+import os
+import tempfile
+import threading
+import unittest
+
+from football_data.sqlite import SQLiteDatabase
+
+
+class SQLiteDatabaseTest(unittest.TestCase):
+    """
+    Class for unit testing SQLiteDatabase.
+    """
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, 'test.sqlite')
+        self.created = []
+
+    def database(self, version=1):
+        def create_schema(db):
+            self.created.append(version)
+            db.execute('DROP TABLE IF EXISTS items')
+            db.execute('CREATE TABLE items (id INTEGER PRIMARY KEY)')
+
+        database = SQLiteDatabase(self.path, 5, version, create_schema)
+        self.addCleanup(database.close)
+        return database
+
+    def test_schema_version(self):
+        database = self.database()
+        database.connection().execute('INSERT INTO items VALUES (1)')
+        # Same version: left as is
+        self.database()
+        self.assertEqual(self.created, [1])
+        self.assertEqual(database.connection().execute(
+            'SELECT COUNT(*) FROM items').fetchone()[0], 1)
+        self.assertEqual(database.connection().execute(
+            'PRAGMA user_version').fetchone()[0], 1)
+
+        # Another one: rebuilt
+        other = self.database(version=2)
+        self.assertEqual(self.created, [1, 2])
+        self.assertEqual(other.connection().execute(
+            'SELECT COUNT(*) FROM items').fetchone()[0], 0)
+
+    def test_connection_per_thread(self):
+        database = self.database()
+        db = database.connection()
+        self.assertIs(database.connection(), db)
+        self.assertEqual(db.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+
+        others = []
+        thread = threading.Thread(
+            target=lambda: others.append(database.connection()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(others[0], db)
+        others[0].close()
+
+        database.close()
+        self.assertIsNot(database.connection(), db)
+
+    def test_transaction(self):
+        database = self.database()
+        with database.transaction() as db:
+            db.execute('INSERT INTO items VALUES (1)')
+        with self.assertRaises(ValueError):
+            with database.transaction() as db:
+                db.execute('INSERT INTO items VALUES (2)')
+                raise ValueError
+        self.assertEqual(database.connection().execute(
+            'SELECT id FROM items').fetchall(), [(1,)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+Contains unit tests for the local match store in store.py.
+"""
+import json
+import os
+import tempfile
+import unittest
+import urllib.parse
+
+from fake_api import Recorder, client
+from football_data.store import MatchStore
+
+
+def match(id_, day, status, home, away, competition=('PL', 2021)):
+    code, competition_id = competition
+    return {
+        'id': id_, 'utcDate': f'{day}T15:00:00Z', 'status': status,
+        'matchday': 1, 'competition': {'id': competition_id, 'code': code},
+        'season': {'id': 1490, 'startDate': '2022-08-05'},
+        'homeTeam': {'id': home}, 'awayTeam': {'id': away},
+        'score': {'fullTime': {'home': None, 'away': None}},
+    }
+
+
+class MatchStoreTest(unittest.TestCase):
+    """
+    Class for unit testing MatchStore.
+    """
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.matches = [
+            match(1, '2022-08-05', 'FINISHED', 57, 354),
+            match(2, '2022-08-06', 'FINISHED', 65, 57),
+            match(3, '2023-02-01', 'POSTPONED', 57, 66),
+            match(4, '2023-05-20', 'SCHEDULED', 66, 65),
+            match(5, '2022-08-06', 'FINISHED', 100, 101, ('SA', 2019)),
+        ]
+        self.api = Recorder(handler=self.serve)
+        self.football = client(self, self.api)
+        self.store = MatchStore(self.football,
+                                os.path.join(self.dir.name, 'matches.db'))
+
+    def tearDown(self):
+        self.store.close()
+        self.dir.cleanup()
+
+    def serve(self, url, headers):
+        """
+        self.matches, filtered by the dates and team of url.
+        """
+        query = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(url).query))
+        matches = [m for m in self.matches
+                   if query.get('dateFrom', '') <= m['utcDate'][:10]
+                   <= query.get('dateTo', '9999')]
+        if '/teams/' in url:
+            team_id = int(url.split('/teams/')[1].split('/')[0])
+            matches = [m for m in matches
+                       if team_id in (m['homeTeam']['id'], m['awayTeam']['id'])]
+        return 200, {'Content-Type': 'application/json'}, json.dumps(
+            {'matches': matches})
+
+    def ids(self, matches):
+        return [m.id for m in matches]
+
+    def test_queries(self):
+        self.assertEqual(self.store.sync_competition('PL', 2022), 5)
+        self.assertEqual(len(self.store), 5)
+        self.assertEqual(self.ids(self.store.team_matches(57, season=2022)),
+                         [1, 2, 3])
+        self.assertEqual(self.ids(self.store.team_matches(
+            57, dateFrom='2022-08-06', dateTo='2023-02-01')), [2, 3])
+        self.assertEqual(self.ids(self.store.matches('2022-08-06')), [2, 5])
+        self.assertEqual(self.ids(self.store.matches(
+            '2022-08-01', '2022-08-31', competitions='PL')), [1, 2])
+        self.assertEqual(self.ids(self.store.competition_matches(
+            2021, status='FINISHED')), [1, 2])
+        self.assertEqual(self.store.match(3).homeTeam.id, 57)
+        self.assertIsNone(self.store.match(42))
+
+    def test_incremental_competition_sync(self):
+        self.store.sync_competition('PL', 2022)
+        self.api.urls.clear()
+
+        # Only the windows of the matches that aren't final are refetched
+        self.matches[2]['status'] = 'FINISHED'
+        self.store.sync_competition('PL', 2022)
+        self.assertEqual(len(self.api.urls), 2)
+        self.assertIn('dateFrom=2023-02-01', self.api.urls[0])
+        self.assertIn('dateFrom=2023-05-20', self.api.urls[1])
+        self.assertEqual(self.store.match(3).status, 'FINISHED')
+
+        self.matches[3]['status'] = 'FINISHED'
+        self.store.sync_competition('PL', 2022)
+        self.api.urls.clear()
+        # All final: nothing left to fetch
+        self.assertEqual(self.store.sync_competition('PL', 2022), 0)
+        self.assertEqual(self.api.urls, [])
+        self.assertEqual(self.store.stats['skipped'], 1)
+
+    def test_window_sync(self):
+        self.assertEqual(self.store.sync_team(57, '2022-08-01', '2022-08-31'),
+                         2)
+        self.assertEqual(len(self.api.urls), 4)
+        self.api.urls.clear()
+        # Past windows with only final matches aren't fetched again
+        self.store.sync_team(57, '2022-08-01', '2022-08-31')
+        self.assertEqual(self.api.urls, [])
+        self.store.sync_team(57, '2022-08-01', '2023-02-05')
+        self.assertEqual(len(self.api.urls), 16)
+
+    def test_failed_fetch(self):
+        self.api.response = (500, {}, 'Internal Server Error')
+        self.assertIsNone(self.store.sync_matches('2022-08-01', '2022-08-05'))
+        self.assertEqual(len(self.store), 0)
+        self.assertEqual(self.football.error['code'], 500)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Contains unit tests for the incremental parsing in streaming.py.
+"""
+import json
+import unittest
+
+from football_data.streaming import ArrayStreamParser, iter_array
+
+MATCHES = [
+    {'id': 1, 'utcDate': '2022-08-05T19:00:00Z', 'status': 'FINISHED',
+     'homeTeam': {'id': 354, 'name': 'Crystal Palace FC'},
+     'awayTeam': {'id': 57, 'name': 'Arsenal FC'},
+     'referees': [{'id': 11585, 'name': 'Anthony Taylor'}],
+     'score': {'fullTime': {'home': 0, 'away': 2}}},
+    {'id': 2, 'utcDate': '2022-08-06T11:30:00Z', 'status': 'TIMED',
+     'homeTeam': {'id': 63, 'name': 'Fulham "FC" [London]'},
+     'awayTeam': {'id': 64, 'name': 'Liverpool, FC {}'},
+     'referees': [], 'score': {'fullTime': {'home': None, 'away': None}}},
+]
+BODY = json.dumps({
+    'filters': {'matches': [0]},
+    'resultSet': {'count': 2, 'first': 'matches'},
+    'competition': {'id': 2021, 'name': 'Premier League'},
+    'matches': MATCHES,
+    'after': [99],
+}).encode()
+
+
+def chunked(body, size):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+class StreamingTest(unittest.TestCase):
+    """
+    Class for unit testing the incremental array parsing.
+    """
+
+    def test_elements(self):
+        for size in (1, 3, 64, len(BODY)):
+            elements = list(iter_array(chunked(BODY, size), 'matches'))
+            self.assertEqual([json.loads(e) for e in elements], MATCHES)
+
+    def test_nested_keys_ignored(self):
+        # Only the top-level `matches` counts, not filters.matches
+        body = json.dumps({'filters': {'matches': [1, 2]}}).encode()
+        self.assertEqual(list(iter_array([body], 'matches')), [])
+
+    def test_scalars(self):
+        body = b'{"ids": [1, "a,]", null , 2.5e3, [3, [4]]]}'
+        elements = list(iter_array(chunked(body, 2), 'ids'))
+        self.assertEqual([json.loads(e) for e in elements],
+                         [1, 'a,]', None, 2500.0, [3, [4]]])
+
+    def test_empty(self):
+        parser = ArrayStreamParser('teams')
+        self.assertEqual(parser.feed(b'{"count": 0, "teams": [ ]}'), [])
+        self.assertTrue(parser.done)
+
+    def test_incomplete(self):
+        parser = ArrayStreamParser('matches')
+        elements = parser.feed(BODY[:BODY.index(b'"Liverpool')])
+        self.assertFalse(parser.done)
+        self.assertEqual(len(elements), 1)
+
+    def test_buffers_one_element(self):
+        parser = ArrayStreamParser('matches')
+        head, tail = BODY.split(b'{"id": 2', 1)
+        parser.feed(head)
+        # What's parsed is dropped, the next element starts the buffer
+        self.assertLess(len(parser._buf), 10)
+        parser.feed(b'{"id": 2' + tail)
+        self.assertTrue(parser.done)
+
+
+if __name__ == '__main__':
+    unittest.main()
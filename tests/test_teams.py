@@ -0,0 +1,62 @@
+"""
+Contains unit tests for the team name resolution in teams.py.
+"""
+import unittest
+
+from football_data.teams import TeamResolver, normalize, resolve_team
+
+
+class TeamResolverTest(unittest.TestCase):
+    """
+    Class for unit testing TeamResolver.
+    """
+
+    def setUp(self):
+        self.resolver = TeamResolver({
+            'arsenal fc': 57, 'arsenal': 57,
+            'manchester city fc': 65, 'manchester united fc': 66,
+            '1. fc köln': 1, 'fc bayern münchen': 5, 'tsv 1860 münchen': 26,
+        })
+
+    def test_normalize(self):
+        self.assertEqual(normalize('1. FC  Köln'), '1 fc koln')
+        self.assertEqual(normalize("Borussia M'gladbach"), 'borussia mgladbach')
+        self.assertEqual(normalize('Ølstykke-Æble ß'), 'olstykke aeble ss')
+
+    def test_exact(self):
+        self.assertEqual(self.resolver.resolve('ARSENAL F.C.'), 57)
+        self.assertEqual(self.resolver.resolve('1 FC Koln'), 1)
+        # Short forms, without the noise words
+        self.assertEqual(self.resolver.resolve('Bayern München'), 5)
+        self.assertEqual(self.resolver.resolve('Manchester United'), 66)
+
+    def test_fuzzy(self):
+        self.assertEqual(self.resolver.resolve('Arsneal'), 57)
+        self.assertEqual(self.resolver.resolve('Manchster City'), 65)
+        self.assertIsNone(self.resolver.resolve('Real Madrid'))
+        # As close to City as to United
+        self.assertIsNone(self.resolver.resolve('Manchester'))
+
+    def test_candidates(self):
+        candidates = self.resolver.candidates('Manchester', limit=2)
+        self.assertEqual([c[0] for c in candidates], [65, 66])
+        self.assertGreater(candidates[0][2], candidates[1][2])
+        self.assertEqual(self.resolver.candidates('Arsenal')[0],
+                         (57, 'arsenal', 1.0))
+        # One candidate per team
+        ids = [c[0] for c in self.resolver.candidates('arsenal', limit=10)]
+        self.assertEqual(len(ids), len(set(ids)))
+
+    def test_resolve_many(self):
+        names = ['Arsenal', 'nobody', 'Köln', 'Arsenal']
+        self.assertEqual(self.resolver.resolve_many(names), [57, None, 1, 57])
+        self.assertEqual(self.resolver.cache_info().misses, 3)
+        self.resolver.resolve('Arsenal')
+        self.assertEqual(self.resolver.cache_info().hits, 1)
+
+    def test_default_aliases(self):
+        self.assertEqual(resolve_team('1. FC Köln'), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
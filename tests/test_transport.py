@@ -0,0 +1,168 @@
+"""
+Contains unit tests for the transports in transport.py.
+"""
+import json
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from football_data import FootballData, RetryPolicy
+from football_data.transport import (Headers, HTTPXTransport,
+                                     InProcessTransport, NetworkError,
+                                     RecordingTransport, ReplayTransport,
+                                     RequestsTransport)
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+MATCHES = json.dumps({'matches': [{'id': i, 'status': 'FINISHED'}
+                                  for i in range(100)]})
+
+
+def api(url, headers):
+    if url.endswith('/matches/1'):
+        return 200, {'Content-Type': 'application/json'}, '{"id": 1}'
+    if '/matches' in url:
+        return 200, {'Content-Type': 'application/json'}, MATCHES
+    return 404, {}, '{"message": "not found", "errorCode": 404}'
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = MATCHES.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TransportTest(unittest.TestCase):
+    """
+    Class for unit testing the transports.
+    """
+
+    def client(self, transport, **kwargs):
+        football = FootballData('key', log_level='CRITICAL',
+                                transport=transport, **kwargs)
+        self.addCleanup(football.close)
+        return football
+
+    def test_headers(self):
+        headers = Headers({'Content-Type': 'application/json'})
+        self.assertEqual(headers['content-type'], 'application/json')
+        self.assertIn('CONTENT-TYPE', headers)
+        self.assertIsNone(headers.get('ETag'))
+
+    def test_in_process(self):
+        sent = []
+
+        def handler(url, headers):
+            sent.append(headers)
+            return api(url, headers)
+
+        transport = InProcessTransport(handler)
+        football = self.client(transport)
+        self.assertEqual(len(football.competition_matches('PL')), 100)
+        self.assertEqual(football.match(1).id, 1)
+        self.assertEqual(sent[0]['X-Auth-Token'], 'key')
+
+        self.assertIsNone(football.team(57))
+        self.assertEqual(football.error, {'code': 404, 'msg': 'not found'})
+
+        self.assertEqual(transport.stats['requests'], 3)
+        self.assertGreater(transport.stats['bytes_sent'], 0)
+        self.assertGreater(transport.stats['bytes_received'], len(MATCHES))
+
+    def test_network_errors_retried(self):
+        failures = [NetworkError('connection reset')]
+
+        def handler(url, headers):
+            if failures:
+                raise failures.pop()
+            return api(url, headers)
+
+        football = self.client(
+            InProcessTransport(handler),
+            retry=RetryPolicy(backoff_base=0))
+        self.assertEqual(football.match(1).id, 1)
+        self.assertEqual(football.stats['retries'], {'matches/{id}': 1})
+
+        football = self.client(InProcessTransport(handler), retry=False)
+        failures.append(NetworkError('connection reset'))
+        self.assertFalse(football.match(1))
+        self.assertEqual(football.error['msg'], 'request error: connection reset')
+
+    def test_record_and_replay(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'recordings.jsonl')
+            with RecordingTransport(path, InProcessTransport(api)) as transport:
+                football = self.client(transport)
+                football.competition_matches('PL')
+                football.match(1)
+
+            football = self.client(ReplayTransport(path))
+            self.assertEqual(len(football.competition_matches('PL')), 100)
+            self.assertEqual(football.match(1).id, 1)
+            # Only the recorded URLs...
+            self.assertEqual(football.competition_matches('SA'), [])
+            self.assertEqual(football.error['code'], 404)
+            # ...unless replaying by endpoint
+            football = self.client(ReplayTransport(path, fallback=True))
+            self.assertEqual(len(football.competition_matches('SA')), 100)
+
+    def test_stream(self):
+        transport = InProcessTransport(api)
+        football = self.client(transport)
+        matches = list(football.stream_competition_matches('PL'))
+        self.assertEqual([m.id for m in matches], list(range(100)))
+
+    def serve(self):
+        httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        self.addCleanup(httpd.server_close)
+        self.addCleanup(httpd.shutdown)
+        return f'http://127.0.0.1:{httpd.server_port}/v4/competitions/PL/matches'
+
+    def check_network_transport(self, transport, url):
+        with transport:
+            first = transport.send(url, {'X-Auth-Token': 'key'})
+            self.assertEqual(first.status_code, 200)
+            self.assertEqual(first.content, MATCHES.encode())
+            # DNS counted in connect
+            self.assertGreater(first.timings.connect, 0)
+            self.assertIsNone(first.timings.dns)
+            # Pooled connection
+            second = transport.send(url, {})
+            self.assertEqual(second.timings.connect, 0)
+            self.assertGreater(second.bytes_received, len(MATCHES))
+
+            streamed = transport.send(url, {}, stream=True)
+            chunks = list(streamed.iter_content(100))
+            self.assertEqual(b''.join(chunks), MATCHES.encode())
+            self.assertEqual(streamed.bytes_received, second.bytes_received)
+            with self.assertRaises(RuntimeError):
+                streamed.content
+            self.assertEqual(transport.stats['requests'], 3)
+
+            with self.assertRaises(NetworkError):
+                transport.send('http://127.0.0.1:9/v4/competitions', {})
+
+    def test_requests_transport(self):
+        self.check_network_transport(RequestsTransport(), self.serve())
+
+    @unittest.skipUnless(httpx, 'httpx not installed')
+    def test_httpx_transport(self):
+        self.check_network_transport(HTTPXTransport(http2=False), self.serve())
+
+if __name__ == '__main__':
+    unittest.main()
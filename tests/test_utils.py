@@ -0,0 +1,76 @@
+"""
+Contains unit tests for the helpers in utils.py.
+"""
+import json
+import unittest
+
+from football_data import FootballData
+from football_data.football_data import DECODERS
+from football_data.utils import date_windows, json2lazy, json2obj
+
+BODY = json.dumps({
+    'count': 1,
+    'matches': [{
+        'id': 266391,
+        'homeTeam': {'id': 450, 'name': 'Hellas Verona FC'},
+        'score': {'winner': 'AWAY_TEAM', 'fullTime': {'home': 0, 'away': 1}},
+        'referees': [],
+        'group': None,
+    }],
+}).encode()
+
+
+class JsonDecodeTest(unittest.TestCase):
+    """
+    Class for unit testing the JSON decoders.
+    """
+
+    def test_json2lazy_same_access_as_json2obj(self):
+        for res in (json2obj(BODY), json2lazy(BODY)):
+            self.assertEqual(res.count, 1)
+            self.assertIsInstance(res.matches, list)
+            match = res.matches[0]
+            self.assertEqual(match.homeTeam.name, 'Hellas Verona FC')
+            self.assertEqual(match.score.fullTime.away, 1)
+            self.assertEqual(match.referees, [])
+            self.assertIsNone(match.group)
+            self.assertFalse(hasattr(match, 'odds'))
+
+    def test_json2lazy_wraps_once(self):
+        res = json2lazy(BODY)
+        self.assertIs(res.matches, res.matches)
+        self.assertIs(res.matches[0].score, res.matches[0].score)
+        self.assertEqual(res.matches[0].homeTeam._asdict(),
+                         {'id': 450, 'name': 'Hellas Verona FC'})
+        self.assertEqual(json2lazy(BODY), res)
+
+    def test_unknown_decoder(self):
+        with self.assertRaises(ValueError) as raised:
+            FootballData('key', decoder='bogus')
+        for name in DECODERS:
+            self.assertIn(name, str(raised.exception))
+
+
+class DateWindowsTest(unittest.TestCase):
+    """
+    Class for unit testing date_windows.
+    """
+
+    def test_split(self):
+        self.assertEqual(date_windows('2020-08-01', '2020-08-25', 10), [
+            ('2020-08-01', '2020-08-10'),
+            ('2020-08-11', '2020-08-20'),
+            ('2020-08-21', '2020-08-25'),
+        ])
+        self.assertEqual(date_windows('2020-02-28', '2020-03-01', 10),
+                         [('2020-02-28', '2020-03-01')])
+        self.assertEqual(len(date_windows('2022-08-01', '2023-05-31', 10)), 31)
+
+    def test_empty_and_invalid(self):
+        self.assertEqual(date_windows('2020-08-02', '2020-08-01', 10), [])
+        with self.assertRaises(ValueError):
+            date_windows('2020-02-30', '2020-03-01', 10)
+
+
+if __name__ == '__main__':
+    unittest.main()